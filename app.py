@@ -1,55 +1,104 @@
-from flask import Flask, render_template, request, redirect, url_for
-from schedule_generator import HourSlot, WeekDay, Patient, Therapist, create_schedule
-from print_table import print_schedule_table  # Assuming this is your module
+import os
+import time
+from flask import Flask, Response, abort, g, render_template, request, redirect, url_for
+from schedule_generator import TimeslotGrid, parse_availability, preload_solver_in_background
+from print_table import get_initials
+from schedule_pages import ScheduleCache, paginate
+from incremental_model import IncrementalScheduleModel
+from roster_store import RosterStore
+from metrics import Registry
 
 app = Flask(__name__)
 
-# In-memory cache for patients and therapists
-patients_cache = []
-therapists_cache = []
-
-# Time slots for scheduling (7:00 to 18:00 in one-hour increments)
-timeslots = []
-slot_id = 1
-for day in WeekDay:
-    current = 7.0
-    while current < 18.0:
-        timeslots.append({
-            "id": str(slot_id),
-            "day_of_week": day.value,
-            "start_time": current,
-            "end_time": current + 1.0
-        })
-        slot_id += 1
-        current += 1.0
-
-def parse_availability(text):
-    """Parse availability text into a dictionary of day: [HourSlot] pairs."""
-    availability = {}
-    lines = text.split("\n")
-    for line in lines:
-        if ":" in line:
-            day, times = line.split(":", 1)
-            day = day.strip()
-            if day not in [d.value for d in WeekDay]:
-                continue
-            time_list = [t.strip() for t in times.split(",")]
-            hour_slots = []
-            for time in time_list:
-                try:
-                    hour = int(time.split(":")[0])
-                    if time == f"{hour:02d}:00" and 7 <= hour <= 17:
-                        slot_name = f"_{hour}to{hour+1}"
-                        hour_slots.append(getattr(HourSlot, slot_name))
-                except (ValueError, AttributeError):
-                    continue
-            if hour_slots:
-                availability[day] = hour_slots
-    return availability
+# In-memory roster of patients and therapists; solves work on immutable snapshots of it
+roster = RosterStore()
+
+# Optional pool of solver workers ("host:port,host:port"); without it the app solves in-process
+worker_pool = None
+if os.environ.get("SCHEDULER_WORKERS"):
+    from solver_service import WorkerPool, parse_addresses
+    worker_pool = WorkerPool(parse_addresses(os.environ["SCHEDULER_WORKERS"]))
+
+# Optional response-time SLA in seconds: caps each solve and falls back to the greedy engine on timeout
+sla_seconds = float(os.environ["SCHEDULER_SLA_SECONDS"]) if os.environ.get("SCHEDULER_SLA_SECONDS") else None
+
+# Optional solve log ("path.jsonl"): every solve is appended to it, and unset solver settings are picked from it
+history = None
+if os.environ.get("SCHEDULER_HISTORY"):
+    from solve_history import SolveHistory
+    history = SolveHistory(os.environ["SCHEDULER_HISTORY"])
+
+# Operational metrics, served in the Prometheus text format at /metrics
+metrics = Registry()
+request_latency = metrics.histogram("scheduler_request_duration_seconds", "Request latency by action.", ("action",))
+solve_count = metrics.counter("scheduler_solves_total", "Solves by outcome status and engine.", ("status", "engine"))
+solve_duration = metrics.histogram("scheduler_solve_duration_seconds", "Wall time of create_schedule calls.")
+model_variables = metrics.gauge("scheduler_model_variables", "CP-SAT variables in the last solved model.")
+model_constraints = metrics.gauge("scheduler_model_constraints", "CP-SAT constraints in the last solved model.")
+roster_size = metrics.gauge("scheduler_roster_size", "Current number of roster entries.", ("kind",))
+
+# Time slots for scheduling (7:00 to 18:00 in one-hour increments), built once and reused by every solve
+timeslots = TimeslotGrid.weekly()
+
+# CP-SAT model synced to each new roster snapshot, so an edit costs only the variables it adds or removes
+model_builder = IncrementalScheduleModel(timeslots)
+
+# Recent solves and their rendered pages, viewed at /schedule/<solve_id>
+solves = ScheduleCache()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+KNOWN_ACTIONS = {'add_patient', 'add_therapist', 'delete_patient', 'delete_therapist', 'run_scheduler'}
+
+@app.after_request
+def record_request_latency(response):
+    if request.method == 'POST':
+        action = request.form.get('action')
+        action = action if action in KNOWN_ACTIONS else 'other'
+    else:
+        action = request.endpoint or 'unknown'
+    request_latency.observe(time.perf_counter() - g.request_started, action=action)
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    snapshot = roster.snapshot()
+    roster_size.set(len(snapshot.patients), kind="patients")
+    roster_size.set(len(snapshot.therapists), kind="therapists")
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+def solve_with_metrics(snapshot):
+    """
+    Solves a roster snapshot (on the worker pool, or locally on the incremental model) and records
+    its outcome and model size, and in the solve history when one is configured.
+    Returns the schedule (or None) and the solve report.
+    """
+    patients, therapists = list(snapshot.patients), list(snapshot.therapists)
+    report = {}
+    options = {"time_limit": sla_seconds, "greedy_fallback": True} if sla_seconds else {}
+    tuned = False
+    if history is not None:
+        from solve_history import instance_features
+        features = instance_features(patients, therapists, timeslots)
+        options, tuned = history.tuned_options(features, options)
+    started = time.perf_counter()
+    if worker_pool is not None:
+        schedule = worker_pool.create_schedule(patients, therapists, timeslots, report=report, **options)
+    else:
+        schedule = model_builder.solve(snapshot=snapshot, report=report, **options)
+    solve_duration.observe(time.perf_counter() - started)
+    if history is not None:
+        history.record(features, options, report, tuned=tuned)
+    solve_count.inc(status=report.get("status", "UNKNOWN"), engine=report.get("engine") or "none")
+    if "num_variables" in report:
+        model_variables.set(report["num_variables"])
+        model_constraints.set(report["num_constraints"])
+    return schedule, report
 
 @app.route('/', methods=['GET', 'POST'])
 def home():
-    global patients_cache, therapists_cache
     status = ""
     
     if request.method == 'POST':
@@ -69,8 +118,7 @@ def home():
                     speech = int(speech_hours)
                     psycho = int(psycho_hours)
                     occ = int(occ_hours)
-                    patient = Patient(
-                        id=f"P{len(patients_cache) + 1}",
+                    roster.add_patient(
                         name=name,
                         weekly_specialty_needs={
                             "Speech Therapist": speech,
@@ -79,7 +127,7 @@ def home():
                         },
                         availability=parse_availability(availability)
                     )
-                    patients_cache.append(patient)
+                    model_builder.sync(roster.snapshot())
                     status = f"Added patient: {name}"
                 except ValueError:
                     status = "Error: Hours must be integers!"
@@ -92,43 +140,112 @@ def home():
             if not name or not specialty or not availability:
                 status = "Error: Therapist name, specialty, and availability are required!"
             else:
-                therapist = Therapist(
-                    id=f"T{len(therapists_cache) + 1}",
+                roster.add_therapist(
                     name=name,
                     specialty=specialty,
                     availability=parse_availability(availability)
                 )
-                therapists_cache.append(therapist)
+                model_builder.sync(roster.snapshot())
                 status = f"Added therapist: {name} ({specialty})"
         
         elif action == 'delete_patient':
             patient_id = request.form.get('patient_id')
-            patients_cache[:] = [p for p in patients_cache if p.id != patient_id]
+            roster.delete_patient(patient_id)
+            model_builder.sync(roster.snapshot())
             status = f"Deleted patient with ID: {patient_id}"
         
         elif action == 'delete_therapist':
             therapist_id = request.form.get('therapist_id')
-            therapists_cache[:] = [t for t in therapists_cache if t.id != therapist_id]
+            roster.delete_therapist(therapist_id)
+            model_builder.sync(roster.snapshot())
             status = f"Deleted therapist with ID: {therapist_id}"
         
         elif action == 'run_scheduler':
-            if not patients_cache or not therapists_cache:
+            snapshot = roster.snapshot()
+            if not snapshot.patients or not snapshot.therapists:
                 status = "Error: Add at least one patient and one therapist!"
             else:
-                schedule = create_schedule(patients_cache, therapists_cache, timeslots)
+                from solver_service import WorkerError, WorkerTimeoutError, WorkerUnavailableError
+                try:
+                    schedule, report = solve_with_metrics(snapshot)
+                except WorkerUnavailableError:
+                    solve_count.inc(status="WORKERS_BUSY", engine="none")
+                    return render_home("Error: All solver workers are busy, please try again."), 503
+                except WorkerTimeoutError:
+                    solve_count.inc(status="WORKER_TIMEOUT", engine="none")
+                    return render_home("Error: The solver worker did not answer in time, please try again."), 504
+                except WorkerError as e:
+                    solve_count.inc(status="WORKER_ERROR", engine="none")
+                    return render_home(f"Error: The solve failed on the worker: {e}"), 502
                 if schedule:
-                    import io
-                    import sys
-                    old_stdout = sys.stdout
-                    sys.stdout = buffer = io.StringIO()
-                    print_schedule_table(schedule, timeslots)
-                    sys.stdout = old_stdout
-                    schedule_output = buffer.getvalue()
-                    return render_template('schedule.html', schedule_output=schedule_output)
+                    solved = solves.add(schedule, timeslots, snapshot.patients, snapshot.therapists, report)
+                    # Post/redirect/get: a refresh re-reads the cached overview instead of solving again.
+                    return redirect(url_for('schedule_overview', solve_id=solved.solve_id))
                 else:
                     status = "Error: No feasible schedule could be created."
+                    reasons = report.get("explanation")
+                    if reasons is None and report.get("status") == "INFEASIBLE":
+                        from feasibility import explain_infeasibility
+                        reasons = explain_infeasibility(list(snapshot.patients), list(snapshot.therapists), timeslots,
+                                                        time_limit=5.0)
+                    if reasons:
+                        status += " " + " ".join(reasons)
     
-    return render_template('index.html', status=status, patients=patients_cache, therapists=therapists_cache)
+    return render_home(status)
+
+def page_arg(name: str) -> int:
+    """Page number from the query string; anything missing or malformed means the first page."""
+    return request.args.get(name, 1, type=int) or 1
+
+def render_home(status: str) -> str:
+    """The roster page, listing one page of patients and one page of therapists."""
+    snapshot = roster.snapshot()
+    patients, page, num_pages = paginate(snapshot.patients, page_arg('page'))
+    therapists, tpage, num_tpages = paginate(snapshot.therapists, page_arg('tpage'))
+    return render_template('index.html', status=status, patients=patients, therapists=therapists,
+                           num_patients=len(snapshot.patients), num_therapists=len(snapshot.therapists),
+                           page=page, num_pages=num_pages, tpage=tpage, num_tpages=num_tpages)
+
+def render_overview(solved, page: int, tpage: int) -> str:
+    """One page of a solve's patient list and therapist utilization, cached per solve."""
+    patients, page, num_pages = paginate(solved.patients, page)
+    therapists, tpage, num_tpages = paginate(solved.therapists, tpage)
+    return solves.page(solved, ('overview', page, tpage), lambda: render_template(
+        'schedule.html', solved=solved, patients=patients, page=page, num_pages=num_pages,
+        utilization=solved.index.therapist_utilization(therapists), tpage=tpage, num_tpages=num_tpages,
+        daily_load=solved.index.daily_load()))
+
+def solved_or_404(solve_id: int):
+    solved = solves.get(solve_id)
+    if solved is None:
+        abort(404, description="This schedule is no longer cached; run the scheduler again.")
+    return solved
+
+@app.route('/schedule/<int:solve_id>')
+def schedule_overview(solve_id):
+    return render_overview(solved_or_404(solve_id), page_arg('page'), page_arg('tpage'))
+
+@app.route('/schedule/<int:solve_id>/patient/<patient_id>')
+def patient_schedule(solve_id, patient_id):
+    solved = solved_or_404(solve_id)
+    patient = solved.patients_by_id.get(patient_id)
+    if patient is None:
+        abort(404)
+    label = lambda entry: f"{entry[1].name} ({get_initials(entry[1].specialty)})"
+    return solves.page(solved, ('patient', patient_id), lambda: render_template(
+        'person_schedule.html', title=f"Schedule for {patient.name}", days=solved.index.days,
+        rows=solved.index.patient_grid(patient_id, label), solve_id=solve_id))
+
+@app.route('/schedule/<int:solve_id>/therapist/<therapist_id>')
+def therapist_schedule(solve_id, therapist_id):
+    solved = solved_or_404(solve_id)
+    therapist = solved.therapists_by_id.get(therapist_id)
+    if therapist is None:
+        abort(404)
+    return solves.page(solved, ('therapist', therapist_id), lambda: render_template(
+        'person_schedule.html', title=f"Schedule for {therapist.name} ({therapist.specialty})",
+        days=solved.index.days, rows=solved.index.therapist_grid(therapist_id), solve_id=solve_id))
 
 if __name__ == '__main__':
+    preload_solver_in_background()
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""Test helper: gives a test case its own roster, model and solve cache in the Flask app."""
+import unittest
+
+import app
+from incremental_model import IncrementalScheduleModel
+from roster_store import RosterStore
+from schedule_pages import ScheduleCache
+
+# Module globals of app.py that requests read and write.
+APP_GLOBALS = ("roster", "model_builder", "solves", "worker_pool", "sla_seconds", "history")
+
+def isolate_app(test: unittest.TestCase, **overrides):
+    """
+    Replaces the app's globals with fresh ones (an empty roster, model and solve cache, no worker
+    pool, SLA or history) for the duration of a test; the originals are restored on cleanup.
+    Args:
+        test: The running test case; the restore is registered with its addCleanup.
+        overrides: Values for any of APP_GLOBALS to use instead of the fresh defaults.
+    """
+    saved = {name: getattr(app, name) for name in APP_GLOBALS}
+    test.addCleanup(lambda: [setattr(app, name, value) for name, value in saved.items()])
+    fresh = {"roster": RosterStore(), "model_builder": IncrementalScheduleModel(app.timeslots),
+             "solves": ScheduleCache(), "worker_pool": None, "sla_seconds": None, "history": None}
+    fresh.update(overrides)
+    for name, value in fresh.items():
+        setattr(app, name, value)
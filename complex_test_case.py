@@ -4,7 +4,7 @@ from schedule_generator import HourSlot  # Updated import
 from csv_exporter import export_schedule_to_csv
 
 # Assuming print_schedule_table is updated to work with one-hour timeslots
-from schedule_generator import HourSlot, Patient, Therapist, WeekDay, create_schedule
+from schedule_generator import HourSlot, Patient, Therapist, TimeslotGrid, WeekDay, create_schedule
 from print_table import print_consultations, print_schedule_table
 
 def create_hour_slots_for_range(start_hour: float, end_hour: float) -> List[HourSlot]:
@@ -24,20 +24,23 @@ def create_hour_slots_for_range(start_hour: float, end_hour: float) -> List[Hour
         current += 1
     return hour_slots
 
-def generate_varied_availability(start_hour: float = 7.0, end_hour: float = 18.0) -> dict[str, List[HourSlot]]:
+def generate_varied_availability(start_hour: float = 7.0, end_hour: float = 18.0,
+                                 rng: random.Random = None) -> dict[str, List[HourSlot]]:
     """
     Generates varied availability for a person across the week.
     Each day has a random block of available hours (at least 2 hours, up to full day).
     Args:
         start_hour: Operating start hour (e.g., 7.0 for 7 AM).
         end_hour: Operating end hour (e.g., 18.0 for 6 PM).
+        rng: Generator to draw from (the global random module if None).
     Returns:
         Dict mapping day names to lists of available HourSlot slots.
     """
+    rng = rng or random
     availability = {}
     for day in WeekDay:
         # Decide if the person is available at all on this day (80% chance of being available)
-        if random.random() < 0.2:
+        if rng.random() < 0.2:
             availability[day.value] = []
             continue
 
@@ -45,10 +48,10 @@ def generate_varied_availability(start_hour: float = 7.0, end_hour: float = 18.0
         possible_starts = list(range(int(start_hour), int(end_hour) - 2))
         if not possible_starts:
             possible_starts = [int(start_hour)]
-        start = random.choice(possible_starts)
+        start = rng.choice(possible_starts)
         min_end = min(start + 2, int(end_hour))
         max_end = int(end_hour)
-        end = random.randint(min_end, max_end)
+        end = rng.randint(min_end, max_end)
 
         # Generate one-hour slots for this range
         hour_slots = create_hour_slots_for_range(float(start), float(end))
@@ -56,55 +59,55 @@ def generate_varied_availability(start_hour: float = 7.0, end_hour: float = 18.0
 
     return availability
 
-def create_complex_test_case():
+THERAPIST_TEMPLATES = [
+    ("Dr. Alice", "Speech Therapist"),
+    ("Dr. Bob", "Psychologist"),
+    ("Dr. Charlie", "Occupational Therapist"),
+    ("Dr. Dana", "Speech Therapist"),
+]
+
+def create_complex_test_case(num_patients: int = 10, num_therapists: int = 4,
+                             start_hour: float = 7.0, end_hour: float = 18.0, rng: random.Random = None):
     """
-    Creates a complex test case with 4 therapists and 10 patients with varied availability.
+    Creates a complex test case with varied availability, by default 4 therapists and 10 patients.
+    Args:
+        num_patients: Number of patients to generate.
+        num_therapists: Number of therapists; specialties and names cycle through THERAPIST_TEMPLATES.
+        start_hour: Opening hour of the generated timeslots and availability.
+        end_hour: Closing hour of the generated timeslots and availability.
+        rng: Generator for every random draw (the global random module if None).
     Returns:
         Tuple of (patients, therapists, timeslots).
     """
+    rng = rng or random
     # Define therapists with varied availability
-    therapists = [
-        Therapist(
-            id="T1",
-            name="Dr. Alice",
-            specialty="Speech Therapist",
-            availability=generate_varied_availability()
-        ),
-        Therapist(
-            id="T2",
-            name="Dr. Bob",
-            specialty="Psychologist",
-            availability=generate_varied_availability()
-        ),
-        Therapist(
-            id="T3",
-            name="Dr. Charlie",
-            specialty="Occupational Therapist",
-            availability=generate_varied_availability()
-        ),
-        Therapist(
-            id="T4",
-            name="Dr. Dana",
-            specialty="Speech Therapist",
-            availability=generate_varied_availability()
-        ),
-    ]
+    therapists = []
+    for i in range(num_therapists):
+        name, specialty = THERAPIST_TEMPLATES[i % len(THERAPIST_TEMPLATES)]
+        if i >= len(THERAPIST_TEMPLATES):
+            name = f"{name} {i // len(THERAPIST_TEMPLATES) + 1}"
+        therapists.append(Therapist(
+            id=f"T{i + 1}",
+            name=name,
+            specialty=specialty,
+            availability=generate_varied_availability(start_hour, end_hour, rng)
+        ))
 
     # Define patients with varied weekly needs and availability
     patients = []
-    for i in range(1, 11):
+    for i in range(1, num_patients + 1):
         # Randomly assign needs (0 to 3 hours per specialty)
         needs = {
-            "Speech Therapist": random.randint(0, 3),
-            "Psychologist": random.randint(0, 3),
-            "Occupational Therapist": random.randint(0, 3)
+            "Speech Therapist": rng.randint(0, 3),
+            "Psychologist": rng.randint(0, 3),
+            "Occupational Therapist": rng.randint(0, 3)
         }
         # Ensure at least some need to avoid trivial cases
         while sum(needs.values()) == 0:
-            needs[random.choice(list(needs.keys()))] = random.randint(1, 3)
+            needs[rng.choice(list(needs.keys()))] = rng.randint(1, 3)
 
         # Adjust needs based on availability to increase likelihood of a feasible schedule
-        patient_availability = generate_varied_availability()
+        patient_availability = generate_varied_availability(start_hour, end_hour, rng)
         total_available_hours = sum(len(hour_slots) for hour_slots in patient_availability.values())  # Each slot is 1 hour
         total_needs = sum(needs.values())
         if total_needs > total_available_hours:
@@ -114,7 +117,7 @@ def create_complex_test_case():
                 needs[specialty] = int(needs[specialty] * factor)
             # Ensure at least some need remains
             if sum(needs.values()) == 0 and total_available_hours > 0:
-                needs[random.choice(list(needs.keys()))] = 1
+                needs[rng.choice(list(needs.keys()))] = 1
 
         patients.append(Patient(
             id=f"P{i}",
@@ -123,20 +126,8 @@ def create_complex_test_case():
             availability=patient_availability
         ))
 
-    # Define time slots as one-hour blocks from 7:00 to 18:00, Monday to Friday.
-    timeslots = []
-    slot_id = 1
-    for day in WeekDay:
-        current = 7.0
-        while current < 18.0:
-            timeslots.append({
-                "id": str(slot_id),
-                "day_of_week": day.value,
-                "start_time": current,
-                "end_time": current + 1.0
-            })
-            slot_id += 1
-            current += 1.0
+    # Define time slots as one-hour blocks from start_hour to end_hour, Monday to Friday.
+    timeslots = TimeslotGrid.weekly(int(start_hour), int(end_hour))
 
     return patients, therapists, timeslots
 
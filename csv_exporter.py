@@ -1,6 +1,7 @@
 import csv
+from schedule_index import ScheduleIndex
 
-def export_schedule_to_csv(schedule, timeslots, output_dir="patient_schedules"):
+def export_schedule_to_csv(schedule, timeslots, output_dir="patient_schedules", index=None):
     """
     Export each patient's schedule to a separate CSV file.
     
@@ -8,57 +9,68 @@ def export_schedule_to_csv(schedule, timeslots, output_dir="patient_schedules"):
         schedule: List of (patient, therapist, timeslot) tuples representing the schedule.
         timeslots: List of time slot dictionaries with 'start_time' and 'end_time'.
         output_dir: Directory to save CSV files (default: 'patient_schedules').
+        index: Optional ScheduleIndex already built for this schedule.
     """
     import os
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
-    
-    # Define the days of the week
-    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-    
-    # Extract unique time intervals from timeslots and sort by start time
-    time_intervals = sorted(
-        set((ts["start_time"], ts["end_time"]) for ts in timeslots),
-        key=lambda x: x[0]
-    )
-    
-    # Extract unique patients from the schedule
-    patients = set(p for p, _, _ in schedule)
-    
+    index = index or ScheduleIndex(schedule, timeslots)
+
     # Iterate through each patient
-    for patient in sorted(patients, key=lambda p: p.id):
-        # Initialize an empty schedule dictionary for this patient
-        schedule_dict = {day: {interval: "Free" for interval in time_intervals} for day in days}
-        
-        # Populate the schedule dictionary with consultations for this patient
-        for p, t, ts in schedule:
-            if p == patient:
-                day = ts["day_of_week"]
-                start_time = ts["start_time"]
-                end_time = ts["end_time"]
-                interval = (start_time, end_time)
-                schedule_dict[day][interval] = f"{t.name} ({t.specialty})"
-        
+    for patient_id in sorted(index.by_patient):
+        patient = index.patients[patient_id]
         # Define CSV file path (e.g., "patient_schedules/Patient_1_schedule.csv")
         csv_filename = os.path.join(output_dir, f"{patient.name.replace(' ', '_')}_schedule.csv")
-        
-        # Write to CSV
-        with open(csv_filename, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            # Write header row
-            header = ["Time"] + days
-            writer.writerow(header)
-            
-            # Write data rows
-            for start, end in time_intervals:
-                time_str = f"{int(start):02d}:{int((start % 1) * 60):02d} - {int(end):02d}:{int((end % 1) * 60):02d}"
-                row = [time_str]
-                for day in days:
-                    row.append(schedule_dict[day][(start, end)])
-                writer.writerow(row)
-        
+        _write_grid(csv_filename, index.days, index.patient_grid(patient_id))
         print(f"Exported schedule for {patient.name} to {csv_filename}")
 
+def export_therapist_schedules_to_csv(schedule, timeslots, output_dir="therapist_schedules", index=None):
+    """
+    Export each therapist's schedule to a separate CSV file, naming the patient in each booked slot.
+
+    Args:
+        schedule: List of (patient, therapist, timeslot) tuples representing the schedule.
+        timeslots: List of time slot dictionaries with 'start_time' and 'end_time'.
+        output_dir: Directory to save CSV files (default: 'therapist_schedules').
+        index: Optional ScheduleIndex already built for this schedule.
+    """
+    import os
+    os.makedirs(output_dir, exist_ok=True)
+    index = index or ScheduleIndex(schedule, timeslots)
+    for therapist_id in sorted(index.therapists):
+        therapist = index.therapists[therapist_id]
+        csv_filename = os.path.join(output_dir, f"{therapist.name.replace(' ', '_').replace('.', '')}_schedule.csv")
+        _write_grid(csv_filename, index.days, index.therapist_grid(therapist_id))
+        print(f"Exported schedule for {therapist.name} to {csv_filename}")
+
+def export_utilization_to_csv(schedule, timeslots, csv_filename="therapist_utilization.csv", therapists=None, index=None):
+    """
+    Export booked versus available hours per therapist to a single CSV file.
+
+    Args:
+        schedule: List of (patient, therapist, timeslot) tuples representing the schedule.
+        timeslots: List of time slot dictionaries with 'start_time' and 'end_time'.
+        csv_filename: Path of the CSV file to write.
+        therapists: Optional full therapist roster, so idle therapists are included.
+        index: Optional ScheduleIndex already built for this schedule.
+    """
+    index = index or ScheduleIndex(schedule, timeslots)
+    rows = index.therapist_utilization(therapists)
+    fields = ["therapist_id", "therapist", "specialty", "booked_hours", "available_hours", "utilization"]
+    with open(csv_filename, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({**row, "utilization": f"{row['utilization']:.2f}"})
+    print(f"Exported therapist utilization to {csv_filename}")
+
+def _write_grid(csv_filename, days, rows):
+    """Write one weekly grid (rows of [time, cell per day]) with a Time/day header."""
+    with open(csv_filename, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Time"] + days)
+        writer.writerows(rows)
+
 # Example usage (add this after generating your schedule):
 # schedule = create_schedule(patients, therapists, timeslots)
 # if schedule:
@@ -0,0 +1,213 @@
+"""
+Two-stage engine for large rosters: allocate hours to days, then solve each day on its own.
+
+Stage 1 is a small aggregate model with one integer per (patient, specialty, day): how many hours
+of that specialty the patient gets that day. It keeps every weekly need and three daily capacity
+bounds, all implied by the full model, so an infeasible stage 1 proves the roster infeasible. Its
+objective packs each patient's hours (and each specialty's hours) into as few days as possible,
+which is where the consecutive-appointment bonuses can be earned.
+
+Stage 2 solves one create_schedule-style model per day, in parallel, with the day's allocation as
+the needs. The bonuses only pair slots within a day, so the day objectives add up to the objective
+of the full model. Because the day bounds are only necessary conditions, a day can still turn out
+infeasible; the engine then falls back to the monolithic create_schedule.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from schedule_generator import (Patient, Therapist, as_timeslot_grid, build_schedule_model, create_schedule,
+                                extract_schedule, load_cp_model)
+
+def _daily_capacity(patients: List[Patient], therapists: List[Therapist], grid) -> tuple:
+    """
+    Returns:
+        Tuple of (reachable, patient_day, specialty_day): jointly available slots per (patient.id,
+        specialty, day), slots usable for any need per (patient.id, day) and therapist-hours per
+        (specialty, day).
+    """
+    therapist_slots = {}  # (specialty, day) -> set of HourSlots with at least one therapist
+    specialty_day = {}
+    for therapist in therapists:
+        for day, slots in therapist.availability.items():
+            hours = [hs for hs in slots if grid.lookup(day, hs) is not None]
+            therapist_slots.setdefault((therapist.specialty, day), set()).update(hours)
+            specialty_day[(therapist.specialty, day)] = specialty_day.get((therapist.specialty, day), 0) + len(hours)
+
+    reachable = {}
+    patient_day = {}
+    for patient in patients:
+        for day, slots in patient.availability.items():
+            usable = set()
+            for specialty, hours_needed in patient.weekly_specialty_needs.items():
+                if hours_needed > 0:
+                    joint = {hs for hs in slots if hs in therapist_slots.get((specialty, day), ())}
+                    reachable[(patient.id, specialty, day)] = len(joint)
+                    usable |= joint
+            patient_day[(patient.id, day)] = len(usable)
+    return reachable, patient_day, specialty_day
+
+def allocate_days(patients: List[Patient], therapists: List[Therapist], timeslots,
+                  num_workers: int = None, time_limit: float = None) -> tuple:
+    """
+    Stage 1: decides how many hours of each specialty every patient gets on each day.
+    Returns:
+        Tuple of (status name, allocation) where allocation maps patient.id -> day -> {specialty: hours},
+        or None when no allocation was found.
+    """
+    cp_model = load_cp_model()
+    grid = as_timeslot_grid(timeslots)
+    reachable, patient_day, specialty_day = _daily_capacity(patients, therapists, grid)
+    days = list(grid.by_day)
+
+    model = cp_model.CpModel()
+    hours = {}         # (patient.id, specialty, day) -> IntVar
+    by_patient_day = {}
+    by_specialty_day = {}
+    attends = []       # one bool per (patient, day) and per (patient, specialty, day) that is used
+    for patient in patients:
+        for specialty, hours_needed in patient.weekly_specialty_needs.items():
+            if hours_needed <= 0:
+                continue
+            per_day = []
+            for day in days:
+                upper = min(hours_needed, reachable.get((patient.id, specialty, day), 0))
+                if upper == 0:
+                    continue
+                var = model.NewIntVar(0, upper, f'hours_{patient.id}_{specialty}_{day}')
+                used = model.NewBoolVar(f'uses_{patient.id}_{specialty}_{day}')
+                model.Add(var <= upper * used)
+                attends.append(used)
+                hours[(patient.id, specialty, day)] = var
+                per_day.append(var)
+                by_patient_day.setdefault((patient.id, day), []).append(var)
+                by_specialty_day.setdefault((specialty, day), []).append(var)
+            if not per_day:
+                return "INFEASIBLE", None
+            model.Add(sum(per_day) == hours_needed)
+
+    for (patient_id, day), variables in by_patient_day.items():
+        used = model.NewBoolVar(f'attends_{patient_id}_{day}')
+        model.Add(sum(variables) <= patient_day[(patient_id, day)] * used)
+        attends.append(used)
+    for (specialty, day), variables in by_specialty_day.items():
+        model.Add(sum(variables) <= specialty_day.get((specialty, day), 0))
+
+    # Every day (and specialty-day) a patient is split over costs one potential consecutive pair.
+    model.Minimize(sum(attends))
+
+    solver = cp_model.CpSolver()
+    if num_workers is not None:
+        solver.parameters.num_workers = num_workers
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit
+    status = solver.Solve(model)
+    if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+        return solver.StatusName(status), None
+
+    allocation: Dict[str, Dict[str, dict]] = {}
+    for (patient_id, specialty, day), var in hours.items():
+        value = solver.Value(var)
+        if value:
+            allocation.setdefault(patient_id, {}).setdefault(day, {})[specialty] = value
+    return solver.StatusName(status), allocation
+
+def _solve_day(day: str, patients: List[Patient], therapists: List[Therapist], allocation: dict, grid,
+               num_workers: int = None, time_limit: float = None) -> tuple:
+    """
+    Stage 2 for one day: the create_schedule model over that day's timeslots, with the day's
+    allocation as each patient's needs.
+    Returns:
+        Tuple of (status name, schedule or None, objective).
+    """
+    cp_model = load_cp_model()
+    day_patients = [Patient(id=p.id, name=p.name, weekly_specialty_needs=allocation[p.id][day],
+                            availability={day: p.availability.get(day, [])})
+                    for p in patients if day in allocation.get(p.id, {})]
+    if not day_patients:
+        return "OPTIMAL", [], 0.0
+    day_therapists = [Therapist(id=t.id, name=t.name, specialty=t.specialty, availability={day: t.availability.get(day, [])})
+                      for t in therapists if t.availability.get(day)]
+    schedule_model = build_schedule_model(day_patients, day_therapists, grid.by_day[day])
+
+    solver = cp_model.CpSolver()
+    if num_workers is not None:
+        solver.parameters.num_workers = num_workers
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit
+    status = solver.Solve(schedule_model.model)
+    if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+        return solver.StatusName(status), None, None
+    patients_by_id = {p.id: p for p in patients}
+    therapists_by_id = {t.id: t for t in therapists}
+    schedule = [(patients_by_id[p.id], therapists_by_id[t.id], ts) for p, t, ts in extract_schedule(solver, schedule_model)]
+    return solver.StatusName(status), schedule, solver.ObjectiveValue()
+
+def create_schedule_decomposed(patients: List[Patient], therapists: List[Therapist], timeslots,
+                               num_workers: int = None, time_limit: float = None, parallel_days: int = 5,
+                               fallback: bool = True, report: dict = None) -> Optional[List[tuple]]:
+    """
+    Day allocation followed by independent per-day solves, with the monolithic model as fallback.
+    Args:
+        num_workers: CP-SAT search workers for each model (if None, stage 1 uses the solver default and
+                     each day solve gets an equal share of the CPUs, so parallel days do not oversubscribe them).
+        time_limit: Overall time limit in seconds (no limit if None); stage 1 gets a fifth of it and the
+                    day solves, which run side by side, get the rest.
+        parallel_days: Number of day models solved at the same time.
+        fallback: Solve the monolithic create_schedule model if stage 1 times out or a day is infeasible.
+        report: Optional dict filled with the engine ("decomposed", or "cp-sat" after a fallback), status,
+                objective, per-day statuses and stage timings.
+    Returns:
+        List of (patient, therapist, timeslot) tuples, or None if no feasible schedule was found.
+    """
+    start = time.monotonic()
+    grid = as_timeslot_grid(timeslots)
+    allocation_status, allocation = allocate_days(patients, therapists, grid, num_workers=num_workers,
+                                                  time_limit=time_limit / 5 if time_limit is not None else None)
+    allocation_time = time.monotonic() - start
+    print(f"Day allocation status: {allocation_status} ({allocation_time:.2f}s)")
+    result = {"engine": "decomposed", "allocation_status": allocation_status, "allocation_time": allocation_time,
+              "days": {}, "fallback": False}
+
+    day_statuses = {}
+    schedule, objective = None, None
+    if allocation is not None:
+        remaining = None if time_limit is None else max(time_limit - allocation_time, 0.1)
+        days = list(grid.by_day)
+        parallel_days = max(1, parallel_days)
+        day_workers = num_workers if num_workers is not None else max(1, (os.cpu_count() or 1) // parallel_days)
+        with ThreadPoolExecutor(max_workers=parallel_days) as executor:
+            futures = {day: executor.submit(_solve_day, day, patients, therapists, allocation, grid,
+                                            day_workers, remaining) for day in days}
+            results = {day: future.result() for day, future in futures.items()}
+        day_statuses = {day: status for day, (status, _, _) in results.items()}
+        result["days"] = day_statuses
+        if all(day_schedule is not None for _, day_schedule, _ in results.values()):
+            schedule = [entry for day in days for entry in results[day][1]]
+            objective = sum(day_objective for _, _, day_objective in results.values())
+        result["day_time"] = time.monotonic() - start - allocation_time
+
+    if schedule is not None:
+        print(f"Decomposed schedule: {len(schedule)} consultations, objective {objective:g} "
+              f"in {time.monotonic() - start:.2f}s")
+        result.update({"status": "FEASIBLE", "objective": objective})
+    elif allocation_status == "INFEASIBLE" or not fallback:
+        # A failed day does not prove the roster infeasible, only stage 1 does.
+        print("No feasible schedule found.")
+        result.update({"status": allocation_status if allocation is None else "UNKNOWN", "objective": None})
+    else:
+        failed = [day for day, status in day_statuses.items() if status not in ("OPTIMAL", "FEASIBLE")]
+        print(f"Decomposition failed ({', '.join(failed) or allocation_status}); falling back to the full model.")
+        remaining = None if time_limit is None else max(time_limit - (time.monotonic() - start), 0.1)
+        fallback_report = {}
+        schedule = create_schedule(patients, therapists, grid, num_workers=num_workers, time_limit=remaining,
+                                   report=fallback_report)
+        result.update(fallback_report)
+        result["fallback"] = True
+        result["days"] = day_statuses
+
+    result["wall_time"] = time.monotonic() - start
+    if report is not None:
+        report.update(result)
+    return schedule
@@ -0,0 +1,164 @@
+"""
+Differential correctness harness for the scheduling engines.
+
+Generates seeded random rosters with the complex_test_case helpers, solves each with the reference
+engine (create_schedule) and with faster engines or modes, and checks every result against the
+reference: the schedule must be valid, feasibility must agree, and the objective must match exactly
+(exact engines) or come within the engine's declared gap. Reports the speedup per instance.
+
+Example:
+    python differential_harness.py --seeds 10 --patients 6 --therapists 4
+    python differential_harness.py --engines incremental,decomposed --seeds 5 --start-hour 8 --end-hour 14
+"""
+import argparse
+import random
+import sys
+import time
+from typing import Callable, List, Optional
+
+from complex_test_case import create_complex_test_case
+from schedule_generator import create_schedule, schedule_objective
+from schedule_validator import validate_schedule
+
+class Engine:
+    """
+    A scheduling engine under test.
+    Args:
+        solve: Callable(patients, therapists, timeslots, time_limit) returning a schedule or None.
+        gap: Largest accepted relative shortfall against the reference objective; 0.0 for exact
+             engines, None to check validity and feasibility only.
+    """
+    def __init__(self, name: str, solve: Callable, gap: Optional[float]):
+        self.name = name
+        self.solve = solve
+        self.gap = gap
+
+def _incremental(patients, therapists, timeslots, time_limit):
+    from incremental_model import IncrementalScheduleModel
+    builder = IncrementalScheduleModel(timeslots)
+    for therapist in therapists:
+        builder.add_therapist(therapist)
+    for patient in patients:
+        builder.add_patient(patient)
+    return builder.solve(time_limit=time_limit)
+
+def _decomposed(patients, therapists, timeslots, time_limit):
+    from decomposed_scheduler import create_schedule_decomposed
+    return create_schedule_decomposed(patients, therapists, timeslots, time_limit=time_limit)
+
+def _lns(patients, therapists, timeslots, time_limit):
+    from lns_scheduler import create_schedule_lns
+    return create_schedule_lns(patients, therapists, timeslots, time_budget=min(time_limit, 5.0), seed=0)
+
+def _mip(patients, therapists, timeslots, time_limit):
+    from mip_scheduler import create_schedule_mip
+    return create_schedule_mip(patients, therapists, timeslots, time_limit=time_limit)
+
+ENGINES = {
+    "greedy-hint": Engine("greedy-hint", lambda p, t, ts, limit: create_schedule(
+        p, t, ts, time_limit=limit, greedy_fallback=True), 0.0),
+    "incremental": Engine("incremental", _incremental, 0.0),
+    "fast": Engine("fast", lambda p, t, ts, limit: create_schedule(
+        p, t, ts, time_limit=limit, feasibility_only=True), None),
+    "fast-polish": Engine("fast-polish", lambda p, t, ts, limit: create_schedule(
+        p, t, ts, time_limit=limit, feasibility_only=True, polish_time=limit), 0.25),
+    "decomposed": Engine("decomposed", _decomposed, 0.25),
+    "lns": Engine("lns", _lns, 0.25),
+    "mip": Engine("mip", _mip, 0.0),
+    "portfolio": Engine("portfolio", lambda p, t, ts, limit: create_schedule(
+        p, t, ts, time_limit=limit, portfolio=True), 0.0),
+}
+
+def generate_instance(seed: int, num_patients: int = 5, num_therapists: int = 4,
+                      start_hour: float = 8.0, end_hour: float = 13.0) -> tuple:
+    """A reproducible complex_test_case roster: (patients, therapists, timeslots)."""
+    return create_complex_test_case(num_patients, num_therapists, start_hour, end_hour, rng=random.Random(seed))
+
+def _timed(solve: Callable, *args) -> tuple:
+    started = time.perf_counter()
+    schedule = solve(*args)
+    return schedule, time.perf_counter() - started
+
+def compare(engine: Engine, patients, therapists, timeslots, reference: Optional[List[tuple]],
+            reference_report: dict, reference_time: float, time_limit: float) -> dict:
+    """
+    Runs one engine on one instance and checks it against the reference result.
+    Returns:
+        Dict with "engine", "status" ("ok" or "FAIL"), "problems", both objectives, both times and "speedup".
+    """
+    schedule, elapsed = _timed(engine.solve, patients, therapists, timeslots, time_limit)
+    problems = []
+    objective = None
+    reference_objective = schedule_objective(reference, timeslots) if reference is not None else None
+    proven_optimal = reference_report.get("status") == "OPTIMAL"
+
+    if schedule is not None:
+        problems.extend(validate_schedule(schedule, patients, therapists))
+        objective = schedule_objective(schedule, timeslots)
+    if reference_report.get("status") == "INFEASIBLE" and schedule is not None:
+        problems.append("reference proved the roster infeasible but the engine returned a schedule")
+    elif reference is not None and schedule is None:
+        problems.append("engine found no schedule for a feasible roster")
+    elif reference is not None and engine.gap is not None:
+        bound = reference_report.get("best_bound")
+        if bound is not None and objective > bound + 1e-6:
+            problems.append(f"objective {objective} exceeds the reference bound {bound:g}")
+        if engine.gap == 0.0 and proven_optimal and objective != reference_objective:
+            problems.append(f"objective {objective} differs from the optimal reference {reference_objective}")
+        elif engine.gap > 0.0 and objective < reference_objective * (1 - engine.gap):
+            problems.append(f"objective {objective} is more than {engine.gap:.0%} below reference {reference_objective}")
+
+    return {"engine": engine.name, "status": "FAIL" if problems else "ok", "problems": problems,
+            "objective": objective, "reference_objective": reference_objective,
+            "reference_status": reference_report.get("status"), "time": elapsed,
+            "reference_time": reference_time, "speedup": reference_time / elapsed if elapsed else float("inf")}
+
+def run_harness(seeds: List[int], engine_names: List[str] = None, num_patients: int = 5, num_therapists: int = 4,
+                start_hour: float = 8.0, end_hour: float = 13.0, time_limit: float = 30.0) -> List[dict]:
+    """
+    Solves every seeded instance with the reference engine and each selected engine.
+    Returns:
+        One result dict per (seed, engine), as returned by compare() plus "seed".
+    """
+    engines = [ENGINES[name] for name in (engine_names or list(ENGINES))]
+    results = []
+    for seed in seeds:
+        patients, therapists, timeslots = generate_instance(seed, num_patients, num_therapists, start_hour, end_hour)
+        reference_report = {}
+        reference, reference_time = _timed(lambda: create_schedule(patients, therapists, timeslots,
+                                                                   time_limit=time_limit, report=reference_report))
+        for engine in engines:
+            result = compare(engine, patients, therapists, timeslots, reference, reference_report,
+                             reference_time, time_limit)
+            result["seed"] = seed
+            results.append(result)
+    return results
+
+def print_report(results: List[dict]):
+    """Print one row per (seed, engine) with objectives, times and speedup, then any problems."""
+    header = ["Seed".rjust(5), "Engine".ljust(12), "Reference".ljust(10), "Ref obj".rjust(8), "Obj".rjust(6),
+              "Ref s".rjust(8), "s".rjust(8), "Speedup".rjust(8), "Check"]
+    print(" | ".join(header))
+    print("-" * 96)
+    for r in results:
+        print(" | ".join([str(r["seed"]).rjust(5), r["engine"].ljust(12), str(r["reference_status"]).ljust(10),
+                          str(r["reference_objective"]).rjust(8), str(r["objective"]).rjust(6),
+                          f"{r['reference_time']:8.2f}", f"{r['time']:8.2f}", f"{r['speedup']:7.1f}x", r["status"]]))
+    for r in results:
+        for problem in r["problems"]:
+            print(f"seed {r['seed']} {r['engine']}: {problem}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check faster scheduling engines against create_schedule.")
+    parser.add_argument("--seeds", type=int, default=5, help="Number of instances (seeds 0..N-1)")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="Comma-separated engines: " + ", ".join(ENGINES))
+    parser.add_argument("--patients", type=int, default=5)
+    parser.add_argument("--therapists", type=int, default=4)
+    parser.add_argument("--start-hour", type=float, default=8.0)
+    parser.add_argument("--end-hour", type=float, default=13.0)
+    parser.add_argument("--time-limit", type=float, default=30.0, help="Time limit per solve in seconds")
+    args = parser.parse_args()
+    results = run_harness(list(range(args.seeds)), args.engines.split(","), args.patients, args.therapists,
+                          args.start_hour, args.end_hour, args.time_limit)
+    print_report(results)
+    sys.exit(1 if any(r["problems"] for r in results) else 0)
@@ -0,0 +1,136 @@
+from typing import Dict, List
+
+from schedule_generator import Patient, Therapist, load_cp_model, as_timeslot_grid
+
+class FeasibleSlotIndex:
+    """
+    Per (patient, specialty): every (therapist, timeslot) pair where the therapist has that specialty
+    and both are available. Built once from the roster in O(patients x therapists x timeslots).
+    """
+    def __init__(self, patients: List[Patient], therapists: List[Therapist], timeslots):
+        self.grid = as_timeslot_grid(timeslots)
+        self.patients = patients
+        self.therapists = therapists
+        self.pairs: Dict[tuple, List[tuple]] = {}  # (patient.id, specialty) -> [(therapist, timeslot)]
+        therapist_slots = {t.id: {(ts["day_of_week"], hs) for ts, hs in zip(self.grid.timeslots, self.grid.hour_slots)
+                                  if hs in t.availability.get(ts["day_of_week"], [])} for t in therapists}
+        for patient in patients:
+            patient_slots = [(ts, hs) for ts, hs in zip(self.grid.timeslots, self.grid.hour_slots)
+                             if hs in patient.availability.get(ts["day_of_week"], [])]
+            for specialty, hours_needed in patient.weekly_specialty_needs.items():
+                if hours_needed <= 0:
+                    continue
+                self.pairs[(patient.id, specialty)] = [
+                    (therapist, ts) for ts, hs in patient_slots for therapist in therapists
+                    if therapist.specialty == specialty and (ts["day_of_week"], hs) in therapist_slots[therapist.id]
+                ]
+
+    def reachable_slots(self, patient_id: str, specialty: str) -> set:
+        """Distinct timeslot ids the patient could use for the specialty."""
+        return {ts["id"] for _, ts in self.pairs.get((patient_id, specialty), [])}
+
+def quick_infeasibility_checks(index: FeasibleSlotIndex) -> List[str]:
+    """
+    Counting checks that prove infeasibility in milliseconds when they fire:
+    a need larger than the patient's reachable slots for that specialty, a patient whose total
+    needs exceed all their reachable slots, or a specialty whose total demand exceeds the
+    therapist-slots any patient could use.
+    """
+    reasons = []
+    for patient in index.patients:
+        needed = {s: h for s, h in patient.weekly_specialty_needs.items() if h > 0}
+        all_slots = set()
+        for specialty, hours_needed in needed.items():
+            slots = index.reachable_slots(patient.id, specialty)
+            all_slots |= slots
+            if hours_needed > len(slots):
+                reasons.append(f"{patient.name} needs {hours_needed} {specialty} hours but only {len(slots)} "
+                               f"timeslots are jointly available with a {specialty}")
+        total = sum(needed.values())
+        if total > len(all_slots) and len(needed) > 1:
+            reasons.append(f"{patient.name} needs {total} hours in total but only {len(all_slots)} timeslots "
+                           f"are jointly available with any needed therapist")
+
+    demand = {}
+    capacity = {}  # specialty -> {(therapist.id, timeslot["id"])}
+    for patient in index.patients:
+        for specialty, hours_needed in patient.weekly_specialty_needs.items():
+            if hours_needed > 0:
+                demand[specialty] = demand.get(specialty, 0) + hours_needed
+                capacity.setdefault(specialty, set()).update(
+                    (t.id, ts["id"]) for t, ts in index.pairs[(patient.id, specialty)])
+    for specialty, hours in demand.items():
+        available = len(capacity.get(specialty, ()))
+        if hours > available:
+            reasons.append(f"Patients need {hours} {specialty} hours in total but {specialty}s can offer "
+                           f"only {available} hours at times those patients are available")
+    return reasons
+
+def report_quick_infeasibility(patients: List[Patient], therapists: List[Therapist], timeslots,
+                               report: dict = None) -> bool:
+    """
+    Runs quick_infeasibility_checks before a solve, printing the reasons and filling report the way
+    create_schedule does when they fire.
+    Returns:
+        True if the roster is proven infeasible (skip the solve), otherwise False.
+    """
+    reasons = quick_infeasibility_checks(FeasibleSlotIndex(patients, therapists, timeslots))
+    if not reasons:
+        return False
+    for reason in reasons:
+        print(f"Infeasible: {reason}")
+    print("No feasible schedule found.")
+    if report is not None:
+        report.update({"engine": None, "status": "INFEASIBLE", "objective": None, "best_bound": None,
+                       "gap": None, "explanation": reasons})
+    return True
+
+def explain_infeasibility(patients: List[Patient], therapists: List[Therapist], timeslots,
+                          time_limit: float = 10.0) -> List[str]:
+    """
+    Explains why no schedule satisfies the hard constraints.
+
+    Runs quick_infeasibility_checks first. If they find nothing, solves the hard constraints
+    alone with one assumption literal per (patient, specialty) need and reports a set of needs
+    that cannot all be met together, from CP-SAT's sufficient assumptions for infeasibility.
+    Returns:
+        List of human-readable reasons; empty if the hard constraints are satisfiable (or if the
+        solver could not decide within time_limit).
+    """
+    index = FeasibleSlotIndex(patients, therapists, timeslots)
+    reasons = quick_infeasibility_checks(index)
+    if reasons:
+        return reasons
+
+    cp_model = load_cp_model()
+    model = cp_model.CpModel()
+    by_therapist_slot = {}
+    by_patient_slot = {}
+    assumptions = {}  # literal index -> (patient, specialty, hours)
+    for patient in patients:
+        for specialty, hours_needed in patient.weekly_specialty_needs.items():
+            if hours_needed <= 0:
+                continue
+            variables = []
+            for therapist, ts in index.pairs[(patient.id, specialty)]:
+                var = model.NewBoolVar(f'c_{patient.id}_{therapist.id}_{ts["id"]}')
+                by_therapist_slot.setdefault((therapist.id, ts["id"]), []).append(var)
+                by_patient_slot.setdefault((patient.id, ts["id"]), []).append(var)
+                variables.append(var)
+            literal = model.NewBoolVar(f'need_{patient.id}_{specialty}')
+            model.Add(sum(variables) == hours_needed).OnlyEnforceIf(literal)
+            assumptions[literal.Index()] = (patient, specialty, hours_needed)
+            model.AddAssumption(literal)
+    for overlapping in list(by_therapist_slot.values()) + list(by_patient_slot.values()):
+        if len(overlapping) > 1:
+            model.AddAtMostOne(overlapping)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    solver.parameters.max_time_in_seconds = time_limit
+    status = solver.Solve(model)
+    if status != cp_model.INFEASIBLE:
+        return []
+    core = [assumptions[i] for i in solver.SufficientAssumptionsForInfeasibility() if i in assumptions]
+    needs = ", ".join(f"{p.name}: {h} {s}" for p, s, h in core)
+    return [f"These needs cannot all be met together (therapist or patient time conflicts): {needs}"]
@@ -0,0 +1,68 @@
+from typing import List, Tuple
+
+from schedule_generator import Patient, Therapist, as_timeslot_grid
+
+def greedy_schedule(patients: List[Patient], therapists: List[Therapist], timeslots) -> Tuple[List[tuple], List[tuple]]:
+    """
+    Fast greedy assignment for the hard constraints of create_schedule: weekly needs, availability
+    of both parties and no double booking.
+
+    Needs are placed scarcest first (fewest jointly available therapist-slots per hour needed).
+    Each hour goes to the free candidate that extends a block with the same therapist, then any
+    block, then keeps the patient with a therapist they already see, then the earliest slot.
+    Returns:
+        Tuple of (schedule, unmet) where schedule is a list of (patient, therapist, timeslot) tuples and
+        unmet lists (patient, specialty, missing_hours) for needs that could not be fully placed.
+    """
+    grid = as_timeslot_grid(timeslots)
+    therapist_slots = {t.id: {(ts["day_of_week"], hs) for ts, hs in zip(grid.timeslots, grid.hour_slots)
+                              if hs in t.availability.get(ts["day_of_week"], [])} for t in therapists}
+
+    tasks = []
+    for patient in patients:
+        for specialty, hours_needed in patient.weekly_specialty_needs.items():
+            if hours_needed <= 0:
+                continue
+            candidates = []
+            for i, (ts, hour_slot) in enumerate(zip(grid.timeslots, grid.hour_slots)):
+                day = ts["day_of_week"]
+                if hour_slot not in patient.availability.get(day, []):
+                    continue
+                for therapist in therapists:
+                    if therapist.specialty == specialty and (day, hour_slot) in therapist_slots[therapist.id]:
+                        candidates.append((i, therapist, ts))
+            tasks.append((len(candidates) / hours_needed, patient, specialty, hours_needed, candidates))
+    tasks.sort(key=lambda task: (task[0], task[1].id, task[2]))
+
+    therapist_busy = set()  # (therapist.id, timeslot["id"])
+    patient_busy = {}       # (patient.id, timeslot["id"]) -> therapist.id
+    seen_with = set()       # (patient.id, therapist.id)
+    schedule = []
+    unmet = []
+    for _, patient, specialty, hours_needed, candidates in tasks:
+        placed = 0
+        while placed < hours_needed:
+            best = None
+            best_score = None
+            for i, therapist, ts in candidates:
+                if (therapist.id, ts["id"]) in therapist_busy or (patient.id, ts["id"]) in patient_busy:
+                    continue
+                neighbours = [patient_busy.get((patient.id, n)) for n in grid.neighbours[ts["id"]]]
+                score = (
+                    -sum(1 for n in neighbours if n == therapist.id),
+                    -sum(1 for n in neighbours if n is not None),
+                    (patient.id, therapist.id) not in seen_with,
+                    i
+                )
+                if best_score is None or score < best_score:
+                    best, best_score = (therapist, ts), score
+            if best is None:
+                unmet.append((patient, specialty, hours_needed - placed))
+                break
+            therapist, ts = best
+            therapist_busy.add((therapist.id, ts["id"]))
+            patient_busy[(patient.id, ts["id"])] = therapist.id
+            seen_with.add((patient.id, therapist.id))
+            schedule.append((patient, therapist, ts))
+            placed += 1
+    return schedule, unmet
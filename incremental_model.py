@@ -0,0 +1,390 @@
+"""
+A long-lived CP-SAT scheduling model that follows roster edits instead of being rebuilt per solve.
+
+Adding a patient appends only that patient's variables and constraints (and one consultation
+variable per jointly available slot with each therapist of a needed specialty); adding a
+therapist does the same for every patient who needs that specialty. Constraints shared between
+people (a therapist's one-patient-per-slot rule, a patient's weekly needs, a patient's
+scheduled-slot indicator) are written straight into the model proto so that new variables can be
+appended to them later. Removing someone fixes their variables to zero and relaxes their needs,
+which deactivates them in place; once deactivated variables outnumber live ones the model is
+rebuilt from the live roster. The model itself is built on first use (normally the first solve);
+edits before that only record the roster, so they stay cheap and never import OR-Tools. Builds and
+rebuilds run on a private copy outside the lock and are swapped in when done, so edits made
+meanwhile never wait for them.
+
+An app that keeps its roster in a RosterStore hands each new RosterSnapshot to sync(), and solves
+a snapshot with solve(snapshot=...), which always solves exactly that snapshot's roster.
+
+The model is equivalent to build_schedule_model: consultation variables that
+build_schedule_model forces to zero for unavailability are simply never created here.
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+from schedule_generator import (Patient, Therapist, ScheduleModel, as_timeslot_grid, load_cp_model,
+                                solve_schedule_model)
+
+class IncrementalScheduleModel:
+    """
+    Owns the scheduling roster and its CP-SAT model. All methods are thread-safe; solve() works on a
+    clone of the model, so edits can continue while a solve is running.
+    """
+    # The attributes a private build hands over when it is swapped in.
+    MODEL_FIELDS = ("patients", "therapists", "model", "consultations", "scheduled", "scheduled_constraint",
+                    "needs_constraint", "therapist_slot_constraint", "bonus_vars", "same_therapist_bonus_vars",
+                    "owned", "dead")
+    # Rebuild once deactivated variables exceed both this count and the number of live variables.
+    MIN_DEAD_VARIABLES_FOR_REBUILD = 1000
+
+    def __init__(self, timeslots):
+        self.grid = as_timeslot_grid(timeslots)
+        self.patients: Dict[str, Patient] = {}
+        self.therapists: Dict[str, Therapist] = {}
+        self.version = 0
+        self.roster_version = 0  # version of the last RosterSnapshot passed to sync()
+        self.rebuilds = 0
+        self._lock = threading.RLock()
+        self._serialized = None
+        self._serialized_version = None
+        self.model = None  # built on first use (e.g. the first solve), so roster edits do not import OR-Tools
+
+    def _reset(self):
+        """Starts an empty model; the roster dicts are left untouched."""
+        cp_model = load_cp_model()
+        self.model = cp_model.CpModel()
+        self.model.Proto().objective.scaling_factor = -1  # maximize: coefficients are stored negated
+        self.consultations: Dict[tuple, tuple] = {}    # (patient.id, therapist.id, timeslot["id"]) -> (var, patient, therapist, timeslot)
+        self.scheduled: Dict[tuple, object] = {}       # (patient.id, timeslot["id"]) -> var
+        self.scheduled_constraint: Dict[tuple, int] = {}  # (patient.id, timeslot["id"]) -> scheduled == sum(consultations)
+        self.needs_constraint: Dict[tuple, int] = {}   # (patient.id, specialty) -> sum(consultations) == hours
+        self.therapist_slot_constraint: Dict[tuple, int] = {}  # (therapist.id, timeslot["id"]) -> at most one
+        self.bonus_vars: Dict[str, List] = {}          # patient.id -> consecutive-slot bonus vars
+        self.same_therapist_bonus_vars: Dict[tuple, List] = {}  # (patient.id, therapist.id) -> same-therapist bonus vars
+        self.owned: Dict[tuple, List] = {}             # ("patient" | "therapist", id) -> vars to fix when removed
+        self.dead: set = set()                         # indices of variables fixed to zero by removals
+
+    def _ensure_model(self):
+        """Builds the model from the roster on first use; until then edits only update the roster."""
+        if self.model is None:
+            self._build()
+
+    def _build(self):
+        """
+        Builds a fresh model from the roster on a private copy, without holding the lock, and swaps
+        it in. Edits made during the build are then replayed on the copy until it has caught up.
+        """
+        with self._lock:
+            patients, therapists, version = dict(self.patients), dict(self.therapists), self.version
+        built = type(self)(self.grid)
+        built._reset()
+        while True:
+            built._apply(patients, therapists)
+            with self._lock:
+                if self.version == version:
+                    for name in self.MODEL_FIELDS:
+                        setattr(self, name, getattr(built, name))
+                    self._serialized_version = None
+                    return
+                patients, therapists, version = dict(self.patients), dict(self.therapists), self.version
+
+    def _apply(self, patients: Dict[str, Patient], therapists: Dict[str, Therapist]):
+        """Edits the built model until its roster is exactly the given one."""
+        for patient_id in [pid for pid, p in self.patients.items() if patients.get(pid) is not p]:
+            self._remove_patient(patient_id)
+        for therapist_id in [tid for tid, t in self.therapists.items() if therapists.get(tid) is not t]:
+            self._remove_therapist(therapist_id)
+        for therapist in therapists.values():
+            if therapist.id not in self.therapists:
+                self._add_therapist(therapist)
+        for patient in patients.values():
+            if patient.id not in self.patients:
+                self._add_patient(patient)
+
+    def _changed(self):
+        self.version += 1
+
+    def _available_slots(self, availability: dict) -> List[dict]:
+        return [ts for ts, hs in zip(self.grid.timeslots, self.grid.hour_slots)
+                if hs in availability.get(ts["day_of_week"], [])]
+
+    def _linear(self, variables: List, coeffs: List[int], lower: int, upper: int) -> int:
+        """Appends lower <= sum(coeffs * variables) <= upper to the proto and returns its index."""
+        proto = self.model.Proto()
+        constraint = proto.constraints.add()
+        constraint.linear.vars.extend(v.Index() for v in variables)
+        constraint.linear.coeffs.extend(coeffs)
+        constraint.linear.domain.extend([lower, upper])
+        return len(proto.constraints) - 1
+
+    def _append_term(self, constraint_index: int, var, coeff: int):
+        linear = self.model.Proto().constraints[constraint_index].linear
+        linear.vars.append(var.Index())
+        linear.coeffs.append(coeff)
+
+    def _maximize_term(self, var, weight: int = 1):
+        objective = self.model.Proto().objective
+        objective.vars.append(var.Index())
+        objective.coeffs.append(-weight)
+
+    def _fix_to_zero(self, variables: List):
+        proto = self.model.Proto()
+        for var in variables:
+            domain = proto.variables[var.Index()].domain
+            domain[0] = 0
+            domain[1] = 0
+            self.dead.add(var.Index())
+
+    def _pair_bonus(self, name: str, v1, v2):
+        """A 0/1 variable that is 1 exactly when both v1 and v2 are, added to the objective."""
+        bonus = self.model.NewBoolVar(name)
+        self.model.Add(bonus <= v1)
+        self.model.Add(bonus <= v2)
+        self.model.Add(bonus >= v1 + v2 - 1)
+        self._maximize_term(bonus)
+        return bonus
+
+    def _add_patient(self, patient: Patient):
+        self.patients[patient.id] = patient
+        owned = self.owned.setdefault(("patient", patient.id), [])
+        for ts in self._available_slots(patient.availability):
+            var = self.model.NewBoolVar(f'scheduled_{patient.id}_{ts["id"]}')
+            self.scheduled[(patient.id, ts["id"])] = var
+            self.scheduled_constraint[(patient.id, ts["id"])] = self._linear([var], [1], 0, 0)
+            owned.append(var)
+        for specialty, hours_needed in patient.weekly_specialty_needs.items():
+            if hours_needed > 0:
+                self.needs_constraint[(patient.id, specialty)] = self._linear([], [], hours_needed, hours_needed)
+
+        bonus_vars = self.bonus_vars.setdefault(patient.id, [])
+        for day, pairs in self.grid.adjacent_pairs.items():
+            if day not in patient.availability:
+                continue
+            for ts1, ts2 in pairs:
+                s1 = self.scheduled.get((patient.id, ts1["id"]))
+                s2 = self.scheduled.get((patient.id, ts2["id"]))
+                if s1 is not None and s2 is not None:
+                    bonus_vars.append(self._pair_bonus(f'bonus_{patient.id}_{ts1["id"]}_{ts2["id"]}', s1, s2))
+        owned.extend(bonus_vars)
+
+        for therapist in self.therapists.values():
+            self._connect(patient, therapist)
+
+    def _add_therapist(self, therapist: Therapist):
+        self.therapists[therapist.id] = therapist
+        self.owned.setdefault(("therapist", therapist.id), [])
+        for patient in self.patients.values():
+            self._connect(patient, therapist)
+
+    def _connect(self, patient: Patient, therapist: Therapist):
+        """Adds the consultation variables (and same-therapist bonuses) between one patient and one therapist."""
+        if patient.weekly_specialty_needs.get(therapist.specialty, 0) <= 0:
+            return
+        therapist_slots = {ts["id"] for ts in self._available_slots(therapist.availability)}
+        needs = self.needs_constraint[(patient.id, therapist.specialty)]
+        created = {}
+        for ts in self._available_slots(patient.availability):
+            if ts["id"] not in therapist_slots:
+                continue
+            var = self.model.NewBoolVar(f'consultation_{patient.id}_{therapist.id}_{ts["id"]}')
+            created[ts["id"]] = var
+            self.consultations[(patient.id, therapist.id, ts["id"])] = (var, patient, therapist, ts)
+            self._maximize_term(var)
+            self._append_term(self.scheduled_constraint[(patient.id, ts["id"])], var, -1)
+            self._append_term(needs, var, 1)
+            slot_key = (therapist.id, ts["id"])
+            if slot_key in self.therapist_slot_constraint:
+                self.model.Proto().constraints[self.therapist_slot_constraint[slot_key]].at_most_one.literals.append(var.Index())
+            else:
+                self.therapist_slot_constraint[slot_key] = self.model.AddAtMostOne([var]).Index()
+
+        same_bonus = self.same_therapist_bonus_vars.setdefault((patient.id, therapist.id), [])
+        for day, pairs in self.grid.adjacent_pairs.items():
+            for ts1, ts2 in pairs:
+                if ts1["id"] in created and ts2["id"] in created:
+                    same_bonus.append(self._pair_bonus(f'same_bonus_{patient.id}_{therapist.id}_{ts1["id"]}_{ts2["id"]}',
+                                                       created[ts1["id"]], created[ts2["id"]]))
+        variables = list(created.values()) + same_bonus
+        self.owned[("patient", patient.id)].extend(variables)
+        self.owned[("therapist", therapist.id)].extend(variables)
+
+    def add_patient(self, patient: Patient):
+        """Adds a patient, or replaces the patient with the same id."""
+        with self._lock:
+            if self.model is None:
+                self.patients[patient.id] = patient
+            else:
+                if patient.id in self.patients:
+                    self._remove_patient(patient.id)
+                self._add_patient(patient)
+            self._changed()
+
+    def add_therapist(self, therapist: Therapist):
+        """Adds a therapist, or replaces the therapist with the same id."""
+        with self._lock:
+            if self.model is None:
+                self.therapists[therapist.id] = therapist
+            else:
+                if therapist.id in self.therapists:
+                    self._remove_therapist(therapist.id)
+                self._add_therapist(therapist)
+            self._changed()
+
+    def _remove_patient(self, patient_id: str) -> Patient:
+        patient = self.patients.pop(patient_id)
+        self._fix_to_zero(self.owned.pop(("patient", patient_id)))
+        for specialty, hours_needed in patient.weekly_specialty_needs.items():
+            if hours_needed > 0:
+                domain = self.model.Proto().constraints[self.needs_constraint.pop((patient_id, specialty))].linear.domain
+                domain[0] = 0
+                domain[1] = 0
+        for ts in self._available_slots(patient.availability):
+            del self.scheduled[(patient_id, ts["id"])]
+            del self.scheduled_constraint[(patient_id, ts["id"])]
+            for therapist_id in self.therapists:
+                self.consultations.pop((patient_id, therapist_id, ts["id"]), None)
+        del self.bonus_vars[patient_id]
+        for therapist_id in self.therapists:
+            self.same_therapist_bonus_vars.pop((patient_id, therapist_id), None)
+        return patient
+
+    def _remove_therapist(self, therapist_id: str) -> Therapist:
+        therapist = self.therapists.pop(therapist_id)
+        self._fix_to_zero(self.owned.pop(("therapist", therapist_id)))
+        for ts in self._available_slots(therapist.availability):
+            self.therapist_slot_constraint.pop((therapist_id, ts["id"]), None)
+            for patient_id in self.patients:
+                self.consultations.pop((patient_id, therapist_id, ts["id"]), None)
+        for patient_id in self.patients:
+            self.same_therapist_bonus_vars.pop((patient_id, therapist_id), None)
+        return therapist
+
+    def remove_patient(self, patient_id: str) -> Optional[Patient]:
+        """Deactivates a patient's variables and constraints; returns the patient, or None if unknown."""
+        with self._lock:
+            if patient_id not in self.patients:
+                return None
+            if self.model is None:
+                patient = self.patients.pop(patient_id)
+            else:
+                patient = self._remove_patient(patient_id)
+            self._changed()
+            fragmented = self._fragmented()
+        if fragmented:
+            self.rebuild()
+        return patient
+
+    def remove_therapist(self, therapist_id: str) -> Optional[Therapist]:
+        """Deactivates a therapist's variables; returns the therapist, or None if unknown."""
+        with self._lock:
+            if therapist_id not in self.therapists:
+                return None
+            if self.model is None:
+                therapist = self.therapists.pop(therapist_id)
+            else:
+                therapist = self._remove_therapist(therapist_id)
+            self._changed()
+            fragmented = self._fragmented()
+        if fragmented:
+            self.rebuild()
+        return therapist
+
+    def sync(self, snapshot):
+        """
+        Brings the roster up to a roster_store.RosterSnapshot, adding and removing whoever differs.
+        Snapshots no newer than the last one synced are ignored, so concurrent callers may pass
+        whichever snapshot they read after their own edit.
+        """
+        with self._lock:
+            if snapshot.version <= self.roster_version:
+                return
+            patients = {p.id: p for p in snapshot.patients}
+            therapists = {t.id: t for t in snapshot.therapists}
+            if self.model is None:
+                self.patients, self.therapists = patients, therapists
+            else:
+                self._apply(patients, therapists)
+            self.roster_version = snapshot.version
+            self._changed()
+            fragmented = self._fragmented()
+        if fragmented:
+            self.rebuild()
+
+    def _fragmented(self) -> bool:
+        if self.model is None:
+            return False
+        live = len(self.model.Proto().variables) - len(self.dead)
+        return len(self.dead) > max(self.MIN_DEAD_VARIABLES_FOR_REBUILD, live)
+
+    def rebuild(self):
+        """Rebuilds the model from the live roster, dropping every deactivated variable and constraint."""
+        self._build()
+        with self._lock:
+            self.rebuilds += 1
+
+    def serialized_model(self) -> str:
+        """
+        The model proto in text format, cached until the next edit (e.g. to ship to a worker or store).
+        Load it with CpModel().Proto().parse_text_format(text).
+        """
+        self._ensure_model()
+        with self._lock:
+            if self._serialized_version != self.version:
+                self._serialized = str(self.model.Proto())
+                self._serialized_version = self.version
+            return self._serialized
+
+    def schedule_model(self, clone: bool = False) -> ScheduleModel:
+        """
+        The current model as a ScheduleModel for extract_schedule / add_schedule_hint.
+        With clone=True the model is a private copy that later edits do not touch.
+        """
+        self._ensure_model()
+        with self._lock:
+            same_bonus = [v for bonus in self.same_therapist_bonus_vars.values() for v in bonus]
+            bonus = [v for vars_ in self.bonus_vars.values() for v in vars_]
+            return ScheduleModel(self.model.Clone() if clone else self.model, self.grid,
+                                 list(self.consultations.values()),
+                                 {key: entry[0] for key, entry in self.consultations.items()}, bonus, same_bonus)
+
+    def solve(self, snapshot=None, **options) -> Optional[List[tuple]]:
+        """
+        Solves the current roster on a copy of the model; options and return value are those of
+        schedule_generator.create_schedule (num_workers, time_limit, gap_limit, greedy_fallback, report).
+        As there, time_limit covers the whole call, including a first build of the model.
+        With a snapshot (a roster_store.RosterSnapshot) the roster is synced to it first and exactly
+        that roster is solved, even if a later edit moves the builder on before the solve starts.
+        """
+        time_limit = options.pop("time_limit", None)
+        deadline = time.monotonic() + time_limit if time_limit is not None else None
+        if snapshot is not None:
+            self.sync(snapshot)
+            patients, therapists, version = list(snapshot.patients), list(snapshot.therapists), None
+        else:
+            with self._lock:
+                patients, therapists = list(self.patients.values()), list(self.therapists.values())
+                version = self.version
+        # The same counting pre-check as create_schedule, before paying for the model build or clone.
+        from feasibility import report_quick_infeasibility
+        if report_quick_infeasibility(patients, therapists, self.grid, options.get("report")):
+            return None
+        greedy = None
+        if options.get("greedy_fallback"):
+            from greedy_scheduler import greedy_schedule
+            greedy = greedy_schedule(patients, therapists, self.grid)
+        self._ensure_model()
+        with self._lock:
+            schedule_model = None
+            if snapshot is None or self.roster_version == snapshot.version:
+                schedule_model = self.schedule_model(clone=True)
+            if snapshot is None and self.version != version:
+                # Edited since the greedy run; solve_schedule_model redoes it for the current roster.
+                patients, therapists = list(self.patients.values()), list(self.therapists.values())
+                greedy = None
+        if schedule_model is None:
+            # The roster has already moved past the snapshot, so it gets a model of its own.
+            own = IncrementalScheduleModel(self.grid)
+            own.sync(snapshot)
+            schedule_model = own.schedule_model()
+        return solve_schedule_model(schedule_model, patients, therapists, deadline=deadline, greedy=greedy, **options)
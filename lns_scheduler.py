@@ -0,0 +1,118 @@
+import random
+import time
+from typing import List, Optional
+
+from greedy_scheduler import greedy_schedule
+from schedule_generator import Patient, Therapist, add_schedule_hint, build_schedule_model, load_cp_model
+
+NEIGHBOURHOODS = ("day", "specialty", "patients")
+
+def _fix_variable(proto, index: int, value: int):
+    """Pins a variable of a cloned model to a single value by collapsing its domain in place."""
+    domain = proto.variables[index].domain
+    domain[0] = value
+    domain[1] = value
+
+def _choose_neighbourhood(kind: str, consultations: List[tuple], rng: random.Random, patient_fraction: float) -> tuple:
+    """
+    Picks the consultation indices to free for one LNS iteration.
+    Returns:
+        Tuple of (description, set of indices into consultations).
+    """
+    if kind == "day":
+        day = rng.choice(sorted({ts["day_of_week"] for _, _, _, ts in consultations}))
+        free = {i for i, (_, _, _, ts) in enumerate(consultations) if ts["day_of_week"] == day}
+        return f"day={day}", free
+    if kind == "specialty":
+        specialty = rng.choice(sorted({t.specialty for _, _, t, _ in consultations}))
+        free = {i for i, (_, _, t, _) in enumerate(consultations) if t.specialty == specialty}
+        return f"specialty={specialty}", free
+    patient_ids = sorted({p.id for _, p, _, _ in consultations})
+    size = max(1, int(len(patient_ids) * patient_fraction))
+    chosen = set(rng.sample(patient_ids, min(size, len(patient_ids))))
+    free = {i for i, (_, p, _, _) in enumerate(consultations) if p.id in chosen}
+    return f"patients={len(chosen)}", free
+
+def create_schedule_lns(patients: List[Patient], therapists: List[Therapist], timeslots: List[dict],
+                        time_budget: float = 60.0, iteration_time_limit: float = 5.0,
+                        neighbourhoods: tuple = NEIGHBOURHOODS, patient_fraction: float = 0.2,
+                        record_all_iterations: bool = False, seed: Optional[int] = None,
+                        report: Optional[dict] = None) -> Optional[List[tuple]]:
+    """
+    Large neighbourhood search on top of the create_schedule model for very large rosters.
+
+    A first feasible assignment is found quickly, then a neighbourhood (one day, one specialty or a
+    random subset of patients) is freed and re-optimized with every other consultation fixed, until
+    the wall-clock budget is spent.
+    Args:
+        time_budget: Total wall-clock seconds for the initial solve and all iterations.
+        iteration_time_limit: Maximum seconds spent re-optimizing a single neighbourhood.
+        neighbourhoods: Neighbourhood kinds to draw from ("day", "specialty", "patients").
+        patient_fraction: Share of patients freed by a "patients" neighbourhood.
+        record_all_iterations: Record every iteration in the history, not only improvements.
+        seed: Seed for the neighbourhood choices.
+        report: Optional dict filled with the objective values, iteration count and history.
+    Returns:
+        List of (patient, therapist, timeslot) tuples, or None if no feasible schedule was found.
+    """
+    cp_model = load_cp_model()
+    start = time.monotonic()
+    deadline = start + time_budget
+    rng = random.Random(seed)
+
+    schedule_model = build_schedule_model(patients, therapists, timeslots)
+    consultations = schedule_model.consultations
+    history = []
+
+    # Initial assignment: hint with the greedy engine and stop at the first feasible solution.
+    greedy, _ = greedy_schedule(patients, therapists, schedule_model.grid)
+    add_schedule_hint(schedule_model, greedy)
+    solver = cp_model.CpSolver()
+    solver.parameters.stop_after_first_solution = True
+    solver.parameters.max_time_in_seconds = max(time_budget, 0.1)
+    status = solver.Solve(schedule_model.model)
+    if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+        print(f"LNS initial solve status: {solver.StatusName(status)}")
+        print("No feasible schedule found.")
+        if report is not None:
+            report.update({"status": solver.StatusName(status), "iterations": 0, "history": history,
+                           "elapsed": time.monotonic() - start})
+        return None
+
+    assignment = [solver.Value(c) for c, _, _, _ in consultations]
+    initial_objective = best_objective = solver.ObjectiveValue()
+    history.append({"iteration": 0, "neighbourhood": "initial", "objective": best_objective,
+                    "elapsed": time.monotonic() - start, "improved": True})
+
+    iterations = 0
+    while consultations and time.monotonic() < deadline:
+        iterations += 1
+        description, free = _choose_neighbourhood(rng.choice(neighbourhoods), consultations, rng, patient_fraction)
+
+        neighbourhood_model = schedule_model.model.Clone()
+        neighbourhood_model.ClearHints()
+        proto = neighbourhood_model.Proto()
+        for i, (c, _, _, _) in enumerate(consultations):
+            neighbourhood_model.AddHint(c, assignment[i])
+            if i not in free:
+                _fix_variable(proto, c.Index(), assignment[i])
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = max(min(iteration_time_limit, deadline - time.monotonic()), 0.01)
+        status = solver.Solve(neighbourhood_model)
+
+        improved = False
+        if status in [cp_model.OPTIMAL, cp_model.FEASIBLE] and solver.ObjectiveValue() > best_objective:
+            assignment = [solver.Value(c) for c, _, _, _ in consultations]
+            best_objective = solver.ObjectiveValue()
+            improved = True
+        if improved or record_all_iterations:
+            history.append({"iteration": iterations, "neighbourhood": description, "objective": best_objective,
+                            "elapsed": time.monotonic() - start, "improved": improved})
+
+    elapsed = time.monotonic() - start
+    print(f"LNS: objective {initial_objective:g} -> {best_objective:g} in {iterations} iterations ({elapsed:.2f}s)")
+    if report is not None:
+        report.update({"status": "FEASIBLE", "initial_objective": initial_objective, "objective": best_objective,
+                       "iterations": iterations, "history": history, "elapsed": elapsed})
+    return [(p, t, ts) for value, (_, p, t, ts) in zip(assignment, consultations) if value]
@@ -0,0 +1,153 @@
+"""
+Load-testing harness for the Flask scheduler in app.py.
+
+Drives a mixed add/delete/run workload at a configurable concurrency, either in-process through
+Flask's test client or against a running server, and reports p50/p95/p99 latency and throughput
+per action.
+
+Example:
+    python load_test.py --requests 200 --concurrency 8 --mix add_patient=6,delete_patient=1,run_scheduler=1
+    python load_test.py --url http://127.0.0.1:5000/ --requests 100 --concurrency 4
+"""
+import argparse
+import math
+import random
+import re
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from complex_test_case import generate_varied_availability
+
+DEFAULT_MIX = {"add_patient": 5, "add_therapist": 1, "delete_patient": 1, "run_scheduler": 1}
+SPECIALTIES = ["Speech Therapist", "Psychologist", "Occupational Therapist"]
+
+def _availability_text(rng: random.Random) -> str:
+    """Random availability in the app's "Monday: 09:00, 10:00" text format."""
+    availability = generate_varied_availability(rng=rng)
+    lines = []
+    for day, slots in availability.items():
+        if slots:
+            lines.append(f"{day}: " + ", ".join(slot.value.split(" - ")[0] for slot in slots))
+    return "\n".join(lines) or "Monday: 09:00"
+
+def _form_for(action: str, rng: random.Random, counter: int) -> Dict[str, str]:
+    """Builds the POST form for one action."""
+    if action == "add_patient":
+        return {"action": action, "patient_name": f"Load Patient {counter}",
+                "speech_hours": str(rng.randint(0, 2)), "psycho_hours": str(rng.randint(0, 2)),
+                "occ_hours": str(rng.randint(0, 2)), "patient_availability": _availability_text(rng)}
+    if action == "add_therapist":
+        return {"action": action, "therapist_name": f"Load Therapist {counter}",
+                "specialty": rng.choice(SPECIALTIES), "therapist_availability": _availability_text(rng)}
+    if action == "delete_patient":
+        return {"action": action, "patient_id": f"P{rng.randint(1, max(counter, 1))}"}
+    if action == "delete_therapist":
+        return {"action": action, "therapist_id": f"T{rng.randint(1, max(counter, 1))}"}
+    return {"action": action}
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def run_load_test(total_requests: int = 100, concurrency: int = 4, mix: Dict[str, int] = None,
+                  url: str = None, seed: int = None) -> Dict[str, dict]:
+    """
+    Sends total_requests POSTs spread over concurrency threads and measures each one.
+    Args:
+        mix: Relative weights per action (defaults to DEFAULT_MIX).
+        url: Base URL of a running server; when omitted, app.py is driven through Flask's test client.
+        seed: Seed for the action sequence and generated rosters.
+    Returns:
+        Dict of action -> {"count", "errors", "p50", "p95", "p99", "mean", "throughput"}, plus an "all" entry.
+        Latencies are in seconds, throughput in requests per second of wall-clock time.
+    """
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    actions = rng.choices(list(mix), weights=list(mix.values()), k=total_requests)
+    forms = [_form_for(action, rng, i + 1) for i, action in enumerate(actions)]
+
+    local = threading.local()
+    if url is None:
+        from app import app as flask_app
+
+    def send(form: Dict[str, str]) -> tuple:
+        started = time.perf_counter()
+        if url is None:
+            if not hasattr(local, "client"):
+                local.client = flask_app.test_client()
+            response = local.client.post("/", data=form)
+            ok = response.status_code < 400  # a successful solve redirects to its overview
+        else:
+            data = urllib.parse.urlencode(form).encode()
+            try:
+                with urllib.request.urlopen(url, data=data) as response:
+                    response.read()
+                    ok = response.status == 200
+            except OSError:
+                ok = False
+        return form["action"], time.perf_counter() - started, ok
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(send, forms))
+    wall = time.perf_counter() - wall_start
+
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    for action, latency, ok in results:
+        for key in (action, "all"):
+            latencies.setdefault(key, []).append(latency)
+            errors[key] = errors.get(key, 0) + (0 if ok else 1)
+
+    report = {}
+    for action, values in latencies.items():
+        values.sort()
+        report[action] = {
+            "count": len(values),
+            "errors": errors[action],
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "mean": sum(values) / len(values),
+            "throughput": len(values) / wall if wall else 0.0
+        }
+    return report
+
+def print_report(report: Dict[str, dict]):
+    """Print one row of latency percentiles (in milliseconds) and throughput per action."""
+    header = ["Action".ljust(18), "Count".rjust(6), "Errors".rjust(6), "p50 ms".rjust(9),
+              "p95 ms".rjust(9), "p99 ms".rjust(9), "req/s".rjust(8)]
+    print(" | ".join(header))
+    print("-" * (18 + 6 + 6 + 9 * 3 + 8 + 3 * 6))
+    for action in sorted(report, key=lambda a: (a == "all", a)):
+        r = report[action]
+        print(" | ".join([action.ljust(18), str(r["count"]).rjust(6), str(r["errors"]).rjust(6),
+                          f"{r['p50'] * 1000:9.1f}", f"{r['p95'] * 1000:9.1f}", f"{r['p99'] * 1000:9.1f}",
+                          f"{r['throughput']:8.1f}"]))
+
+def _parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        match = re.fullmatch(r"\s*(\w+)\s*=\s*(\d+)\s*", part)
+        if not match:
+            raise argparse.ArgumentTypeError(f"bad mix entry: {part!r}, expected action=weight")
+        mix[match.group(1)] = int(match.group(2))
+    return mix
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the Flask scheduler.")
+    parser.add_argument("--requests", type=int, default=100, help="Total number of requests")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of concurrent clients")
+    parser.add_argument("--mix", type=_parse_mix, default=None,
+                        help="Action weights, e.g. add_patient=5,delete_patient=1,run_scheduler=1")
+    parser.add_argument("--url", default=None, help="Target a running server instead of the in-process test client")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for the workload")
+    args = parser.parse_args()
+    print_report(run_load_test(args.requests, args.concurrency, args.mix, args.url, args.seed))
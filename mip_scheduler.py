@@ -0,0 +1,109 @@
+"""
+The create_schedule model as a mixed-integer program, solved through OR-Tools' pywraplp.
+
+Same variables and objective as build_schedule_model, written as a linear program over binaries:
+consultation variables exist only where patient and therapist are both available, a patient's
+scheduled-slot indicator doubles as their no-double-booking constraint, and the consecutive
+bonuses are linearised with y <= a, y <= b. Solved with SCIP by default (bundled with OR-Tools),
+or any other backend pywraplp knows, e.g. "CBC" or "HIGHS".
+"""
+from typing import List, Optional
+
+from schedule_generator import Patient, Therapist, as_timeslot_grid, optimality_gap
+
+def create_schedule_mip(patients: List[Patient], therapists: List[Therapist], timeslots,
+                        time_limit: float = None, num_threads: int = None, backend: str = "SCIP",
+                        report: dict = None) -> Optional[List[tuple]]:
+    """
+    Builds and solves the scheduling MIP.
+    Args:
+        time_limit: Solver time limit in seconds (no limit if None).
+        num_threads: Threads for backends that support them.
+        backend: pywraplp solver id.
+        report: Optional dict filled with the engine ("mip"), backend, status, objective, best bound,
+                gap and wall time.
+    Returns:
+        List of (patient, therapist, timeslot) tuples, or None if no feasible schedule was found.
+    """
+    from ortools.linear_solver import pywraplp
+
+    solver = pywraplp.Solver.CreateSolver(backend)
+    if solver is None:
+        raise ValueError(f"MIP backend {backend!r} is not available in this OR-Tools build")
+    grid = as_timeslot_grid(timeslots)
+
+    def available(availability: dict) -> List[dict]:
+        return [ts for ts, hs in zip(grid.timeslots, grid.hour_slots) if hs in availability.get(ts["day_of_week"], [])]
+
+    therapist_slots = {t.id: {ts["id"] for ts in available(t.availability)} for t in therapists}
+    consultations = []        # (var, patient, therapist, timeslot)
+    by_therapist_slot = {}    # (therapist.id, timeslot["id"]) -> [var]
+    objective_terms = []
+    for patient in patients:
+        patient_slots = available(patient.availability)
+        by_slot = {}          # timeslot["id"] -> [var]
+        by_therapist = {}     # therapist.id -> {timeslot["id"]: var}
+        for specialty, hours_needed in patient.weekly_specialty_needs.items():
+            if hours_needed <= 0:
+                continue
+            variables = []
+            for therapist in therapists:
+                if therapist.specialty != specialty:
+                    continue
+                for ts in patient_slots:
+                    if ts["id"] in therapist_slots[therapist.id]:
+                        var = solver.BoolVar(f'consultation_{patient.id}_{therapist.id}_{ts["id"]}')
+                        consultations.append((var, patient, therapist, ts))
+                        variables.append(var)
+                        by_slot.setdefault(ts["id"], []).append(var)
+                        by_therapist.setdefault(therapist.id, {})[ts["id"]] = var
+                        by_therapist_slot.setdefault((therapist.id, ts["id"]), []).append(var)
+            solver.Add(solver.Sum(variables) == hours_needed)
+            objective_terms.extend(variables)
+
+        scheduled = {}
+        for timeslot_id, variables in by_slot.items():
+            var = solver.BoolVar(f'scheduled_{patient.id}_{timeslot_id}')
+            solver.Add(var == solver.Sum(variables))
+            scheduled[timeslot_id] = var
+        for day, pairs in grid.adjacent_pairs.items():
+            for ts1, ts2 in pairs:
+                if ts1["id"] in scheduled and ts2["id"] in scheduled:
+                    bonus = solver.BoolVar(f'bonus_{patient.id}_{ts1["id"]}_{ts2["id"]}')
+                    solver.Add(bonus <= scheduled[ts1["id"]])
+                    solver.Add(bonus <= scheduled[ts2["id"]])
+                    objective_terms.append(bonus)
+                for therapist_id, slots in by_therapist.items():
+                    if ts1["id"] in slots and ts2["id"] in slots:
+                        bonus = solver.BoolVar(f'same_bonus_{patient.id}_{therapist_id}_{ts1["id"]}_{ts2["id"]}')
+                        solver.Add(bonus <= slots[ts1["id"]])
+                        solver.Add(bonus <= slots[ts2["id"]])
+                        objective_terms.append(bonus)
+
+    for variables in by_therapist_slot.values():
+        if len(variables) > 1:
+            solver.Add(solver.Sum(variables) <= 1)
+    solver.Maximize(solver.Sum(objective_terms))
+
+    if time_limit is not None:
+        solver.SetTimeLimit(int(time_limit * 1000))
+    if num_threads is not None:
+        solver.SetNumThreads(num_threads)
+    status = solver.Solve()
+    status_name = {pywraplp.Solver.OPTIMAL: "OPTIMAL", pywraplp.Solver.FEASIBLE: "FEASIBLE",
+                   pywraplp.Solver.INFEASIBLE: "INFEASIBLE"}.get(status, "UNKNOWN")
+    print(f"MIP ({backend}) status: {status_name}")
+
+    result = {"engine": "mip", "backend": backend, "status": status_name, "objective": None, "best_bound": None,
+              "gap": None, "wall_time": solver.WallTime() / 1000.0,
+              "num_variables": solver.NumVariables(), "num_constraints": solver.NumConstraints()}
+    schedule = None
+    if status in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+        schedule = [(p, t, ts) for var, p, t, ts in consultations if var.solution_value() > 0.5]
+        objective = solver.Objective().Value()
+        bound = solver.Objective().BestBound()
+        result.update({"objective": objective, "best_bound": bound, "gap": optimality_gap(objective, bound)})
+        print(f"Objective: {objective:g}, best bound: {bound:g}")
+    if report is not None:
+        report.update(result)
+    return schedule
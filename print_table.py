@@ -1,4 +1,5 @@
 from schedule_generator import Patient, Therapist, HourSlot, WeekDay, create_schedule
+from schedule_index import ScheduleIndex
 
 def float_to_time(f):
     """Convert a float time to a string in HH:MM format."""
@@ -6,83 +7,67 @@ def float_to_time(f):
     minute = int((f - hour) * 60)
     return f"{hour:02d}:{minute:02d}"
 
-def print_consultations(schedule, timeslots):
+def print_consultations(schedule, timeslots, index=None):
     """Print consultations for each patient, showing their schedule across the week."""
-    # Extract unique patients from the schedule
-    patients = set(p for p, _, _ in schedule)
-    
-    # Get list of weekdays from WeekDay enum
-    days = [day.value for day in WeekDay]
-    
+    index = index or ScheduleIndex(schedule, timeslots)
+
     # Function to convert float time to string (e.g., 8.0 -> "08:00")
     def time_to_str(time_float):
         hour = int(time_float)
         minute = "00"
         return f"{hour:02d}:{minute}"
-    
+
     # Iterate through each patient
-    for patient in sorted(patients, key=lambda p: p.id):
-        print(f"\n{patient.name} consultations:")
-        
+    for patient_id in sorted(index.by_patient):
+        print(f"\n{index.patients[patient_id].name} consultations:")
+
         # Group consultations by day for this patient
-        consultations_by_day = {day: [] for day in days}
-        for p, t, ts in schedule:
-            if p == patient:
-                day = ts["day_of_week"]
-                start_time = time_to_str(ts["start_time"])
-                end_time = time_to_str(ts["end_time"])
-                consultations_by_day[day].append(f"{t.name} - {start_time} - {end_time}")
-        
+        consultations_by_day = {day: [] for day in index.days}
+        for p, t, ts in index.by_patient[patient_id].values():
+            start_time = time_to_str(ts["start_time"])
+            end_time = time_to_str(ts["end_time"])
+            consultations_by_day[ts["day_of_week"]].append(f"{t.name} - {start_time} - {end_time}")
+
         # Print consultations for each day
-        for day in days:
+        for day in index.days:
             if consultations_by_day[day]:
                 for consultation in consultations_by_day[day]:
                     print(f"{day} - {consultation}")
             else:
                 print(f"{day} - Free")
 
-def print_schedule_table(schedule, timeslots):
+def _print_grid(title, days, rows):
+    """Print one weekly grid (rows of [time, cell per day]) under a title."""
+    print(f"\n{title}:")
+    header = ["Time".ljust(12)] + [day.ljust(20) for day in days]
+    print(" | ".join(header))
+    print("-" * (12 + 22 * len(days)))  # Separator line
+    for row in rows:
+        print(" | ".join([row[0].ljust(12)] + [cell.ljust(20) for cell in row[1:]]))
+
+def print_schedule_table(schedule, timeslots, index=None):
     """Print a separate schedule table for each patient, showing their consultations across the week."""
-    # Define the days of the week
-    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-    
-    # Extract unique time intervals from timeslots and sort by start time
-    time_intervals = sorted(
-        set((ts["start_time"], ts["end_time"]) for ts in timeslots),
-        key=lambda x: x[0]
-    )
-    
-    # Extract unique patients from the schedule
-    patients = set(p for p, _, _ in schedule)
-    
-    # Iterate through each patient
-    for patient in sorted(patients, key=lambda p: p.id):
-        print(f"\nSchedule for {patient.name}:")
-        
-        # Initialize an empty schedule dictionary for this patient
-        schedule_dict = {day: {interval: "Free" for interval in time_intervals} for day in days}
-        
-        # Populate the schedule dictionary with consultations for this patient
-        for p, t, ts in schedule:
-            if p == patient:
-                day = ts["day_of_week"]
-                start_time = ts["start_time"]
-                end_time = ts["end_time"]
-                interval = (start_time, end_time)
-                schedule_dict[day][interval] = f"{t.name} ({get_initials(t.specialty)})"
-        
-        # Print the table header
-        header = ["Time".ljust(12)] + [day.ljust(20) for day in days]
-        print(" | ".join(header))
-        print("-" * (12 + 22 * len(days)))  # Separator line
-        
-        # Print each row of the table
-        for start, end in time_intervals:
-            time_str = f"{int(start):02d}:{int((start % 1) * 60):02d} - {int(end):02d}:{int((end % 1) * 60):02d}"
-            row = [time_str.ljust(12)]
-            for day in days:
-                row.append(schedule_dict[day][(start, end)].ljust(20))
-            print(" | ".join(row))
+    index = index or ScheduleIndex(schedule, timeslots)
+    label = lambda entry: f"{entry[1].name} ({get_initials(entry[1].specialty)})"
+    for patient_id in sorted(index.by_patient):
+        _print_grid(f"Schedule for {index.patients[patient_id].name}", index.days, index.patient_grid(patient_id, label))
+
+def print_therapist_table(schedule, timeslots, index=None):
+    """Print a separate schedule table for each therapist, showing the patients they see across the week."""
+    index = index or ScheduleIndex(schedule, timeslots)
+    for therapist_id in sorted(index.therapists):
+        therapist = index.therapists[therapist_id]
+        _print_grid(f"Schedule for {therapist.name} ({therapist.specialty})", index.days, index.therapist_grid(therapist_id))
+
+def print_utilization_table(schedule, timeslots, therapists=None, index=None):
+    """Print booked versus available hours for each therapist, plus consultations per day."""
+    index = index or ScheduleIndex(schedule, timeslots)
+    print("\nTherapist utilization:")
+    print(" | ".join(["Therapist".ljust(20), "Specialty".ljust(24), "Booked".ljust(8), "Available".ljust(10), "Use"]))
+    for row in index.therapist_utilization(therapists):
+        print(" | ".join([row["therapist"].ljust(20), row["specialty"].ljust(24), str(row["booked_hours"]).ljust(8),
+                          str(row["available_hours"]).ljust(10), f"{row['utilization']:.0%}"]))
+    print("\nConsultations per day: " + ", ".join(f"{day} {count}" for day, count in index.daily_load().items()))
 
 def get_initials(text):
   """Extracts and returns the capital letters from a string."""
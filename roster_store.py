@@ -0,0 +1,66 @@
+import threading
+from typing import Optional, Tuple
+
+from schedule_generator import Patient, Therapist
+
+class RosterSnapshot:
+    """An immutable view of the roster at one version; solves read from it without holding any lock."""
+    def __init__(self, version: int, patients: Tuple[Patient, ...], therapists: Tuple[Therapist, ...]):
+        self.version = version
+        self.patients = patients
+        self.therapists = therapists
+
+class RosterStore:
+    """
+    Thread-safe patient and therapist roster with copy-on-write snapshots.
+
+    Writers take a short lock, build new tuples and publish a new snapshot; readers just grab the
+    current snapshot reference, so a long solve never blocks an add or delete. Ids are handed out
+    from monotonic counters and are never reused after a delete.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = RosterSnapshot(0, (), ())
+        self._next_patient = 1
+        self._next_therapist = 1
+
+    def snapshot(self) -> RosterSnapshot:
+        """Returns the current roster snapshot."""
+        return self._snapshot
+
+    def _publish(self, patients: Tuple[Patient, ...], therapists: Tuple[Therapist, ...]):
+        self._snapshot = RosterSnapshot(self._snapshot.version + 1, patients, therapists)
+
+    def add_patient(self, name: str, weekly_specialty_needs: dict, availability: dict) -> Patient:
+        """Adds a patient with the next free id (P1, P2, ...) and returns it."""
+        with self._lock:
+            patient = Patient(id=f"P{self._next_patient}", name=name,
+                              weekly_specialty_needs=weekly_specialty_needs, availability=availability)
+            self._next_patient += 1
+            self._publish(self._snapshot.patients + (patient,), self._snapshot.therapists)
+        return patient
+
+    def add_therapist(self, name: str, specialty: str, availability: dict) -> Therapist:
+        """Adds a therapist with the next free id (T1, T2, ...) and returns it."""
+        with self._lock:
+            therapist = Therapist(id=f"T{self._next_therapist}", name=name, specialty=specialty,
+                                  availability=availability)
+            self._next_therapist += 1
+            self._publish(self._snapshot.patients, self._snapshot.therapists + (therapist,))
+        return therapist
+
+    def delete_patient(self, patient_id: str) -> Optional[Patient]:
+        """Removes a patient; returns the removed patient, or None if the id is unknown."""
+        with self._lock:
+            removed = next((p for p in self._snapshot.patients if p.id == patient_id), None)
+            if removed is not None:
+                self._publish(tuple(p for p in self._snapshot.patients if p.id != patient_id), self._snapshot.therapists)
+        return removed
+
+    def delete_therapist(self, therapist_id: str) -> Optional[Therapist]:
+        """Removes a therapist; returns the removed therapist, or None if the id is unknown."""
+        with self._lock:
+            removed = next((t for t in self._snapshot.therapists if t.id == therapist_id), None)
+            if removed is not None:
+                self._publish(self._snapshot.patients, tuple(t for t in self._snapshot.therapists if t.id != therapist_id))
+        return removed
@@ -0,0 +1,189 @@
+"""
+Command-line batch scheduler.
+
+Example:
+    python schedule_cli.py --patients patients.json --therapists therapists.csv \
+        --workers 8 --time-limit 600 --csv-dir patient_schedules --json schedule.json
+
+Patients and therapists are read from JSON (a list of objects) or CSV (one row per person).
+Availability is either the app's text format ("Monday: 09:00, 10:00", days separated by new
+lines or ";") or, in JSON, a {"Monday": ["09:00", "10:00"]} mapping.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from typing import List
+
+from schedule_generator import Patient, Therapist, TimeslotGrid, create_schedule, parse_availability
+
+EXIT_OK = 0
+EXIT_INFEASIBLE = 1
+EXIT_INPUT_ERROR = 2
+EXIT_INVALID_SCHEDULE = 3
+EXIT_TIMEOUT = 4  # no schedule within the time limit, but the roster was not proven infeasible
+
+SPECIALTIES = ["Speech Therapist", "Psychologist", "Occupational Therapist"]
+
+def _parse_availability_field(value) -> dict:
+    """Accepts the app's availability text (";" may separate days) or a day -> ["HH:00"] mapping."""
+    if isinstance(value, dict):
+        value = "\n".join(f"{day}: {', '.join(times)}" for day, times in value.items())
+    return parse_availability(str(value).replace(";", "\n"))
+
+def _read_records(path: str) -> List[dict]:
+    """Reads a list of records from a .json or .csv file."""
+    if path.endswith(".json"):
+        with open(path) as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError(f"{path}: expected a JSON list of records")
+        return records
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            return list(csv.DictReader(f))
+    raise ValueError(f"{path}: unsupported file type, use .json or .csv")
+
+def load_patients(path: str) -> List[Patient]:
+    """
+    Loads patients from JSON or CSV.
+    JSON records have "id", "name", "weekly_specialty_needs" and "availability"; CSV rows have
+    "id", "name", "availability" and one column per specialty with the weekly hours.
+    """
+    patients = []
+    for i, record in enumerate(_read_records(path), start=1):
+        if "weekly_specialty_needs" in record:
+            needs = record["weekly_specialty_needs"]
+        else:
+            needs = {specialty: record.get(specialty) or 0 for specialty in SPECIALTIES}
+        patients.append(Patient(
+            id=record.get("id") or f"P{i}",
+            name=record["name"],
+            weekly_specialty_needs={specialty: int(hours) for specialty, hours in needs.items()},
+            availability=_parse_availability_field(record["availability"])
+        ))
+    return patients
+
+def load_therapists(path: str) -> List[Therapist]:
+    """Loads therapists from JSON or CSV records with "id", "name", "specialty" and "availability"."""
+    therapists = []
+    for i, record in enumerate(_read_records(path), start=1):
+        therapists.append(Therapist(
+            id=record.get("id") or f"T{i}",
+            name=record["name"],
+            specialty=record["specialty"],
+            availability=_parse_availability_field(record["availability"])
+        ))
+    return therapists
+
+def schedule_to_records(schedule: List[tuple]) -> List[dict]:
+    """Flattens (patient, therapist, timeslot) tuples into JSON-serialisable records."""
+    return [{
+        "patient_id": p.id,
+        "patient": p.name,
+        "therapist_id": t.id,
+        "therapist": t.name,
+        "specialty": t.specialty,
+        "day_of_week": ts["day_of_week"],
+        "start_time": ts["start_time"],
+        "end_time": ts["end_time"]
+    } for p, t, ts in schedule]
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Solve a weekly therapy roster without the web server.")
+    parser.add_argument("--patients", required=True, help="Patients file (.json or .csv)")
+    parser.add_argument("--therapists", required=True, help="Therapists file (.json or .csv)")
+    parser.add_argument("--workers", type=int, default=None, help="CP-SAT search workers (default: solver default)")
+    parser.add_argument("--time-limit", type=float, default=None, help="Solver time limit in seconds")
+    parser.add_argument("--gap-limit", type=float, default=None,
+                        help="Stop once the relative optimality gap is at most this value, e.g. 0.05")
+    parser.add_argument("--fast", action="store_true",
+                        help="Return the first schedule meeting the hard constraints, ignoring the consecutive bonuses")
+    parser.add_argument("--polish-time", type=float, default=None,
+                        help="With --fast, then improve that schedule with the full objective for this many seconds")
+    parser.add_argument("--engine", choices=["cp-sat", "decomposed", "mip", "portfolio"], default="cp-sat",
+                        help="cp-sat: one weekly model; decomposed: day allocation, then one model per day; "
+                             "mip: the same model as a SCIP MIP; portfolio: race CP-SAT configurations and the MIP")
+    parser.add_argument("--history", default=None,
+                        help="Solve log (.jsonl): pick unset settings from similar past solves and append this one")
+    parser.add_argument("--csv-dir", default=None, help="Write one CSV per patient into this directory")
+    parser.add_argument("--therapist-csv-dir", default=None, help="Write one CSV per therapist into this directory")
+    parser.add_argument("--utilization-csv", default=None, help="Write therapist utilization to this CSV file")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the schedule as JSON to this file")
+    args = parser.parse_args(argv)
+    if args.polish_time is not None and not args.fast:
+        parser.error("--polish-time requires --fast")
+    if args.engine != "cp-sat":
+        for flag, value in (("--fast", args.fast), ("--gap-limit", args.gap_limit)):
+            if value:
+                parser.error(f"{flag} is only supported with --engine cp-sat")
+    if args.history and args.engine not in ("cp-sat", "portfolio"):
+        parser.error("--history is only supported with --engine cp-sat or portfolio")
+    if args.engine == "portfolio" and args.workers is not None:
+        parser.error("--workers is not supported with --engine portfolio (workers are split between the strategies)")
+
+    started = time.perf_counter()
+    try:
+        patients = load_patients(args.patients)
+        therapists = load_therapists(args.therapists)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Error: could not read input: {e}", file=sys.stderr)
+        return EXIT_INPUT_ERROR
+    timeslots = TimeslotGrid.weekly()
+    loaded = time.perf_counter()
+    print(f"Loaded {len(patients)} patients and {len(therapists)} therapists in {loaded - started:.2f}s")
+
+    report = {}
+    if args.engine == "decomposed":
+        from decomposed_scheduler import create_schedule_decomposed
+        schedule = create_schedule_decomposed(patients, therapists, timeslots, num_workers=args.workers,
+                                              time_limit=args.time_limit, report=report)
+    elif args.engine == "mip":
+        from mip_scheduler import create_schedule_mip
+        schedule = create_schedule_mip(patients, therapists, timeslots, time_limit=args.time_limit,
+                                       num_threads=args.workers, report=report)
+    elif args.engine == "portfolio":
+        schedule = create_schedule(patients, therapists, timeslots, time_limit=args.time_limit, portfolio=True,
+                                   history=args.history, report=report)
+    else:
+        schedule = create_schedule(patients, therapists, timeslots, num_workers=args.workers,
+                                   time_limit=args.time_limit, gap_limit=args.gap_limit,
+                                   feasibility_only=args.fast, polish_time=args.polish_time, history=args.history,
+                                   report=report)
+    solved = time.perf_counter()
+    print(f"Solve time: {solved - loaded:.2f}s")
+    if schedule is None:
+        if report.get("status") == "INFEASIBLE":
+            print("Error: No feasible schedule exists for this roster.", file=sys.stderr)
+            return EXIT_INFEASIBLE
+        print(f"Error: No schedule found within the time limit (status {report.get('status', 'UNKNOWN')}).",
+              file=sys.stderr)
+        return EXIT_TIMEOUT
+
+    from schedule_validator import validate_schedule
+    errors = validate_schedule(schedule, patients, therapists)
+    if errors:
+        for error in errors:
+            print(error, file=sys.stderr)
+        print("Error: the schedule failed validation; no output was written.", file=sys.stderr)
+        return EXIT_INVALID_SCHEDULE
+
+    if args.csv_dir or args.therapist_csv_dir or args.utilization_csv:
+        from csv_exporter import export_schedule_to_csv, export_therapist_schedules_to_csv, export_utilization_to_csv
+        from schedule_index import ScheduleIndex
+        index = ScheduleIndex(schedule, timeslots)
+        if args.csv_dir:
+            export_schedule_to_csv(schedule, timeslots, output_dir=args.csv_dir, index=index)
+        if args.therapist_csv_dir:
+            export_therapist_schedules_to_csv(schedule, timeslots, output_dir=args.therapist_csv_dir, index=index)
+        if args.utilization_csv:
+            export_utilization_to_csv(schedule, timeslots, args.utilization_csv, therapists, index=index)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(schedule_to_records(schedule), f, indent=2)
+    print(f"Wrote {len(schedule)} consultations; total time {time.perf_counter() - started:.2f}s")
+    return EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,11 @@
 from enum import Enum
-from ortools.sat.python import cp_model
-from typing import List, Dict
+from typing import List, Dict, Union
 import random
+import threading
+import time
+
+# OR-Tools is heavy to import; it is loaded by load_cp_model() on the first solve instead of at import time.
+cp_model = None
 
 class HourSlot(Enum):
     """Represents operating hours from 7 AM to 6 PM in one-hour increments."""
@@ -55,8 +59,122 @@ def get_hour_slot(start_time: float) -> HourSlot:
     slot_name = f"_{hour}to{hour+1}"
     return getattr(HourSlot, slot_name)
 
-def create_schedule(patients: List[Patient], therapists: List[Therapist], timeslots: List[dict]) -> List[tuple]:
+class TimeslotGrid:
+    """
+    A prebuilt, reusable grid of timeslots.
+
+    Iterates like the plain list of timeslot dicts it was built from, and adds O(1) lookup by
+    (day, HourSlot), integer indices, each slot's HourSlot and the adjacent pairs used by the
+    consecutive-appointment bonuses. Build it once and pass it to every solve.
+    """
+    def __init__(self, timeslots: List[dict]):
+        self.timeslots = list(timeslots)
+        self.index_of = {ts["id"]: i for i, ts in enumerate(self.timeslots)}  # timeslot["id"] -> int index
+        self.hour_slots = [get_hour_slot(ts["start_time"]) for ts in self.timeslots]
+        self.by_day_slot = {}  # (day, HourSlot) -> timeslot
+        self.by_day = {}       # day -> timeslots sorted by start time
+        for ts, hour_slot in zip(self.timeslots, self.hour_slots):
+            self.by_day_slot[(ts["day_of_week"], hour_slot)] = ts
+            self.by_day.setdefault(ts["day_of_week"], []).append(ts)
+        for ts_list in self.by_day.values():
+            ts_list.sort(key=lambda x: x["start_time"])
+        # day -> [(ts1, ts2)] for neighbouring timeslots within the day.
+        self.adjacent_pairs = {day: list(zip(ts_list, ts_list[1:])) for day, ts_list in self.by_day.items()}
+        self.neighbours = {ts["id"]: [] for ts in self.timeslots}  # timeslot["id"] -> ids of adjacent timeslots
+        for pairs in self.adjacent_pairs.values():
+            for ts1, ts2 in pairs:
+                self.neighbours[ts1["id"]].append(ts2["id"])
+                self.neighbours[ts2["id"]].append(ts1["id"])
+
+    @classmethod
+    def weekly(cls, start_hour: int = 7, end_hour: int = 18) -> "TimeslotGrid":
+        """One-hour timeslots from start_hour to end_hour, Monday to Friday, with ids "1", "2", ..."""
+        timeslots = []
+        for day in WeekDay:
+            for hour in range(start_hour, end_hour):
+                timeslots.append({
+                    "id": str(len(timeslots) + 1),
+                    "day_of_week": day.value,
+                    "start_time": float(hour),
+                    "end_time": float(hour + 1)
+                })
+        return cls(timeslots)
+
+    def lookup(self, day: str, hour_slot: HourSlot) -> dict:
+        """Returns the timeslot for a day and HourSlot, or None if the grid has no such slot."""
+        return self.by_day_slot.get((day, hour_slot))
+
+    def __iter__(self):
+        return iter(self.timeslots)
+
+    def __len__(self):
+        return len(self.timeslots)
+
+    def __getitem__(self, i):
+        return self.timeslots[i]
+
+def as_timeslot_grid(timeslots) -> TimeslotGrid:
+    """Returns timeslots unchanged if it is already a TimeslotGrid, otherwise builds one from the list."""
+    return timeslots if isinstance(timeslots, TimeslotGrid) else TimeslotGrid(timeslots)
+
+def parse_availability(text):
+    """Parse availability text into a dictionary of day: [HourSlot] pairs."""
+    availability = {}
+    lines = text.split("\n")
+    for line in lines:
+        if ":" in line:
+            day, times = line.split(":", 1)
+            day = day.strip()
+            if day not in [d.value for d in WeekDay]:
+                continue
+            time_list = [t.strip() for t in times.split(",")]
+            hour_slots = []
+            for time in time_list:
+                try:
+                    hour = int(time.split(":")[0])
+                    if time == f"{hour:02d}:00" and 7 <= hour <= 17:
+                        slot_name = f"_{hour}to{hour+1}"
+                        hour_slots.append(getattr(HourSlot, slot_name))
+                except (ValueError, AttributeError):
+                    continue
+            if hour_slots:
+                availability[day] = hour_slots
+    return availability
+
+def load_cp_model():
+    """Imports OR-Tools' CP-SAT module on first use and caches it in the module global."""
+    global cp_model
+    if cp_model is None:
+        from ortools.sat.python import cp_model as module
+        cp_model = module
+    return cp_model
+
+def preload_solver_in_background() -> threading.Thread:
+    """Starts a daemon thread that absorbs the OR-Tools import before the first solve needs it."""
+    thread = threading.Thread(target=load_cp_model, name="ortools-preload", daemon=True)
+    thread.start()
+    return thread
+
+class ScheduleModel:
+    """Holds a built CP-SAT model together with the variables needed to read a schedule back."""
+    def __init__(self, model, grid: TimeslotGrid, consultations: List[tuple], consultation_dict: Dict[tuple, object],
+                 bonus_vars: List, same_therapist_bonus_vars: List):
+        self.model = model
+        self.grid = grid
+        self.consultations = consultations  # list of (var, patient, therapist, timeslot)
+        self.consultation_dict = consultation_dict  # (patient.id, therapist.id, timeslot["id"]) -> var
+        self.bonus_vars = bonus_vars
+        self.same_therapist_bonus_vars = same_therapist_bonus_vars
+
+def build_schedule_model(patients: List[Patient], therapists: List[Therapist], timeslots,
+                         soft_constraints: bool = True) -> ScheduleModel:
+    """
+    Builds the CP-SAT model used by create_schedule without solving it; timeslots may be a list or a TimeslotGrid.
+    With soft_constraints=False only the hard constraints are built: no bonus variables and no objective.
+    """
+    cp_model = load_cp_model()
     model = cp_model.CpModel()
+    grid = as_timeslot_grid(timeslots)
 
     # We use these weights for the soft rules.
     bonus_weight = 1              # bonus for any consecutive appointment
@@ -67,95 +185,90 @@ def create_schedule(patients: List[Patient], therapists: List[Therapist], timesl
     for patient in patients:
         for therapist in therapists:
             if therapist.specialty in patient.weekly_specialty_needs and patient.weekly_specialty_needs[therapist.specialty] > 0:
-                for timeslot in timeslots:
+                for timeslot, hour_slot in zip(grid.timeslots, grid.hour_slots):
                     var_name = f'consultation_{patient.id}_{therapist.id}_{timeslot["id"]}'
                     consultation = model.NewBoolVar(var_name)
                     consultations.append((consultation, patient, therapist, timeslot))
 
-    # Enforce availability: if a patient or therapist is not available in a given timeslot, force the variable to 0.
-    for consultation, patient, therapist, timeslot in consultations:
-        day = timeslot["day_of_week"]
-        hour_slot = get_hour_slot(timeslot["start_time"])
-        patient_available = hour_slot in patient.availability.get(day, [])
-        therapist_available = hour_slot in therapist.availability.get(day, [])
-        if not (patient_available and therapist_available):
-            model.Add(consultation == 0)
+                    # Enforce availability: if a patient or therapist is not available in a given timeslot, force the variable to 0.
+                    day = timeslot["day_of_week"]
+                    patient_available = hour_slot in patient.availability.get(day, [])
+                    therapist_available = hour_slot in therapist.availability.get(day, [])
+                    if not (patient_available and therapist_available):
+                        model.Add(consultation == 0)
+
+    # Group the consultation variables once so each constraint below is built from a lookup
+    # instead of a rescan of every consultation.
+    by_therapist_slot = {}   # (therapist.id, timeslot["id"]) -> [var]
+    by_patient_slot = {}     # (patient.id, timeslot["id"]) -> [var]
+    by_patient_specialty = {}  # (patient.id, specialty) -> [var]
+    for c, p, t, ts in consultations:
+        by_therapist_slot.setdefault((t.id, ts["id"]), []).append(c)
+        by_patient_slot.setdefault((p.id, ts["id"]), []).append(c)
+        by_patient_specialty.setdefault((p.id, t.specialty), []).append(c)
 
     # Prevent double-booking: for each timeslot, a patient and a therapist can have at most one consultation.
-    for timeslot in timeslots:
-        for therapist in therapists:
-            overlapping = [c for c, p, t, ts in consultations if t == therapist and ts == timeslot]
-            model.Add(sum(overlapping) <= 1)
-        for patient in patients:
-            overlapping = [c for c, p, t, ts in consultations if p == patient and ts == timeslot]
-            model.Add(sum(overlapping) <= 1)
+    for overlapping in by_therapist_slot.values():
+        model.Add(sum(overlapping) <= 1)
+    for overlapping in by_patient_slot.values():
+        model.Add(sum(overlapping) <= 1)
 
     # Weekly needs constraints: each patient must have exactly the required number of consultations for each specialty.
     for patient in patients:
         for specialty, hours_needed in patient.weekly_specialty_needs.items():
             if hours_needed > 0:
-                relevant_consultations = [c for c, p, t, ts in consultations if p == patient and t.specialty == specialty]
+                relevant_consultations = by_patient_specialty.get((patient.id, specialty), [])
                 if not relevant_consultations:
                     print(f"Warning: No consultations possible for {patient.name} with {specialty}")
                 model.Add(sum(relevant_consultations) == hours_needed)
 
+    # Create a helper dictionary for fast lookup: (patient.id, therapist.id, timeslot["id"]) -> consultation variable.
+    consultation_dict = {}
+    for c, p, t, ts in consultations:
+        consultation_dict[(p.id, t.id, ts["id"])] = c
+
+    if not soft_constraints:
+        return ScheduleModel(model, grid, consultations, consultation_dict, [], [])
+
     # ***** Soft Constraint for Consecutive Appointments (regardless of therapist) *****
     # For each patient and each timeslot, create an auxiliary variable that indicates if a patient is scheduled.
     scheduled = {}  # key: (patient.id, timeslot["id"]) -> IntVar (0 or 1)
     for patient in patients:
-        for ts in timeslots:
+        for ts in grid.timeslots:
             var = model.NewIntVar(0, 1, f'scheduled_{patient.id}_{ts["id"]}')
-            relevant = [c for c, p, t, ts_candidate in consultations if p == patient and ts_candidate == ts]
+            relevant = by_patient_slot.get((patient.id, ts["id"]))
             if relevant:
                 model.Add(var == sum(relevant))
             else:
                 model.Add(var == 0)
             scheduled[(patient.id, ts["id"])] = var
 
-    # Group timeslots by day.
-    timeslots_by_day = {}
-    for ts in timeslots:
-        day = ts["day_of_week"]
-        timeslots_by_day.setdefault(day, []).append(ts)
-    for day, ts_list in timeslots_by_day.items():
-        ts_list.sort(key=lambda x: x["start_time"])
-
     bonus_vars = []
     # For each patient and each day, for each adjacent pair of timeslots, create a bonus variable.
     for patient in patients:
-        if any(day in patient.availability for day in timeslots_by_day):
-            for day, ts_list in timeslots_by_day.items():
-                if day not in patient.availability:
-                    continue
-                for i in range(len(ts_list) - 1):
-                    ts1 = ts_list[i]
-                    ts2 = ts_list[i+1]
-                    bonus_var = model.NewIntVar(0, 1, f'bonus_{patient.id}_{ts1["id"]}_{ts2["id"]}')
-                    s1 = scheduled[(patient.id, ts1["id"])]
-                    s2 = scheduled[(patient.id, ts2["id"])]
-                    model.Add(bonus_var <= s1)
-                    model.Add(bonus_var <= s2)
-                    model.Add(bonus_var >= s1 + s2 - 1)
-                    bonus_vars.append(bonus_var)
+        for day, pairs in grid.adjacent_pairs.items():
+            if day not in patient.availability:
+                continue
+            for ts1, ts2 in pairs:
+                bonus_var = model.NewIntVar(0, 1, f'bonus_{patient.id}_{ts1["id"]}_{ts2["id"]}')
+                s1 = scheduled[(patient.id, ts1["id"])]
+                s2 = scheduled[(patient.id, ts2["id"])]
+                model.Add(bonus_var <= s1)
+                model.Add(bonus_var <= s2)
+                model.Add(bonus_var >= s1 + s2 - 1)
+                bonus_vars.append(bonus_var)
 
     # ***** Soft Constraint for Consecutive Appointments with the Same Therapist *****
-    # Create a helper dictionary for fast lookup: (patient.id, therapist.id, timeslot["id"]) -> consultation variable.
-    consultation_dict = {}
-    for c, p, t, ts in consultations:
-        consultation_dict[(p.id, t.id, ts["id"])] = c
-
     same_therapist_bonus_vars = []
     # For each patient, each therapist, and each day, for every adjacent pair of timeslots,
     # add a bonus if both appointments with that therapist are scheduled.
     for patient in patients:
         for therapist in therapists:
-            for day, ts_list in timeslots_by_day.items():
+            for day, pairs in grid.adjacent_pairs.items():
                 # Only consider if the patient could be scheduled on that day.
                 if day not in patient.availability:
                     continue
-                for i in range(len(ts_list) - 1):
-                    ts1 = ts_list[i]
-                    ts2 = ts_list[i+1]
+                for ts1, ts2 in pairs:
                     key1 = (patient.id, therapist.id, ts1["id"])
                     key2 = (patient.id, therapist.id, ts2["id"])
                     # Only add bonus if the consultation variables exist.
@@ -178,33 +291,256 @@ def create_schedule(patients: List[Patient], therapists: List[Therapist], timesl
         same_bonus_weight * sum(same_therapist_bonus_vars)
     )
 
+    return ScheduleModel(model, grid, consultations, consultation_dict, bonus_vars, same_therapist_bonus_vars)
+
+def extract_schedule(solver, schedule_model: ScheduleModel) -> List[tuple]:
+    """Reads the (patient, therapist, timeslot) tuples chosen by a solved model."""
+    schedule = []
+    for consultation, patient, therapist, timeslot in schedule_model.consultations:
+        if solver.Value(consultation):
+            schedule.append((patient, therapist, timeslot))
+    return schedule
+
+def add_schedule_hint(schedule_model: ScheduleModel, schedule: List[tuple]):
+    """Hints the model's consultation variables towards an existing (patient, therapist, timeslot) schedule."""
+    chosen = {(p.id, t.id, ts["id"]) for p, t, ts in schedule}
+    schedule_model.model.ClearHints()
+    for c, p, t, ts in schedule_model.consultations:
+        schedule_model.model.AddHint(c, (p.id, t.id, ts["id"]) in chosen)
+
+def _first_solution_timer(cp_model):
+    """Returns a solution callback that records the wall time at which the first solution was found."""
+    class FirstSolutionTimer(cp_model.CpSolverSolutionCallback):
+        def __init__(self):
+            super().__init__()
+            self.first_solution_time = None
+
+        def on_solution_callback(self):
+            if self.first_solution_time is None:
+                self.first_solution_time = self.WallTime()
+    return FirstSolutionTimer()
+
+def optimality_gap(objective: float, bound: float) -> float:
+    """Relative gap between an objective value and the best proven bound (0.0 means proven optimal)."""
+    return abs(bound - objective) / max(1.0, abs(objective))
+
+def schedule_objective(schedule: List[tuple], timeslots) -> int:
+    """
+    The create_schedule objective of any (patient, therapist, timeslot) schedule: one point per
+    consultation, per pair of adjacent booked slots of a patient and per such pair with the same therapist.
+    """
+    grid = as_timeslot_grid(timeslots)
+    booked = {(p.id, ts["id"]): t.id for p, t, ts in schedule}
+    objective = len(schedule)
+    for patient_id, timeslot_id in booked:
+        for neighbour in grid.neighbours[timeslot_id]:
+            # Count each adjacent pair once, from the slot with the lower index.
+            if grid.index_of[neighbour] > grid.index_of[timeslot_id] and (patient_id, neighbour) in booked:
+                objective += 1
+                if booked[(patient_id, neighbour)] == booked[(patient_id, timeslot_id)]:
+                    objective += 1
+    return objective
+
+def create_schedule(patients: List[Patient], therapists: List[Therapist], timeslots,
+                    num_workers: int = None, time_limit: float = None, gap_limit: float = None,
+                    greedy_fallback: bool = False, feasibility_only: bool = False, polish_time: float = None,
+                    portfolio: Union[bool, List[str]] = None, solver_parameters: dict = None, history=None,
+                    report: dict = None) -> List[tuple]:
+    """
+    Builds and solves the scheduling model.
+    Args:
+        timeslots: List of timeslot dicts, or a prebuilt TimeslotGrid to skip regrouping them on every solve.
+        num_workers: CP-SAT search workers (solver default if None).
+        time_limit: Limit in seconds for the whole call (no limit if None): the counting checks, the
+                    greedy run and the model build are charged against it, and the solver gets
+                    what is left. The polish step has its own budget, polish_time.
+        gap_limit: Stop as soon as the relative optimality gap falls to this value (e.g. 0.05 for 5%).
+        greedy_fallback: Run the greedy engine first, use it as the CP-SAT hint, and return it if the
+                         solver runs out of time without a solution (and without proving infeasibility),
+                         or straight away if the model build already used up time_limit.
+        feasibility_only: Build only the hard constraints (no bonus variables, no objective) and stop
+                          at the first feasible schedule.
+        polish_time: With feasibility_only, then spend up to this many seconds improving that schedule
+                     under the full objective, starting from it as a hint.
+        portfolio: True, or a list of solver_portfolio.STRATEGIES names, to race several CP-SAT
+                   configurations and the MIP formulation in separate processes; time_limit then
+                   applies to each of them. The report names the winner under "strategy". Setting
+                   num_workers, gap_limit, solver_parameters, feasibility_only, polish_time or
+                   greedy_fallback as well raises ValueError.
+        solver_parameters: Further CP-SAT parameters by name, e.g. {"optimize_with_core": True}.
+        history: A solve_history.SolveHistory, or the path of its log. num_workers, time_limit and
+                 solver_parameters left as None are then picked from similar past solves, and this
+                 solve is appended to the log.
+        report: Optional dict filled with the engine that produced the result ("cp-sat" or "greedy"),
+                the solver status, objective value, best bound, gap, time to first feasible solution
+                and total wall time. When the roster is provably infeasible from counting alone,
+                "explanation" lists the reasons. In feasibility-only mode "mode" is "feasibility", or
+                "polished" once the polish step has returned a schedule.
+    Returns:
+        List of (patient, therapist, timeslot) tuples, or None if no feasible schedule was found.
+    """
+    if history is not None:
+        from solve_history import solve_with_history
+        return solve_with_history(history, patients, therapists, timeslots, num_workers=num_workers,
+                                  time_limit=time_limit, gap_limit=gap_limit, greedy_fallback=greedy_fallback,
+                                  feasibility_only=feasibility_only, polish_time=polish_time, portfolio=portfolio,
+                                  solver_parameters=solver_parameters, report=report)
+
+    if portfolio:
+        ignored = [name for name, value in (("num_workers", num_workers), ("gap_limit", gap_limit),
+                                            ("solver_parameters", solver_parameters),
+                                            ("feasibility_only", feasibility_only), ("polish_time", polish_time),
+                                            ("greedy_fallback", greedy_fallback)) if value]
+        if ignored:
+            raise ValueError(f"{', '.join(ignored)} cannot be combined with portfolio (each strategy sets its own)")
+
+    deadline = time.monotonic() + time_limit if time_limit is not None else None
+
+    # Counting checks on the feasible-slot index prove the obvious infeasible cases without a solve.
+    from feasibility import report_quick_infeasibility
+    if report_quick_infeasibility(patients, therapists, timeslots, report):
+        return None
+
+    if portfolio:
+        from solver_portfolio import solve_portfolio
+        return solve_portfolio(patients, therapists, timeslots, strategies=None if portfolio is True else portfolio,
+                               time_limit=time_limit, report=report)
+
+    # Greedy runs before the build, so its schedule is ready even if the build eats the whole budget.
+    greedy = None
+    if greedy_fallback:
+        from greedy_scheduler import greedy_schedule
+        greedy = greedy_schedule(patients, therapists, timeslots)
+
+    if not feasibility_only:
+        schedule_model = build_schedule_model(patients, therapists, timeslots)
+        return solve_schedule_model(schedule_model, patients, therapists, num_workers=num_workers, deadline=deadline,
+                                    gap_limit=gap_limit, greedy_fallback=greedy_fallback, greedy=greedy,
+                                    solver_parameters=solver_parameters, report=report)
+
+    schedule_model = build_schedule_model(patients, therapists, timeslots, soft_constraints=False)
+    schedule = solve_schedule_model(schedule_model, patients, therapists, num_workers=num_workers,
+                                    deadline=deadline, greedy_fallback=greedy_fallback, greedy=greedy,
+                                    first_solution_only=True, solver_parameters=solver_parameters, report=report)
+    if report is not None:
+        report["mode"] = "feasibility"
+    if schedule is None or not polish_time:
+        return schedule
+
+    # Polish: the full model, hinted with the feasible schedule, so it starts from a solution.
+    full_model = build_schedule_model(patients, therapists, schedule_model.grid)
+    add_schedule_hint(full_model, schedule)
+    polish_report = {}
+    polished = solve_schedule_model(full_model, patients, therapists, num_workers=num_workers, time_limit=polish_time,
+                                    gap_limit=gap_limit, solver_parameters=solver_parameters, report=polish_report)
+    if polished is None:
+        return schedule
+    if report is not None:
+        report.update(polish_report)
+        report["mode"] = "polished"
+    return polished
+
+def solve_schedule_model(schedule_model: ScheduleModel, patients: List[Patient], therapists: List[Therapist],
+                         num_workers: int = None, time_limit: float = None, gap_limit: float = None,
+                         greedy_fallback: bool = False, first_solution_only: bool = False,
+                         solver_parameters: dict = None, deadline: float = None, greedy: tuple = None,
+                         report: dict = None) -> List[tuple]:
+    """
+    Solves an already built model for the given roster; the options and report are those of create_schedule.
+    With first_solution_only the search stops at the first feasible schedule. solver_parameters sets
+    further CP-SAT parameters by name, e.g. {"optimize_with_core": True}. deadline (a time.monotonic()
+    value) caps the solver at the time left before it; if none is left, the greedy schedule is returned
+    without solving. greedy is an already computed greedy_schedule() result for greedy_fallback.
+    Returns:
+        List of (patient, therapist, timeslot) tuples, or None if no feasible schedule was found.
+    """
+    cp_model = load_cp_model()
+    bonus_vars = schedule_model.bonus_vars
+    same_therapist_bonus_vars = schedule_model.same_therapist_bonus_vars
+
+    unmet = None
+    if greedy_fallback:
+        if greedy is None:
+            from greedy_scheduler import greedy_schedule
+            greedy = greedy_schedule(patients, therapists, schedule_model.grid)
+        greedy, unmet = greedy
+        add_schedule_hint(schedule_model, greedy)
+
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 and greedy_fallback and not unmet:
+            print(f"Time limit used up before the solve; returning the greedy schedule ({len(greedy)} consultations).")
+            if report is not None:
+                report.update({"engine": "greedy", "status": "UNKNOWN", "objective": None, "best_bound": None,
+                               "gap": None, "first_solution_time": None, "wall_time": 0.0,
+                               "num_variables": len(schedule_model.model.Proto().variables),
+                               "num_constraints": len(schedule_model.model.Proto().constraints)})
+            return greedy
+        # CP-SAT needs a positive limit; with nothing left it just reports UNKNOWN at once.
+        time_limit = max(min(time_limit, remaining) if time_limit is not None else remaining, 0.001)
+
     # Solve the model.
     solver = cp_model.CpSolver()
-    status = solver.Solve(model)
+    if num_workers is not None:
+        solver.parameters.num_workers = num_workers
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit
+    if gap_limit is not None:
+        solver.parameters.relative_gap_limit = gap_limit
+    if first_solution_only:
+        solver.parameters.stop_after_first_solution = True
+    for name, value in (solver_parameters or {}).items():
+        setattr(solver.parameters, name, value)
+    timer = _first_solution_timer(cp_model)
+    status = solver.Solve(schedule_model.model, timer)
     print(f"Solver status: {solver.StatusName(status)}")
 
+    if report is not None:
+        report.update({
+            "engine": None,
+            "status": solver.StatusName(status),
+            "objective": None,
+            "best_bound": None,
+            "gap": None,
+            "first_solution_time": timer.first_solution_time,
+            "wall_time": solver.WallTime(),
+            "num_variables": len(schedule_model.model.Proto().variables),
+            "num_constraints": len(schedule_model.model.Proto().constraints)
+        })
+
     if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
-        schedule = []
-        for consultation, patient, therapist, timeslot in consultations:
-            if solver.Value(consultation):
-                schedule.append((patient, therapist, timeslot))
-        # Optional: Print bonus information.
-        total_bonus = solver.Value(sum(bonus_vars)) if bonus_vars else 0
-        total_same_bonus = solver.Value(sum(same_therapist_bonus_vars)) if same_therapist_bonus_vars else 0
-        print(f"Total consecutive bonus: {total_bonus}")
-        print(f"Total same-therapist consecutive bonus: {total_same_bonus}")
+        schedule = extract_schedule(solver, schedule_model)
+        if report is not None:
+            report["engine"] = "cp-sat"
+        if schedule_model.model.HasObjective():
+            # Optional: Print bonus information.
+            total_bonus = solver.Value(sum(bonus_vars)) if bonus_vars else 0
+            total_same_bonus = solver.Value(sum(same_therapist_bonus_vars)) if same_therapist_bonus_vars else 0
+            print(f"Total consecutive bonus: {total_bonus}")
+            print(f"Total same-therapist consecutive bonus: {total_same_bonus}")
+            objective = solver.ObjectiveValue()
+            bound = solver.BestObjectiveBound()
+            gap = optimality_gap(objective, bound)
+            print(f"Objective: {objective:g}, best bound: {bound:g}, gap: {gap:.2%}, "
+                  f"first solution after {timer.first_solution_time or 0.0:.2f}s of {solver.WallTime():.2f}s")
+            if report is not None:
+                report.update({"objective": objective, "best_bound": bound, "gap": gap})
+        else:
+            print(f"First feasible schedule after {timer.first_solution_time or 0.0:.2f}s (no objective)")
 
         # Verification (optional)
-        for patient in patients:
-            for specialty, hours_needed in patient.weekly_specialty_needs.items():
-                if hours_needed > 0:
-                    num_consultations = sum(1 for p, t, ts in schedule if p == patient and t.specialty == specialty)
-                    expected = hours_needed
-                    if num_consultations != expected:
-                        print(f"Error: {patient.name} has {num_consultations} {specialty} consultations, needs {expected}")
-                    else:
-                        print(f"Verified: {patient.name} has {num_consultations} {specialty} consultations, matches {expected}")
+        from schedule_validator import validate_schedule
+        errors = validate_schedule(schedule, patients, therapists)
+        for error in errors:
+            print(error)
+        if not errors:
+            print(f"Verified: {len(schedule)} consultations meet all needs, availability and booking rules")
         return schedule
+    elif greedy_fallback and status != cp_model.INFEASIBLE and not unmet:
+        print(f"Solver found no solution within its time budget; returning the greedy schedule ({len(greedy)} consultations).")
+        if report is not None:
+            report["engine"] = "greedy"
+        return greedy
     else:
         print("No feasible schedule found.")
         return None
@@ -0,0 +1,75 @@
+from typing import Dict, List
+
+from schedule_generator import WeekDay
+
+def _time_label(start: float, end: float) -> str:
+    return f"{int(start):02d}:{int((start % 1) * 60):02d} - {int(end):02d}:{int((end % 1) * 60):02d}"
+
+class ScheduleIndex:
+    """
+    A solved schedule indexed once, in a single pass, by patient, therapist, day and slot.
+    All grids and summaries are rendered from the index without rescanning the schedule.
+    """
+    def __init__(self, schedule: List[tuple], timeslots: List[dict]):
+        self.days = [day.value for day in WeekDay]
+        self.time_intervals = sorted(set((ts["start_time"], ts["end_time"]) for ts in timeslots), key=lambda x: x[0])
+        self.patients = {}    # patient.id -> Patient
+        self.therapists = {}  # therapist.id -> Therapist
+        self.by_patient: Dict[str, Dict[tuple, tuple]] = {}    # patient.id -> {(day, interval): (patient, therapist, timeslot)}
+        self.by_therapist: Dict[str, Dict[tuple, tuple]] = {}  # therapist.id -> {(day, interval): (patient, therapist, timeslot)}
+        self.by_day: Dict[str, List[tuple]] = {day: [] for day in self.days}
+        self.by_slot: Dict[tuple, List[tuple]] = {}            # (day, interval) -> [(patient, therapist, timeslot)]
+        for entry in schedule:
+            p, t, ts = entry
+            key = (ts["day_of_week"], (ts["start_time"], ts["end_time"]))
+            self.patients[p.id] = p
+            self.therapists[t.id] = t
+            self.by_patient.setdefault(p.id, {})[key] = entry
+            self.by_therapist.setdefault(t.id, {})[key] = entry
+            self.by_day.setdefault(key[0], []).append(entry)
+            self.by_slot.setdefault(key, []).append(entry)
+
+    def _grid(self, cells: Dict[tuple, tuple], label) -> List[List[str]]:
+        """Rows of [time, cell per day] for one person; label turns an entry into the cell text."""
+        rows = []
+        for interval in self.time_intervals:
+            row = [_time_label(*interval)]
+            for day in self.days:
+                entry = cells.get((day, interval))
+                row.append(label(entry) if entry else "Free")
+            rows.append(row)
+        return rows
+
+    def patient_grid(self, patient_id: str, label=None) -> List[List[str]]:
+        """Rows of the weekly grid for one patient; cells default to "Therapist (Specialty)"."""
+        label = label or (lambda e: f"{e[1].name} ({e[1].specialty})")
+        return self._grid(self.by_patient.get(patient_id, {}), label)
+
+    def therapist_grid(self, therapist_id: str) -> List[List[str]]:
+        """Rows of the weekly grid for one therapist; cells name the patient seen."""
+        return self._grid(self.by_therapist.get(therapist_id, {}), lambda e: e[0].name)
+
+    def therapist_utilization(self, therapists: List = None) -> List[dict]:
+        """
+        Booked versus available hours per therapist.
+        Args:
+            therapists: Roster to summarise (defaults to therapists present in the schedule), so idle
+                        therapists show up with zero booked hours.
+        """
+        summary = []
+        for therapist in sorted(therapists if therapists is not None else self.therapists.values(), key=lambda t: t.id):
+            booked = len(self.by_therapist.get(therapist.id, {}))
+            available = sum(len(slots) for slots in therapist.availability.values())
+            summary.append({
+                "therapist_id": therapist.id,
+                "therapist": therapist.name,
+                "specialty": therapist.specialty,
+                "booked_hours": booked,
+                "available_hours": available,
+                "utilization": booked / available if available else 0.0
+            })
+        return summary
+
+    def daily_load(self) -> Dict[str, int]:
+        """Number of consultations per day of the week."""
+        return {day: len(entries) for day, entries in self.by_day.items()}
@@ -0,0 +1,74 @@
+"""
+Solved schedules kept for paginated HTML views.
+
+Each solve is indexed once (ScheduleIndex) and stored under a solve id; every rendered page is
+cached per solve, so viewing one patient, one therapist or one page of the overview costs a
+dictionary lookup after its first render, whatever the roster size. Only the most recent
+max_solves solves are kept.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from schedule_index import ScheduleIndex
+
+PAGE_SIZE = 50
+
+def paginate(items: List, page: int, per_page: int = PAGE_SIZE) -> Tuple[List, int, int]:
+    """
+    Slices one page out of items; out-of-range pages are clamped to the first or last page.
+    Returns:
+        Tuple of (page items, page number, number of pages).
+    """
+    num_pages = max(1, (len(items) + per_page - 1) // per_page)
+    page = min(max(1, page), num_pages)
+    return items[(page - 1) * per_page:page * per_page], page, num_pages
+
+class SolvedSchedule:
+    """A solve's schedule, its index and the roster it was solved for."""
+    def __init__(self, solve_id: int, schedule: List[tuple], timeslots, patients: List, therapists: List,
+                 report: dict = None):
+        self.solve_id = solve_id
+        self.schedule = schedule
+        self.index = ScheduleIndex(schedule, timeslots)
+        self.patients = list(patients)
+        self.therapists = list(therapists)
+        self.patients_by_id = {p.id: p for p in patients}
+        self.therapists_by_id = {t.id: t for t in therapists}
+        self.report = report or {}
+        self.pages = {}  # cache key -> rendered page
+
+class ScheduleCache:
+    """Thread-safe store of recent solves and their rendered pages."""
+    def __init__(self, max_solves: int = 8):
+        self.max_solves = max_solves
+        self._lock = threading.Lock()
+        self._solves: "OrderedDict[int, SolvedSchedule]" = OrderedDict()
+        self._next_id = 1
+
+    def add(self, schedule: List[tuple], timeslots, patients: List, therapists: List,
+            report: dict = None) -> SolvedSchedule:
+        """Indexes and stores a solved schedule under the next solve id, evicting the oldest solve if full."""
+        with self._lock:
+            solve_id = self._next_id
+            self._next_id += 1
+        solved = SolvedSchedule(solve_id, schedule, timeslots, patients, therapists, report)
+        with self._lock:
+            self._solves[solve_id] = solved
+            while len(self._solves) > self.max_solves:
+                self._solves.popitem(last=False)
+        return solved
+
+    def get(self, solve_id: int) -> Optional[SolvedSchedule]:
+        with self._lock:
+            return self._solves.get(solve_id)
+
+    def page(self, solved: SolvedSchedule, key: tuple, render: Callable[[], str]) -> str:
+        """Returns the cached page for key, rendering and caching it on first use."""
+        with self._lock:
+            cached = solved.pages.get(key)
+        if cached is None:
+            cached = render()
+            with self._lock:
+                solved.pages[key] = cached
+        return cached
@@ -0,0 +1,84 @@
+from collections import Counter
+from typing import List, Optional
+
+from schedule_generator import HourSlot, Patient, Therapist, get_hour_slot
+
+def _availability_sets(person, cache: dict) -> dict:
+    """Returns (and caches per object) the person's availability as day -> set of HourSlot."""
+    key = id(person)
+    if key not in cache:
+        cache[key] = {day: set(slots) for day, slots in person.availability.items()}
+    return cache[key]
+
+def _hour_slot(start_time) -> Optional[HourSlot]:
+    """The HourSlot for a start time, or None if it is outside opening hours (or not a time at all)."""
+    try:
+        return get_hour_slot(start_time)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+def _slot_label(start_time) -> str:
+    hour_slot = _hour_slot(start_time)
+    return hour_slot.value if hour_slot is not None else str(start_time)
+
+def validate_schedule(schedule: List[tuple], patients: Optional[List[Patient]] = None,
+                      therapists: Optional[List[Therapist]] = None) -> List[str]:
+    """
+    Checks a (patient, therapist, timeslot) schedule in a single pass.
+
+    Covers weekly specialty needs, double booking of patients and therapists, availability of
+    both parties and that each therapist's specialty is one the patient needs.
+    Args:
+        schedule: List of (patient, therapist, timeslot) tuples, e.g. from create_schedule or imported.
+        patients: Full roster, so that patients with needs but no consultations are reported too.
+                  Defaults to the patients present in the schedule.
+        therapists: Full therapist roster; consultations with therapists outside it are reported.
+    Returns:
+        List of human-readable violations; empty if the schedule is valid.
+    """
+    errors = []
+    availability_cache = {}
+    patient_slots = Counter()     # (patient.id, day, start_time) -> count
+    therapist_slots = Counter()   # (therapist.id, day, start_time) -> count
+    seen_therapists = {}
+    specialty_counts = Counter()  # (patient.id, specialty) -> count
+    seen_patients = {}
+    known_therapists = {t.id for t in therapists} if therapists is not None else None
+
+    for patient, therapist, timeslot in schedule:
+        day = timeslot["day_of_week"]
+        start = timeslot["start_time"]
+        seen_patients[patient.id] = patient
+        seen_therapists[therapist.id] = therapist
+        patient_slots[(patient.id, day, start)] += 1
+        therapist_slots[(therapist.id, day, start)] += 1
+        specialty_counts[(patient.id, therapist.specialty)] += 1
+
+        if known_therapists is not None and therapist.id not in known_therapists:
+            errors.append(f"Error: {therapist.name} is not in the therapist roster")
+        if patient.weekly_specialty_needs.get(therapist.specialty, 0) <= 0:
+            errors.append(f"Error: {patient.name} is booked with {therapist.name} ({therapist.specialty}) but needs no {therapist.specialty}")
+        hour_slot = _hour_slot(start)
+        if hour_slot is None:
+            errors.append(f"Error: {patient.name}'s consultation with {therapist.name} on {day} at {start} "
+                          f"starts outside opening hours")
+            continue
+        if hour_slot not in _availability_sets(patient, availability_cache).get(day, ()):
+            errors.append(f"Error: {patient.name} is not available on {day} at {hour_slot.value}")
+        if hour_slot not in _availability_sets(therapist, availability_cache).get(day, ()):
+            errors.append(f"Error: {therapist.name} is not available on {day} at {hour_slot.value}")
+
+    for (patient_id, day, start), count in patient_slots.items():
+        if count > 1:
+            errors.append(f"Error: {seen_patients[patient_id].name} is double-booked on {day} at {_slot_label(start)}")
+    for (therapist_id, day, start), count in therapist_slots.items():
+        if count > 1:
+            errors.append(f"Error: {seen_therapists[therapist_id].name} is double-booked on {day} at {_slot_label(start)}")
+
+    for patient in (patients if patients is not None else seen_patients.values()):
+        for specialty, hours_needed in patient.weekly_specialty_needs.items():
+            num_consultations = specialty_counts[(patient.id, specialty)]
+            if hours_needed > 0 and num_consultations != hours_needed:
+                errors.append(f"Error: {patient.name} has {num_consultations} {specialty} consultations, needs {hours_needed}")
+
+    return errors
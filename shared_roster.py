@@ -0,0 +1,161 @@
+"""
+Compact, shared-memory form of roster availability and compatibility for worker processes.
+
+Instead of pickling Patient/Therapist objects with nested availability dicts for every
+subprocess, the roster is packed once into flat byte arrays in a multiprocessing.shared_memory
+block; workers attach by name and read it zero-copy through memoryviews.
+
+Layout (all row-major, one byte per cell):
+    patient_availability    [num_patients x num_timeslots]     1 if the patient is available
+    therapist_availability  [num_therapists x num_timeslots]   1 if the therapist is available
+    needs                   [num_patients x num_specialties]   weekly hours needed (0-255)
+    therapist_specialty     [num_therapists]                   index into specialties
+"""
+from multiprocessing import shared_memory
+from typing import List
+
+from schedule_generator import Patient, Therapist, as_timeslot_grid
+
+class SharedRosterLayout:
+    """Picklable description of a packed roster: dimensions, ids and the shared-memory block name."""
+    def __init__(self, shm_name: str, patient_ids: List[str], therapist_ids: List[str],
+                 timeslot_ids: List[str], specialties: List[str]):
+        self.shm_name = shm_name
+        self.patient_ids = patient_ids
+        self.therapist_ids = therapist_ids
+        self.timeslot_ids = timeslot_ids
+        self.specialties = specialties
+
+    def offsets(self) -> dict:
+        """Start offset and length of each array in the shared block."""
+        p, t, s, k = len(self.patient_ids), len(self.therapist_ids), len(self.timeslot_ids), len(self.specialties)
+        sizes = [("patient_availability", p * s), ("therapist_availability", t * s), ("needs", p * k),
+                 ("therapist_specialty", t)]
+        result = {}
+        start = 0
+        for name, size in sizes:
+            result[name] = (start, size)
+            start += size
+        return result
+
+    @property
+    def size(self) -> int:
+        start, size = self.offsets()["therapist_specialty"]
+        return start + size
+
+class SharedRoster:
+    """
+    A packed roster attached to a shared-memory block.
+
+    Create one in the parent with SharedRoster.create(...), pass its picklable .layout to workers,
+    and have each worker call SharedRoster.attach(layout). The creator must call unlink() once
+    every worker is done; everyone calls close().
+    """
+    def __init__(self, layout: SharedRosterLayout, shm: shared_memory.SharedMemory):
+        self.layout = layout
+        self.shm = shm
+        self.num_timeslots = len(layout.timeslot_ids)
+        self.num_specialties = len(layout.specialties)
+        views = {name: shm.buf[start:start + size] for name, (start, size) in layout.offsets().items()}
+        self.patient_availability = views["patient_availability"]
+        self.therapist_availability = views["therapist_availability"]
+        self.needs = views["needs"]
+        self.therapist_specialty = views["therapist_specialty"]
+
+    @classmethod
+    def create(cls, patients: List[Patient], therapists: List[Therapist], timeslots) -> "SharedRoster":
+        """Packs the roster into a new shared-memory block."""
+        grid = as_timeslot_grid(timeslots)
+        specialties = sorted({t.specialty for t in therapists} |
+                             {s for p in patients for s in p.weekly_specialty_needs})
+        specialty_index = {s: i for i, s in enumerate(specialties)}
+        layout = SharedRosterLayout("", [p.id for p in patients], [t.id for t in therapists],
+                                    [ts["id"] for ts in grid.timeslots], specialties)
+        shm = shared_memory.SharedMemory(create=True, size=max(layout.size, 1))
+        layout.shm_name = shm.name
+        roster = cls(layout, shm)
+
+        slot_index = {(ts["day_of_week"], hs): i for i, (ts, hs) in enumerate(zip(grid.timeslots, grid.hour_slots))}
+        def fill(view, row: int, availability: dict):
+            base = row * roster.num_timeslots
+            for day, slots in availability.items():
+                for hour_slot in slots:
+                    i = slot_index.get((day, hour_slot))
+                    if i is not None:
+                        view[base + i] = 1
+        for row, patient in enumerate(patients):
+            fill(roster.patient_availability, row, patient.availability)
+            for specialty, hours in patient.weekly_specialty_needs.items():
+                roster.needs[row * roster.num_specialties + specialty_index[specialty]] = max(0, min(int(hours), 255))
+        for row, therapist in enumerate(therapists):
+            fill(roster.therapist_availability, row, therapist.availability)
+            roster.therapist_specialty[row] = specialty_index[therapist.specialty]
+        return roster
+
+    @classmethod
+    def attach(cls, layout: SharedRosterLayout) -> "SharedRoster":
+        """Attaches to a block created by another process; nothing is copied."""
+        return cls(layout, shared_memory.SharedMemory(name=layout.shm_name))
+
+    def patient_available(self, patient_row: int, slot: int) -> bool:
+        return bool(self.patient_availability[patient_row * self.num_timeslots + slot])
+
+    def therapist_available(self, therapist_row: int, slot: int) -> bool:
+        return bool(self.therapist_availability[therapist_row * self.num_timeslots + slot])
+
+    def need(self, patient_row: int, specialty: int) -> int:
+        return self.needs[patient_row * self.num_specialties + specialty]
+
+    def compatible_slots(self, patient_row: int, therapist_row: int) -> List[int]:
+        """Timeslot indices where the therapist's specialty is needed and both parties are available."""
+        if not self.need(patient_row, self.therapist_specialty[therapist_row]):
+            return []
+        p = self.patient_availability[patient_row * self.num_timeslots:(patient_row + 1) * self.num_timeslots]
+        t = self.therapist_availability[therapist_row * self.num_timeslots:(therapist_row + 1) * self.num_timeslots]
+        return [i for i in range(self.num_timeslots) if p[i] and t[i]]
+
+    def close(self):
+        """Releases this process's views and mapping of the block."""
+        for view in (self.patient_availability, self.therapist_availability, self.needs, self.therapist_specialty):
+            view.release()
+        self.shm.close()
+
+    def unlink(self):
+        """Frees the block; call once, from the creating process, after every worker has closed it."""
+        self.shm.unlink()
+
+def _reachable_slots_worker(layout: SharedRosterLayout, patient_rows: List[int]) -> List[tuple]:
+    """Worker: per (patient row, specialty) the number of slots with at least one compatible therapist."""
+    roster = SharedRoster.attach(layout)
+    try:
+        results = []
+        for row in patient_rows:
+            reachable = [set() for _ in range(roster.num_specialties)]
+            for therapist_row in range(len(layout.therapist_ids)):
+                reachable[roster.therapist_specialty[therapist_row]].update(roster.compatible_slots(row, therapist_row))
+            for specialty in range(roster.num_specialties):
+                if roster.need(row, specialty):
+                    results.append((row, specialty, len(reachable[specialty])))
+        return results
+    finally:
+        roster.close()
+
+def reachable_slots_parallel(patients: List[Patient], therapists: List[Therapist], timeslots,
+                             processes: int = 2) -> dict:
+    """
+    Counts, in worker processes reading the shared roster, how many distinct timeslots each patient
+    could use for each needed specialty.
+    Returns:
+        Dict of (patient.id, specialty) -> number of reachable timeslots.
+    """
+    from multiprocessing import Pool
+    roster = SharedRoster.create(patients, therapists, timeslots)
+    try:
+        chunks = [list(range(i, len(patients), processes)) for i in range(processes)]
+        with Pool(processes) as pool:
+            parts = pool.starmap(_reachable_slots_worker, [(roster.layout, chunk) for chunk in chunks if chunk])
+    finally:
+        roster.close()
+        roster.unlink()
+    layout = roster.layout
+    return {(layout.patient_ids[row], layout.specialties[s]): count for part in parts for row, s, count in part}
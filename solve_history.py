@@ -0,0 +1,278 @@
+"""
+Append-only log of past solves, and solver settings picked from it.
+
+Every recorded solve is one JSON line: the roster's features (size, candidate consultation variables,
+availability density), the settings it ran with (workers, time limit, CP-SAT parameters) and its
+outcome (status, objective, gap, times). SolveHistory.recommend looks up the most similar past
+rosters and returns the settings that did best on them; create_schedule(history=...) uses that for
+every option the caller left unset, then appends the new solve to the log.
+
+The log fills up from normal use, or offline by replaying the benchmark rosters with every candidate
+configuration:
+    python solve_history.py tune --sizes 5x4,10x4,20x8 --seeds 3 --time-limit 30
+    python solve_history.py summary
+"""
+import argparse
+import json
+import math
+import os
+import threading
+import time
+from typing import List, Optional
+
+from schedule_generator import Patient, Therapist, as_timeslot_grid
+
+HISTORY_FILE = "solve_history.jsonl"
+
+# Settings the tuner replays and recommend chooses between; a recommendation is always one of these.
+CANDIDATE_CONFIGS = [
+    {"num_workers": 1, "solver_parameters": {}},
+    {"num_workers": 8, "solver_parameters": {}},
+    {"num_workers": 8, "solver_parameters": {"optimize_with_core": True}},
+    {"num_workers": 8, "solver_parameters": {"linearization_level": 2}},
+    {"num_workers": 1, "solver_parameters": {"use_lns_only": True}},
+]
+
+# A recommended time limit is the slowest similar solve that proved optimality, times this margin.
+TIME_LIMIT_MARGIN = 2.0
+# ...and is only set once the chosen configuration proved optimality on at least this many similar rosters.
+MIN_NEIGHBOURS_FOR_TIME_LIMIT = 3
+# Past rosters further than this from the current one (see _distance) are not considered similar.
+MAX_DISTANCE = 1.0
+
+def instance_features(patients: List[Patient], therapists: List[Therapist], timeslots) -> dict:
+    """
+    Roster features used to match solves: sizes, hours needed, the number of consultation variables
+    the model will have, and the mean fraction of the week patients and therapists are available.
+    """
+    grid = as_timeslot_grid(timeslots)
+    grid_slots = {(ts["day_of_week"], hs) for ts, hs in zip(grid.timeslots, grid.hour_slots)}
+
+    def slots(availability: dict) -> set:
+        return {(day, hs) for day, hour_slots in availability.items() for hs in hour_slots} & grid_slots
+
+    therapist_slots = {t.id: slots(t.availability) for t in therapists}
+    num_variables = 0
+    patient_density = []
+    for patient in patients:
+        patient_slots = slots(patient.availability)
+        patient_density.append(len(patient_slots) / max(len(grid_slots), 1))
+        for specialty, hours_needed in patient.weekly_specialty_needs.items():
+            if hours_needed > 0:
+                num_variables += sum(len(patient_slots & therapist_slots[t.id])
+                                     for t in therapists if t.specialty == specialty)
+    therapist_density = [len(s) / max(len(grid_slots), 1) for s in therapist_slots.values()]
+    return {
+        "num_patients": len(patients),
+        "num_therapists": len(therapists),
+        "num_timeslots": len(grid_slots),
+        "hours_needed": sum(h for p in patients for h in p.weekly_specialty_needs.values() if h > 0),
+        "num_variables": num_variables,
+        "patient_density": sum(patient_density) / len(patient_density) if patient_density else 0.0,
+        "therapist_density": sum(therapist_density) / len(therapist_density) if therapist_density else 0.0,
+    }
+
+def _distance(a: dict, b: dict) -> float:
+    """Log-ratio distance on the size features plus absolute distance on the densities."""
+    size = sum(abs(math.log1p(a.get(key, 0)) - math.log1p(b.get(key, 0)))
+               for key in ("num_patients", "num_therapists", "num_variables"))
+    density = sum(abs(a.get(key, 0.0) - b.get(key, 0.0)) for key in ("patient_density", "therapist_density"))
+    return size + density
+
+def _config_key(config: dict) -> str:
+    return json.dumps({"num_workers": config.get("num_workers"),
+                       "solver_parameters": config.get("solver_parameters") or {}}, sort_keys=True)
+
+class SolveHistory:
+    """
+    The solve log at one path. Appends are single line writes under a lock, so the web server's
+    threads can share one instance; lines that fail to parse (e.g. a torn write) are skipped on read.
+    """
+    def __init__(self, path: str = HISTORY_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, features: dict, config: dict, report: dict, tuned: bool = False, source: str = "solve"):
+        """
+        Appends one solve.
+        Args:
+            config: The settings the solve ran with (num_workers, time_limit, solver_parameters, ...).
+            report: The create_schedule report of the solve.
+            tuned: Whether config came from recommend.
+            source: "solve" for normal use, "tune" for offline replays.
+        """
+        outcome = {key: report.get(key) for key in ("status", "engine", "objective", "best_bound", "gap",
+                                                    "first_solution_time", "wall_time", "num_variables",
+                                                    "num_constraints", "strategy")}
+        entry = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "source": source, "tuned": tuned,
+                 "features": features, "config": config, "outcome": outcome}
+        line = json.dumps(entry, sort_keys=True) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def records(self) -> List[dict]:
+        """Every readable entry, oldest first; an empty list if the log does not exist yet."""
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        return entries
+
+    def recommend(self, features: dict, k: int = 10) -> Optional[dict]:
+        """
+        Settings that did best on the k most similar past rosters.
+
+        Only solves that found a schedule (OPTIMAL or FEASIBLE) with a recorded wall time count:
+        infeasible rosters, most of them rejected by the counting pre-check in milliseconds, say
+        nothing about how long a solve takes. Candidate configurations are ranked by how often they
+        proved optimality, then by median wall time, then by mean gap. The time limit is set only when
+        the chosen configuration proved optimality on every similar roster it ran on, and on at least
+        MIN_NEIGHBOURS_FOR_TIME_LIMIT of them.
+        Returns:
+            Dict with "num_workers", "solver_parameters" and "time_limit" (possibly None), or None when
+            the log has no similar solve.
+        """
+        neighbours = []
+        for entry in self.records():
+            outcome = entry.get("outcome", {})
+            config = entry.get("config", {})
+            if outcome.get("status") not in ("OPTIMAL", "FEASIBLE") or outcome.get("wall_time") is None:
+                continue
+            if config.get("portfolio") or config.get("feasibility_only") or outcome.get("engine") == "greedy":
+                continue
+            distance = _distance(features, entry.get("features", {}))
+            if distance <= MAX_DISTANCE:
+                neighbours.append((distance, entry))
+        neighbours.sort(key=lambda pair: pair[0])
+        neighbours = [entry for _, entry in neighbours[:k]]
+        if not neighbours:
+            return None
+
+        by_config = {}
+        for entry in neighbours:
+            by_config.setdefault(_config_key(entry["config"]), []).append(entry)
+
+        def score(entries: List[dict]) -> tuple:
+            proven = sum(e["outcome"]["status"] == "OPTIMAL" for e in entries) / len(entries)
+            times = sorted(e["outcome"]["wall_time"] for e in entries)
+            gaps = [e["outcome"].get("gap") or 0.0 for e in entries]
+            return (-proven, times[len(times) // 2], sum(gaps) / len(gaps))
+
+        best_key = min(by_config, key=lambda key: score(by_config[key]))
+        best = by_config[best_key]
+        config = json.loads(best_key)
+        time_limit = None
+        if len(best) >= MIN_NEIGHBOURS_FOR_TIME_LIMIT and all(e["outcome"]["status"] == "OPTIMAL" for e in best):
+            time_limit = max(e["outcome"]["wall_time"] for e in best) * TIME_LIMIT_MARGIN + 1.0
+        return {"num_workers": config["num_workers"], "solver_parameters": config["solver_parameters"],
+                "time_limit": time_limit}
+
+    def tuned_options(self, features: dict, options: dict) -> tuple:
+        """
+        Fills num_workers, time_limit and solver_parameters that are missing (or None) in options from
+        recommend; the caller's own values always win. Recommended values that equal the solver
+        defaults (no worker count, no time limit, no extra parameters) are left out.
+        Returns:
+            Tuple of (options, tuned) where tuned says whether anything was filled in.
+        """
+        recommendation = self.recommend(features)
+        if recommendation is None:
+            return dict(options), False
+        options = dict(options)
+        tuned = False
+        for key in ("num_workers", "time_limit", "solver_parameters"):
+            if options.get(key) is None and recommendation.get(key) not in (None, {}):
+                options[key] = recommendation[key]
+                tuned = True
+        return options, tuned
+
+def solve_with_history(history, patients: List[Patient], therapists: List[Therapist], timeslots, **options):
+    """
+    create_schedule with settings picked from the history, and the solve appended to it. history is a
+    SolveHistory or a path to its log; options and return value are those of create_schedule.
+    """
+    from schedule_generator import create_schedule
+    if not isinstance(history, SolveHistory):
+        history = SolveHistory(history)
+    report = options.pop("report", None)
+    report = {} if report is None else report
+    features = instance_features(patients, therapists, timeslots)
+    tuned = False
+    if not options.get("portfolio"):
+        options, tuned = history.tuned_options(features, options)
+        if tuned:
+            print(f"Tuned from history: workers={options.get('num_workers')}, time limit={options.get('time_limit')}, "
+                  f"parameters={options.get('solver_parameters')}")
+    schedule = create_schedule(patients, therapists, timeslots, report=report, **options)
+    config = {key: value for key, value in options.items() if value is not None and value is not False}
+    history.record(features, config, report, tuned=tuned)
+    return schedule
+
+def tune(history: SolveHistory, sizes: List[tuple], seeds: List[int], time_limit: float,
+         configs: List[dict] = None) -> List[dict]:
+    """
+    Replays the benchmark rosters (differential_harness.generate_instance) with every candidate
+    configuration and records each solve with source "tune".
+    Returns:
+        One row per (size, seed, config) with the configuration and its outcome.
+    """
+    from differential_harness import generate_instance
+    from schedule_generator import create_schedule
+    rows = []
+    for num_patients, num_therapists in sizes:
+        for seed in seeds:
+            patients, therapists, timeslots = generate_instance(seed, num_patients, num_therapists, 7.0, 18.0)
+            features = instance_features(patients, therapists, timeslots)
+            for config in configs or CANDIDATE_CONFIGS:
+                options = dict(config, time_limit=time_limit)
+                report = {}
+                create_schedule(patients, therapists, timeslots, report=report, **options)
+                history.record(features, options, report, source="tune")
+                rows.append({"size": f"{num_patients}x{num_therapists}", "seed": seed, "config": _config_key(config),
+                             "status": report.get("status"), "objective": report.get("objective"),
+                             "wall_time": report.get("wall_time")})
+    return rows
+
+def print_summary(history: SolveHistory):
+    """Per configuration: solves, proven results and median wall time over the whole log."""
+    by_config = {}
+    for entry in history.records():
+        by_config.setdefault(_config_key(entry.get("config", {})), []).append(entry.get("outcome", {}))
+    print(" | ".join(["Solves".rjust(6), "Proven".rjust(6), "Median s".rjust(9), "Config"]))
+    print("-" * 96)
+    for key, outcomes in sorted(by_config.items()):
+        proven = sum(o.get("status") in ("OPTIMAL", "INFEASIBLE") for o in outcomes)
+        times = sorted(o.get("wall_time") or 0.0 for o in outcomes)
+        print(" | ".join([str(len(outcomes)).rjust(6), str(proven).rjust(6), f"{times[len(times) // 2]:9.2f}", key]))
+
+def _parse_sizes(text: str) -> List[tuple]:
+    """Parses "5x4,10x4" into [(5, 4), (10, 4)]."""
+    sizes = []
+    for part in text.split(","):
+        patients, therapists = part.lower().split("x")
+        sizes.append((int(patients), int(therapists)))
+    return sizes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the solve history or fill it by replaying benchmark rosters.")
+    parser.add_argument("--history", default=HISTORY_FILE, help="Path of the solve log")
+    commands = parser.add_subparsers(dest="command", required=True)
+    tune_parser = commands.add_parser("tune", help="Replay benchmark rosters with every candidate configuration")
+    tune_parser.add_argument("--sizes", default="5x4,10x4,20x8", help="Comma-separated PATIENTSxTHERAPISTS")
+    tune_parser.add_argument("--seeds", type=int, default=3, help="Instances per size (seeds 0..N-1)")
+    tune_parser.add_argument("--time-limit", type=float, default=30.0, help="Time limit per solve in seconds")
+    commands.add_parser("summary", help="Summarise the log per configuration")
+    args = parser.parse_args()
+
+    history = SolveHistory(args.history)
+    if args.command == "tune":
+        for row in tune(history, _parse_sizes(args.sizes), list(range(args.seeds)), args.time_limit):
+            print(f"{row['size']} seed {row['seed']}: {row['status']} objective {row['objective']} "
+                  f"in {row['wall_time'] or 0:.2f}s with {row['config']}")
+    print_summary(history)
@@ -0,0 +1,158 @@
+"""
+Races several solver strategies on the same roster, each in its own process.
+
+Every strategy is a CP-SAT parameter set over the create_schedule model, or the MIP formulation in
+mip_scheduler. The race ends as soon as one strategy proves its result (OPTIMAL or INFEASIBLE);
+otherwise every strategy runs to the time limit and the best objective wins. Stragglers are
+terminated. Processes are started with "spawn" so that a portfolio can be launched safely from
+the threaded web server.
+"""
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from typing import List, Optional
+
+from schedule_generator import Patient, Therapist, as_timeslot_grid, schedule_objective
+
+# name -> (engine, options). CP-SAT options are solver parameters plus "greedy_hint"; MIP options go to create_schedule_mip.
+STRATEGIES = {
+    "cp-sat": ("cp-sat", {}),
+    "cp-sat-core": ("cp-sat", {"optimize_with_core": True}),
+    "cp-sat-lp": ("cp-sat", {"linearization_level": 2}),
+    "cp-sat-lns": ("cp-sat", {"use_lns_only": True, "greedy_hint": True}),
+    "mip-scip": ("mip", {"backend": "SCIP"}),
+}
+
+def _run_strategy(name: str, patients: List[Patient], therapists: List[Therapist], timeslots,
+                  time_limit: Optional[float], num_workers: int, results: multiprocessing.Queue):
+    """Process entry point: solves with one strategy and puts a result dict on the queue."""
+    sys.stdout = open(os.devnull, "w")  # the parent prints the race summary
+    started = time.perf_counter()
+    engine, options = STRATEGIES[name]
+    options = dict(options)
+    report = {}
+    try:
+        if engine == "mip":
+            from mip_scheduler import create_schedule_mip
+            schedule = create_schedule_mip(patients, therapists, timeslots, time_limit=time_limit,
+                                           num_threads=num_workers, report=report, **options)
+        else:
+            from schedule_generator import build_schedule_model, solve_schedule_model
+            greedy_hint = options.pop("greedy_hint", False)
+            schedule_model = build_schedule_model(patients, therapists, timeslots)
+            schedule = solve_schedule_model(schedule_model, patients, therapists, num_workers=num_workers,
+                                            time_limit=time_limit, greedy_fallback=greedy_hint,
+                                            solver_parameters=options, report=report)
+    except Exception as e:  # reported to the parent rather than lost with the process
+        results.put({"strategy": name, "status": "ERROR", "error": repr(e), "time": time.perf_counter() - started})
+        return
+    results.put({"strategy": name, "status": report.get("status", "UNKNOWN"), "report": report,
+                 "objective": schedule_objective(schedule, timeslots) if schedule is not None else None,
+                 "schedule": [(p.id, t.id, ts["id"]) for p, t, ts in schedule] if schedule is not None else None,
+                 "time": time.perf_counter() - started})
+
+def solve_portfolio(patients: List[Patient], therapists: List[Therapist], timeslots,
+                    strategies: List[str] = None, time_limit: float = None, grace: float = 5.0,
+                    report: dict = None) -> Optional[List[tuple]]:
+    """
+    Runs the strategies side by side and returns the first proven result, or the best one found.
+    Args:
+        strategies: Names from STRATEGIES (all of them if None).
+        time_limit: Solver time limit for each strategy in seconds (no limit if None: the race then
+                    ends at the first proof, or when every strategy has finished).
+        grace: Extra seconds after time_limit for model building and result transfer before
+               unfinished strategies are terminated.
+        report: Optional dict filled with the winning strategy's report plus "strategy" (the winner)
+                and "portfolio" (status, objective, time and error of every strategy). Strategies that
+                raised or crashed have status "ERROR" and are listed under "errors"; if all of them did,
+                the status is "ERROR".
+    Returns:
+        List of (patient, therapist, timeslot) tuples, or None if no strategy found a schedule.
+    """
+    strategies = list(strategies or STRATEGIES)
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"unknown portfolio strategies: {', '.join(unknown)}")
+    grid = as_timeslot_grid(timeslots)
+    num_workers = max(1, (os.cpu_count() or 1) // len(strategies))
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = {name: context.Process(target=_run_strategy, daemon=True,
+                                       args=(name, patients, therapists, grid, time_limit, num_workers, results))
+                 for name in strategies}
+    started = time.perf_counter()
+    for process in processes.values():
+        process.start()
+
+    deadline = None if time_limit is None else started + time_limit + grace
+    finished = {}
+    winner = None
+    try:
+        while len(finished) < len(processes):
+            wait = 0.5 if deadline is None else min(deadline - time.perf_counter(), 0.5)
+            if wait <= 0:
+                break
+            try:
+                result = results.get(timeout=wait)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes.values()) and results.empty():
+                    break  # every strategy exited, some without reporting (e.g. killed)
+                continue
+            finished[result["strategy"]] = result
+            if result["status"] in ("OPTIMAL", "INFEASIBLE"):
+                winner = result
+                break
+    finally:
+        # Strategies that exited without reporting crashed (killed, out of memory, unpicklable result...).
+        for name, process in processes.items():
+            if name not in finished and not process.is_alive() and process.exitcode != 0:
+                finished[name] = {"strategy": name, "status": "ERROR", "error": f"process exited with code {process.exitcode}",
+                                  "time": time.perf_counter() - started}
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in processes.values():
+            process.join()
+
+    if winner is None:
+        solved = [r for r in finished.values() if r.get("schedule") is not None]
+        if solved:
+            winner = max(solved, key=lambda r: (r["objective"], -r["time"]))
+
+    summary = {name: {"status": finished[name]["status"] if name in finished else "CANCELLED",
+                      "objective": finished[name].get("objective") if name in finished else None,
+                      "time": finished[name]["time"] if name in finished else None,
+                      "error": finished[name].get("error") if name in finished else None}
+               for name in strategies}
+    for name, entry in summary.items():
+        print(f"Portfolio {name}: {entry['status']}" + (f", objective {entry['objective']:g}" if entry["objective"] is not None else "")
+              + (f" ({entry['error']})" if entry["error"] else ""))
+    errors = [f"{name}: {entry['error']}" for name, entry in summary.items() if entry["status"] == "ERROR"]
+
+    schedule = None
+    if winner is not None and winner.get("schedule") is not None:
+        patients_by_id = {p.id: p for p in patients}
+        therapists_by_id = {t.id: t for t in therapists}
+        timeslots_by_id = {ts["id"]: ts for ts in grid.timeslots}
+        schedule = [(patients_by_id[p], therapists_by_id[t], timeslots_by_id[ts]) for p, t, ts in winner["schedule"]]
+        print(f"Portfolio winner: {winner['strategy']} after {winner['time']:.2f}s")
+    else:
+        print("No feasible schedule found.")
+
+    if report is not None:
+        if winner is not None:
+            report.update(winner.get("report", {}))
+        else:
+            # With every strategy crashed, say so rather than reporting an undecided solve.
+            all_failed = bool(errors) and len(errors) == len(strategies)
+            report.update({"engine": None, "status": "ERROR" if all_failed else "UNKNOWN", "objective": None,
+                           "best_bound": None, "gap": None})
+        if errors:
+            report["errors"] = errors
+        report["strategy"] = winner["strategy"] if winner is not None else None
+        report["portfolio"] = summary
+        report["wall_time"] = time.perf_counter() - started
+    return schedule
@@ -0,0 +1,214 @@
+"""
+Solver worker service: runs create_schedule jobs sent as JSON over a local TCP socket.
+
+Each request and response is one JSON object on a single line. A worker solves one job at a time
+and accepts at most max_pending jobs (running plus waiting); beyond that it answers "busy"
+immediately so the caller can try another worker instead of queueing behind a long solve.
+
+Start workers (one process each, on consecutive ports):
+    python solver_service.py --port 7001 --workers 4
+and point app.py at them:
+    SCHEDULER_WORKERS=127.0.0.1:7001,127.0.0.1:7002,127.0.0.1:7003,127.0.0.1:7004 python app.py
+"""
+import argparse
+import json
+import multiprocessing
+import socket
+import socketserver
+import threading
+from typing import List, Optional, Tuple
+
+from schedule_generator import HourSlot, Patient, Therapist, create_schedule
+
+class WorkerUnavailableError(RuntimeError):
+    """Raised when no worker in the pool is healthy and free to take a job."""
+
+class WorkerTimeoutError(RuntimeError):
+    """Raised when a worker took a job but did not answer within the pool's solve_timeout."""
+
+class WorkerError(RuntimeError):
+    """Raised when a worker rejected a job or its solve failed."""
+
+def _availability_to_json(availability: dict) -> dict:
+    return {day: [slot.value for slot in slots] for day, slots in availability.items()}
+
+def _availability_from_json(availability: dict) -> dict:
+    return {day: [HourSlot(value) for value in values] for day, values in availability.items()}
+
+def patient_to_json(patient: Patient) -> dict:
+    return {"id": patient.id, "name": patient.name, "weekly_specialty_needs": patient.weekly_specialty_needs,
+            "availability": _availability_to_json(patient.availability)}
+
+def patient_from_json(data: dict) -> Patient:
+    return Patient(id=data["id"], name=data["name"], weekly_specialty_needs=data["weekly_specialty_needs"],
+                   availability=_availability_from_json(data["availability"]))
+
+def therapist_to_json(therapist: Therapist) -> dict:
+    return {"id": therapist.id, "name": therapist.name, "specialty": therapist.specialty,
+            "availability": _availability_to_json(therapist.availability)}
+
+def therapist_from_json(data: dict) -> Therapist:
+    return Therapist(id=data["id"], name=data["name"], specialty=data["specialty"],
+                     availability=_availability_from_json(data["availability"]))
+
+class SolverWorker(socketserver.ThreadingTCPServer):
+    """A TCP server answering "health" and "solve" requests; solves run one at a time."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int], max_pending: int = 2):
+        super().__init__(address, _SolverRequestHandler)
+        self.max_pending = max_pending
+        self.pending = threading.BoundedSemaphore(max_pending)
+        self.solve_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.in_flight = 0
+        self.solves = 0
+
+    def handle_message(self, message: dict) -> dict:
+        if message.get("type") == "health":
+            with self.stats_lock:
+                return {"status": "ok", "in_flight": self.in_flight, "max_pending": self.max_pending,
+                        "solves": self.solves}
+        if message.get("type") != "solve":
+            return {"status": "error", "error": f"unknown request type: {message.get('type')!r}"}
+        if not self.pending.acquire(blocking=False):
+            return {"status": "busy"}
+        try:
+            with self.stats_lock:
+                self.in_flight += 1
+            with self.solve_lock:
+                return self._solve(message)
+        finally:
+            with self.stats_lock:
+                self.in_flight -= 1
+                self.solves += 1
+            self.pending.release()
+
+    def _solve(self, message: dict) -> dict:
+        patients = [patient_from_json(p) for p in message["patients"]]
+        therapists = [therapist_from_json(t) for t in message["therapists"]]
+        report = {}
+        schedule = create_schedule(patients, therapists, message["timeslots"], report=report,
+                                   **message.get("options", {}))
+        if schedule is None:
+            return {"status": "infeasible", "report": report}
+        return {"status": "ok", "report": report,
+                "schedule": [[p.id, t.id, ts["id"]] for p, t, ts in schedule]}
+
+class _SolverRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            response = self.server.handle_message(json.loads(line))
+        except (ValueError, KeyError, TypeError) as e:
+            response = {"status": "error", "error": str(e)}
+        except Exception as e:  # a failed solve is reported, not mistaken for a dead worker
+            response = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+def send_request(address: Tuple[str, int], message: dict, connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None) -> dict:
+    """
+    Sends one JSON request to a worker and returns its JSON response.
+    Raises:
+        OSError: if the worker cannot be reached or drops the connection.
+        WorkerTimeoutError: if the worker accepted the request but did not answer within read_timeout.
+    """
+    with socket.create_connection(address, timeout=connect_timeout) as sock:
+        sock.settimeout(read_timeout)
+        try:
+            sock.sendall(json.dumps(message).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+        except socket.timeout:
+            raise WorkerTimeoutError(f"worker {address[0]}:{address[1]} did not answer within {read_timeout}s") from None
+    if not line:
+        raise ConnectionError(f"worker {address[0]}:{address[1]} closed the connection")
+    return json.loads(line)
+
+def parse_addresses(text: str) -> List[Tuple[str, int]]:
+    """Parses "host:port,host:port" into a list of (host, port) tuples."""
+    addresses = []
+    for part in text.split(","):
+        if part.strip():
+            host, port = part.strip().rsplit(":", 1)
+            addresses.append((host, int(port)))
+    return addresses
+
+class WorkerPool:
+    """Dispatches create_schedule jobs to solver workers, skipping ones that are down or busy."""
+    def __init__(self, addresses: List[Tuple[str, int]], connect_timeout: float = 2.0,
+                 solve_timeout: Optional[float] = None):
+        self.addresses = list(addresses)
+        self.connect_timeout = connect_timeout
+        self.solve_timeout = solve_timeout
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def health(self) -> dict:
+        """Returns "host:port" -> health response, or {"status": "down"} for unreachable workers."""
+        result = {}
+        for address in self.addresses:
+            try:
+                result[f"{address[0]}:{address[1]}"] = send_request(address, {"type": "health"}, self.connect_timeout, self.connect_timeout)
+            except (OSError, WorkerTimeoutError) as e:
+                result[f"{address[0]}:{address[1]}"] = {"status": "down", "error": str(e)}
+        return result
+
+    def create_schedule(self, patients: List[Patient], therapists: List[Therapist], timeslots,
+                        report: dict = None, **options) -> Optional[List[tuple]]:
+        """
+        Same contract as schedule_generator.create_schedule, solved on the first free worker.
+        Raises:
+            WorkerUnavailableError: if every worker is down or busy.
+            WorkerError: if the worker answered with an error (invalid job or failed solve).
+            WorkerTimeoutError: if the worker that took the job did not answer within solve_timeout. The
+                                job is not re-sent, as that worker may still be solving it.
+        """
+        message = {"type": "solve", "patients": [patient_to_json(p) for p in patients],
+                   "therapists": [therapist_to_json(t) for t in therapists],
+                   "timeslots": list(timeslots), "options": options}
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(len(self.addresses), 1)
+        for i in range(len(self.addresses)):
+            address = self.addresses[(start + i) % len(self.addresses)]
+            try:
+                response = send_request(address, message, self.connect_timeout, self.solve_timeout)
+            except OSError:
+                continue  # unreachable, or dropped the connection: the job is not running there
+            if response["status"] == "busy":
+                continue
+            if response["status"] == "error":
+                raise WorkerError(f"worker {address[0]}:{address[1]} rejected the job: {response['error']}")
+            if report is not None:
+                report.update(response.get("report", {}))
+                report["worker"] = f"{address[0]}:{address[1]}"
+            if response["status"] == "infeasible":
+                return None
+            patients_by_id = {p.id: p for p in patients}
+            therapists_by_id = {t.id: t for t in therapists}
+            timeslots_by_id = {ts["id"]: ts for ts in timeslots}
+            return [(patients_by_id[p], therapists_by_id[t], timeslots_by_id[ts]) for p, t, ts in response["schedule"]]
+        raise WorkerUnavailableError("all solver workers are down or busy")
+
+def run_worker(host: str, port: int, max_pending: int = 2):
+    """Serves solve requests forever on host:port."""
+    with SolverWorker((host, port), max_pending=max_pending) as server:
+        print(f"Solver worker listening on {host}:{port}")
+        server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run local solver worker processes.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7001, help="Port of the first worker")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes, on consecutive ports")
+    parser.add_argument("--max-pending", type=int, default=2, help="Jobs a worker accepts before answering busy")
+    args = parser.parse_args()
+    processes = [multiprocessing.Process(target=run_worker, args=(args.host, args.port + i, args.max_pending))
+                 for i in range(args.workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
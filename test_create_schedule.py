@@ -0,0 +1,72 @@
+import unittest
+from schedule_generator import HourSlot, Patient, Therapist, TimeslotGrid, create_schedule, optimality_gap
+from schedule_validator import validate_schedule
+
+class TestCreateSchedule(unittest.TestCase):
+    def setUp(self):
+        availability = {"Monday": [HourSlot._9to10, HourSlot._10to11, HourSlot._11to12]}
+        self.timeslots = [
+            {"id": "1", "day_of_week": "Monday", "start_time": 9.0, "end_time": 10.0},
+            {"id": "2", "day_of_week": "Monday", "start_time": 10.0, "end_time": 11.0},
+            {"id": "3", "day_of_week": "Monday", "start_time": 11.0, "end_time": 12.0},
+        ]
+        self.patients = [Patient(id="P1", name="John Doe", weekly_specialty_needs={"Speech Therapist": 2},
+                                 availability=availability)]
+        self.therapists = [Therapist(id="T1", name="Dr. Smith", specialty="Speech Therapist", availability=availability)]
+
+    def test_report_carries_objective_bound_and_gap(self):
+        report = {}
+        schedule = create_schedule(self.patients, self.therapists, self.timeslots, num_workers=1, report=report)
+        self.assertEqual(len(schedule), 2)
+        self.assertEqual(report["status"], "OPTIMAL")
+        # Two consultations, one consecutive pair, same therapist.
+        self.assertEqual(report["objective"], 4)
+        self.assertEqual(report["best_bound"], 4)
+        self.assertEqual(report["gap"], 0.0)
+        self.assertIsNotNone(report["first_solution_time"])
+
+    def test_report_on_infeasible(self):
+        self.patients[0].weekly_specialty_needs["Speech Therapist"] = 4
+        report = {}
+        self.assertIsNone(create_schedule(self.patients, self.therapists, self.timeslots, report=report))
+        self.assertEqual(report["status"], "INFEASIBLE")
+        self.assertIsNone(report["gap"])
+
+    def test_feasibility_only_and_polish(self):
+        report = {}
+        schedule = create_schedule(self.patients, self.therapists, self.timeslots, num_workers=1,
+                                   feasibility_only=True, report=report)
+        self.assertEqual(len(schedule), 2)
+        self.assertEqual(report["mode"], "feasibility")
+        self.assertIsNone(report["objective"])
+        full_report = {}
+        create_schedule(self.patients, self.therapists, self.timeslots, num_workers=1, report=full_report)
+        self.assertLess(report["num_variables"], full_report["num_variables"])
+
+        report = {}
+        schedule = create_schedule(self.patients, self.therapists, self.timeslots, num_workers=1,
+                                   feasibility_only=True, polish_time=5.0, report=report)
+        self.assertEqual(report["mode"], "polished")
+        self.assertEqual(report["objective"], 4)
+
+    def test_time_limit_covers_the_model_build(self):
+        specialties = ["Speech Therapist", "Psychologist", "Occupational Therapist"]
+        week = {day: list(HourSlot)[:11] for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]}
+        patients = [Patient(id=f"P{i}", name=f"Patient {i}", weekly_specialty_needs={s: 3 for s in specialties},
+                            availability=week) for i in range(40)]
+        therapists = [Therapist(id=f"T{i}", name=f"Therapist {i}", specialty=specialties[i % 3], availability=week)
+                      for i in range(9)]
+        report = {}
+        # The build alone takes longer than this, so the greedy schedule comes back without a solve.
+        schedule = create_schedule(patients, therapists, TimeslotGrid.weekly(), num_workers=1, time_limit=0.01,
+                                   greedy_fallback=True, report=report)
+        self.assertEqual(validate_schedule(schedule, patients, therapists), [])
+        self.assertEqual(report["engine"], "greedy")
+        self.assertEqual(report["wall_time"], 0.0)
+
+    def test_optimality_gap(self):
+        self.assertEqual(optimality_gap(90, 100), 10 / 90)
+        self.assertEqual(optimality_gap(0, 0.5), 0.5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import random
+import unittest
+from decomposed_scheduler import allocate_days, create_schedule_decomposed
+from schedule_generator import HourSlot, Patient, Therapist, TimeslotGrid, WeekDay, create_schedule
+from schedule_validator import validate_schedule
+
+SPECIALTIES = ["Speech Therapist", "Psychologist", "Occupational Therapist"]
+
+class TestDecomposedScheduler(unittest.TestCase):
+    def setUp(self):
+        self.timeslots = TimeslotGrid.weekly(start_hour=8, end_hour=13)
+        rng = random.Random(5)
+        days = [day.value for day in WeekDay]
+        hours = list(HourSlot)[1:6]
+        def availability():
+            return {day: sorted(rng.sample(hours, 3), key=lambda s: s.value) for day in rng.sample(days, 3)}
+        self.therapists = [Therapist(id=f"T{i}", name=f"Therapist {i}", specialty=SPECIALTIES[i % 3],
+                                     availability=availability()) for i in range(6)]
+        self.patients = [Patient(id=f"P{i}", name=f"Patient {i}", availability=availability(),
+                                 weekly_specialty_needs={s: rng.randint(0, 2) for s in SPECIALTIES}) for i in range(8)]
+
+    def test_allocation_covers_weekly_needs(self):
+        status, allocation = allocate_days(self.patients, self.therapists, self.timeslots, num_workers=1)
+        self.assertIn(status, ("OPTIMAL", "FEASIBLE"))
+        for patient in self.patients:
+            for specialty, hours in patient.weekly_specialty_needs.items():
+                allocated = sum(day.get(specialty, 0) for day in allocation.get(patient.id, {}).values())
+                self.assertEqual(allocated, hours)
+
+    def test_decomposed_schedule_is_valid(self):
+        report, full_report = {}, {}
+        schedule = create_schedule_decomposed(self.patients, self.therapists, self.timeslots, num_workers=1,
+                                              report=report)
+        create_schedule(self.patients, self.therapists, self.timeslots, num_workers=1, report=full_report)
+        self.assertEqual(validate_schedule(schedule, self.patients, self.therapists), [])
+        if not report["fallback"]:
+            self.assertEqual(report["engine"], "decomposed")
+            self.assertEqual(set(report["days"]), {day.value for day in WeekDay})
+            self.assertLessEqual(report["objective"], full_report["objective"])
+
+    def test_day_conflict_falls_back_to_full_model(self):
+        # Stage 1 sees two Monday speech hours of therapist capacity, but both patients need 09:00.
+        therapists = [Therapist(id="T1", name="Dr. Smith", specialty="Speech Therapist",
+                                availability={"Monday": [HourSlot._9to10, HourSlot._10to11]})]
+        patients = [Patient(id=f"P{i}", name=f"Patient {i}", weekly_specialty_needs={"Speech Therapist": 1},
+                            availability={"Monday": [HourSlot._9to10]}) for i in range(2)]
+        report = {}
+        self.assertIsNone(create_schedule_decomposed(patients, therapists, self.timeslots, report=report))
+        self.assertTrue(report["fallback"])
+        self.assertEqual(report["days"]["Monday"], "INFEASIBLE")
+        self.assertEqual(report["status"], "INFEASIBLE")
+
+        report = {}
+        self.assertIsNone(create_schedule_decomposed(patients, therapists, self.timeslots, fallback=False,
+                                                     report=report))
+        self.assertEqual(report["status"], "UNKNOWN")
+
+    def test_stage_one_proves_infeasibility(self):
+        self.patients[0].weekly_specialty_needs["Speech Therapist"] = 30
+        report = {}
+        self.assertIsNone(create_schedule_decomposed(self.patients, self.therapists, self.timeslots, report=report))
+        self.assertEqual(report["status"], "INFEASIBLE")
+        self.assertFalse(report["fallback"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import random
+import unittest
+from differential_harness import ENGINES, Engine, compare, generate_instance, run_harness
+from schedule_generator import create_schedule, schedule_objective
+
+class TestDifferentialHarness(unittest.TestCase):
+    def test_instances_are_reproducible(self):
+        first = generate_instance(3, 4, 4, 8.0, 12.0)
+        second = generate_instance(3, 4, 4, 8.0, 12.0)
+        self.assertEqual([p.availability for p in first[0]], [p.availability for p in second[0]])
+        self.assertEqual(len(first[1]), 4)
+
+    def test_instances_leave_global_random_alone(self):
+        state = random.getstate()
+        generate_instance(3, 4, 4, 8.0, 12.0)
+        self.assertEqual(random.getstate(), state)
+
+    def test_schedule_objective_matches_solver(self):
+        patients, therapists, timeslots = generate_instance(0, 4, 4, 8.0, 12.0)
+        report = {}
+        schedule = create_schedule(patients, therapists, timeslots, num_workers=1, report=report)
+        self.assertEqual(schedule_objective(schedule, timeslots), report["objective"])
+
+    def test_engines_agree_with_reference(self):
+        results = run_harness([0, 1, 5], ["greedy-hint", "incremental", "fast", "decomposed"], num_patients=4,
+                              num_therapists=4, start_hour=8.0, end_hour=12.0, time_limit=10.0)
+        self.assertEqual(len(results), 12)
+        for result in results:
+            self.assertEqual(result["problems"], [], result)
+            self.assertGreater(result["speedup"], 0)
+        self.assertIn("INFEASIBLE", {r["reference_status"] for r in results})
+
+    def test_detects_a_wrong_engine(self):
+        patients, therapists, timeslots = generate_instance(0, 4, 4, 8.0, 12.0)
+        report = {}
+        reference = create_schedule(patients, therapists, timeslots, num_workers=1, report=report)
+        dropped = Engine("dropped", lambda p, t, ts, limit: reference[1:], 0.0)
+        result = compare(dropped, patients, therapists, timeslots, reference, report, 1.0, 10.0)
+        self.assertEqual(result["status"], "FAIL")
+        self.assertTrue(any("needs" in problem or "objective" in problem for problem in result["problems"]))
+        self.assertEqual(compare(ENGINES["fast"], patients, therapists, timeslots, reference, report, 1.0,
+                                 10.0)["problems"], [])
+
+if __name__ == "__main__":
+    unittest.main()
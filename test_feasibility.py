@@ -0,0 +1,47 @@
+import unittest
+from feasibility import FeasibleSlotIndex, explain_infeasibility, quick_infeasibility_checks
+from schedule_generator import HourSlot, Patient, Therapist, TimeslotGrid, create_schedule
+
+class TestFeasibility(unittest.TestCase):
+    def setUp(self):
+        self.timeslots = TimeslotGrid.weekly()
+        self.therapists = [Therapist(id="T1", name="Dr. Smith", specialty="Speech Therapist",
+                                     availability={"Monday": [HourSlot._9to10, HourSlot._10to11, HourSlot._11to12]})]
+
+    def patient(self, pid, hours, slots):
+        return Patient(id=pid, name=f"Patient {pid}", weekly_specialty_needs={"Speech Therapist": hours},
+                       availability={"Monday": slots})
+
+    def test_index_and_need_above_reachable_slots(self):
+        patients = [self.patient("P1", 3, [HourSlot._9to10, HourSlot._10to11, HourSlot._14to15])]
+        index = FeasibleSlotIndex(patients, self.therapists, self.timeslots)
+        self.assertEqual(len(index.reachable_slots("P1", "Speech Therapist")), 2)
+        reasons = quick_infeasibility_checks(index)
+        self.assertEqual(reasons[0], "Patient P1 needs 3 Speech Therapist hours but only 2 timeslots are jointly "
+                                   "available with a Speech Therapist")
+        report = {}
+        self.assertIsNone(create_schedule(patients, self.therapists, self.timeslots, report=report))
+        self.assertEqual(report["explanation"], reasons)
+
+    def test_specialty_capacity(self):
+        patients = [self.patient("P1", 1, [HourSlot._9to10]), self.patient("P2", 1, [HourSlot._9to10])]
+        reasons = explain_infeasibility(patients, self.therapists, self.timeslots)
+        self.assertEqual(len(reasons), 1)
+        self.assertIn("need 2 Speech Therapist hours in total", reasons[0])
+
+    def test_conflict_core_from_assumptions(self):
+        patients = [self.patient("P1", 1, [HourSlot._9to10]), self.patient("P2", 1, [HourSlot._9to10]),
+                    self.patient("P3", 1, [HourSlot._10to11, HourSlot._11to12])]
+        self.assertEqual(quick_infeasibility_checks(FeasibleSlotIndex(patients, self.therapists, self.timeslots)), [])
+        reasons = explain_infeasibility(patients, self.therapists, self.timeslots)
+        self.assertEqual(len(reasons), 1)
+        self.assertIn("Patient P1", reasons[0])
+        self.assertIn("Patient P2", reasons[0])
+        self.assertNotIn("Patient P3", reasons[0])
+
+    def test_feasible_roster_has_no_explanation(self):
+        patients = [self.patient("P1", 2, [HourSlot._9to10, HourSlot._10to11])]
+        self.assertEqual(explain_infeasibility(patients, self.therapists, self.timeslots), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import random
+import unittest
+from complex_test_case import create_complex_test_case
+from greedy_scheduler import greedy_schedule
+from schedule_generator import HourSlot, Patient, Therapist, TimeslotGrid, create_schedule
+from schedule_validator import validate_schedule
+
+class TestGreedyScheduler(unittest.TestCase):
+    def setUp(self):
+        availability = {"Monday": [HourSlot._9to10, HourSlot._10to11, HourSlot._11to12]}
+        self.timeslots = TimeslotGrid.weekly()
+        self.patients = [
+            Patient(id="P1", name="John Doe", weekly_specialty_needs={"Speech Therapist": 2, "Psychologist": 1},
+                    availability=availability),
+            # Only free at 9:00, so it must be placed before John Doe takes that slot.
+            Patient(id="P2", name="Jane Roe", weekly_specialty_needs={"Speech Therapist": 1},
+                    availability={"Monday": [HourSlot._9to10]}),
+        ]
+        self.therapists = [
+            Therapist(id="T1", name="Dr. Smith", specialty="Speech Therapist", availability=availability),
+            Therapist(id="T2", name="Dr. Jones", specialty="Psychologist", availability=availability),
+        ]
+
+    def test_scarcest_need_first_and_valid(self):
+        schedule, unmet = greedy_schedule(self.patients, self.therapists, self.timeslots)
+        self.assertEqual(unmet, [])
+        self.assertEqual(validate_schedule(schedule, self.patients, self.therapists), [])
+        speech_slots = sorted(ts["start_time"] for p, t, ts in schedule if p.id == "P1" and t.id == "T1")
+        self.assertEqual(speech_slots, [10.0, 11.0])
+
+    def test_unmet_needs_reported(self):
+        self.patients[1].weekly_specialty_needs["Speech Therapist"] = 2
+        _, unmet = greedy_schedule(self.patients, self.therapists, self.timeslots)
+        self.assertEqual([(p.id, specialty, missing) for p, specialty, missing in unmet], [("P2", "Speech Therapist", 1)])
+
+    def test_random_rosters_are_valid_when_complete(self):
+        random.seed(11)
+        for _ in range(5):
+            patients, therapists, timeslots = create_complex_test_case()
+            schedule, unmet = greedy_schedule(patients, therapists, timeslots)
+            errors = validate_schedule(schedule)
+            self.assertFalse([e for e in errors if "double-booked" in e or "not available" in e])
+            if not unmet:
+                self.assertEqual(validate_schedule(schedule, patients, therapists), [])
+
+    def test_create_schedule_labels_engine(self):
+        report = {}
+        schedule = create_schedule(self.patients, self.therapists, self.timeslots, num_workers=1,
+                                   greedy_fallback=True, report=report)
+        self.assertEqual(report["engine"], "cp-sat")
+        self.assertEqual(len(schedule), 4)
+        report = {}
+        schedule = create_schedule(self.patients, self.therapists, self.timeslots, num_workers=1, time_limit=0.0,
+                                   greedy_fallback=True, report=report)
+        self.assertEqual(report["engine"], "greedy")
+        self.assertEqual(validate_schedule(schedule, self.patients, self.therapists), [])
+
+if __name__ == "__main__":
+    unittest.main()
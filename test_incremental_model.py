@@ -0,0 +1,166 @@
+import random
+import threading
+import unittest
+from incremental_model import IncrementalScheduleModel
+from roster_store import RosterStore
+from schedule_generator import HourSlot, Patient, Therapist, TimeslotGrid, WeekDay, create_schedule, load_cp_model
+from schedule_validator import validate_schedule
+
+SPECIALTIES = ["Speech Therapist", "Psychologist"]
+
+def random_availability(rng):
+    return {day.value: sorted(rng.sample(list(HourSlot), 4), key=lambda s: s.value)
+            for day in rng.sample(list(WeekDay), 2)}
+
+class TestIncrementalScheduleModel(unittest.TestCase):
+    def setUp(self):
+        self.timeslots = TimeslotGrid.weekly()
+        rng = random.Random(3)
+        self.therapists = [Therapist(id=f"T{i}", name=f"Therapist {i}", specialty=SPECIALTIES[i % 2],
+                                     availability=random_availability(rng)) for i in range(4)]
+        self.patients = [Patient(id=f"P{i}", name=f"Patient {i}", availability=random_availability(rng),
+                                 weekly_specialty_needs={s: rng.randint(0, 1) for s in SPECIALTIES}) for i in range(6)]
+
+    def assert_matches_full_rebuild(self, builder):
+        patients, therapists = list(builder.patients.values()), list(builder.therapists.values())
+        expected, actual = {}, {}
+        full = create_schedule(patients, therapists, self.timeslots, num_workers=1, report=expected)
+        schedule = builder.solve(num_workers=1, report=actual)
+        self.assertEqual(actual["status"], expected["status"])
+        if full is not None:
+            self.assertEqual(actual["objective"], expected["objective"])
+            self.assertEqual(validate_schedule(schedule, patients, therapists), [])
+
+    def test_edits_match_full_rebuild(self):
+        builder = IncrementalScheduleModel(self.timeslots)
+        for patient in self.patients[:3]:
+            builder.add_patient(patient)
+        for therapist in self.therapists:
+            builder.add_therapist(therapist)
+        for patient in self.patients[3:]:
+            builder.add_patient(patient)
+        self.assert_matches_full_rebuild(builder)
+
+        size = len(builder.model.Proto().variables)
+        self.assertEqual(builder.remove_patient("P0").id, "P0")
+        self.assertIsNone(builder.remove_patient("P0"))
+        builder.remove_therapist("T1")
+        self.assertEqual(len(builder.model.Proto().variables), size)  # deactivated in place, not rebuilt
+        self.assert_matches_full_rebuild(builder)
+
+        builder.rebuild()
+        self.assertEqual(builder.dead, set())
+        self.assert_matches_full_rebuild(builder)
+
+    def test_edit_cost_and_serialized_cache(self):
+        builder = IncrementalScheduleModel(self.timeslots)
+        for therapist in self.therapists:
+            builder.add_therapist(therapist)
+        for patient in self.patients[:-1]:
+            builder.add_patient(patient)
+        first = builder.serialized_model()
+        self.assertIs(builder.serialized_model(), first)
+        copy = load_cp_model().CpModel()
+        copy.Proto().parse_text_format(first)
+        self.assertEqual(len(copy.Proto().variables), len(builder.model.Proto().variables))
+
+        before = len(builder.model.Proto().variables)
+        builder.add_patient(self.patients[-1])
+        added = len(builder.model.Proto().variables) - before
+        alone = IncrementalScheduleModel(self.timeslots)
+        for therapist in self.therapists:
+            alone.add_therapist(therapist)
+        alone.add_patient(self.patients[-1])
+        self.assertEqual(added, len(alone.schedule_model().model.Proto().variables))
+        self.assertIsNot(builder.serialized_model(), first)
+
+    def test_fragmented_model_is_rebuilt(self):
+        builder = IncrementalScheduleModel(self.timeslots)
+        builder.MIN_DEAD_VARIABLES_FOR_REBUILD = 0
+        for therapist in self.therapists:
+            builder.add_therapist(therapist)
+        for patient in self.patients:
+            builder.add_patient(patient)
+        builder.schedule_model()  # build, so the removals below deactivate variables in place
+        for patient in self.patients[:4]:
+            builder.remove_patient(patient.id)
+        self.assertEqual(builder.rebuilds, 1)
+        self.assertLessEqual(len(builder.dead), len(builder.model.Proto().variables) - len(builder.dead))
+        self.assert_matches_full_rebuild(builder)
+
+    def test_model_is_built_on_first_solve(self):
+        builder = IncrementalScheduleModel(self.timeslots)
+        for therapist in self.therapists:
+            builder.add_therapist(therapist)
+        for patient in self.patients:
+            builder.add_patient(patient)
+        builder.remove_patient("P0")
+        self.assertIsNone(builder.model)
+        self.assert_matches_full_rebuild(builder)
+        self.assertIsNotNone(builder.model)
+        self.assertEqual(builder.rebuilds, 0)
+
+    def test_quick_infeasibility_check_runs_before_solve(self):
+        builder = IncrementalScheduleModel(self.timeslots)
+        builder.add_therapist(self.therapists[0])
+        builder.add_patient(Patient(id="PX", name="Overbooked", availability=self.therapists[0].availability,
+                                    weekly_specialty_needs={self.therapists[0].specialty: 50}))
+        report = {}
+        self.assertIsNone(builder.solve(report=report))
+        self.assertEqual(report["status"], "INFEASIBLE")
+        self.assertTrue(report["explanation"])
+        self.assertIsNone(builder.model)
+
+    def test_sync_and_solve_a_snapshot(self):
+        store, builder = RosterStore(), IncrementalScheduleModel(self.timeslots)
+        for therapist in self.therapists:
+            store.add_therapist(therapist.name, therapist.specialty, therapist.availability)
+        for patient in self.patients:
+            store.add_patient(patient.name, patient.weekly_specialty_needs, patient.availability)
+        builder.sync(store.snapshot())
+        solved = store.snapshot()
+        self.assert_matches_full_rebuild(builder)
+
+        store.delete_patient("P1")
+        builder.sync(store.snapshot())
+        builder.sync(solved)  # older than the roster it already has, so ignored
+        self.assertNotIn("P1", builder.patients)
+        self.assertEqual(builder.roster_version, store.snapshot().version)
+        self.assert_matches_full_rebuild(builder)
+
+        # A snapshot the builder has moved past is still solved as it was.
+        expected, actual = {}, {}
+        create_schedule(list(solved.patients), list(solved.therapists), self.timeslots, num_workers=1,
+                        report=expected)
+        schedule = builder.solve(snapshot=solved, num_workers=1, report=actual)
+        self.assertEqual(actual["objective"], expected["objective"])
+        self.assertEqual(validate_schedule(schedule, list(solved.patients), list(solved.therapists)), [])
+
+    def test_edits_do_not_wait_for_a_build(self):
+        late = self.patients[-1]
+
+        class EditDuringBuild(IncrementalScheduleModel):
+            outer = None
+
+            def _apply(self, patients, therapists):
+                super()._apply(patients, therapists)
+                outer, EditDuringBuild.outer = EditDuringBuild.outer, None
+                if outer is not None:
+                    editor = threading.Thread(target=outer.add_patient, args=(late,))
+                    editor.start()
+                    editor.join(10)
+                    assert not editor.is_alive(), "the edit waited for the build"
+
+        builder = EditDuringBuild(self.timeslots)
+        for therapist in self.therapists:
+            builder.add_therapist(therapist)
+        for patient in self.patients[:-1]:
+            builder.add_patient(patient)
+        EditDuringBuild.outer = builder
+        builder.schedule_model()
+        # The edit made during the build is replayed on the new model before it is swapped in.
+        self.assertIn(late.id, builder.patients)
+        self.assert_matches_full_rebuild(builder)
+
+if __name__ == "__main__":
+    unittest.main()
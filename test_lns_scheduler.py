@@ -0,0 +1,47 @@
+import unittest
+from schedule_generator import HourSlot, Patient, Therapist, WeekDay
+from lns_scheduler import create_schedule_lns
+
+class TestLnsScheduler(unittest.TestCase):
+    def setUp(self):
+        morning = [HourSlot._9to10, HourSlot._10to11, HourSlot._11to12]
+        availability = {"Monday": morning, "Tuesday": morning}
+        self.timeslots = []
+        slot_id = 1
+        for day in [WeekDay.Monday, WeekDay.Tuesday]:
+            for hour in (9.0, 10.0, 11.0):
+                self.timeslots.append({"id": str(slot_id), "day_of_week": day.value,
+                                       "start_time": hour, "end_time": hour + 1.0})
+                slot_id += 1
+        self.patients = [
+            Patient(id="P1", name="Patient 1", weekly_specialty_needs={"Speech Therapist": 2, "Psychologist": 1},
+                    availability=availability),
+            Patient(id="P2", name="Patient 2", weekly_specialty_needs={"Speech Therapist": 1, "Psychologist": 2},
+                    availability=availability),
+        ]
+        self.therapists = [
+            Therapist(id="T1", name="Dr. Alice", specialty="Speech Therapist", availability=availability),
+            Therapist(id="T2", name="Dr. Bob", specialty="Psychologist", availability=availability),
+        ]
+
+    def test_lns_returns_valid_schedule_and_history(self):
+        report = {}
+        schedule = create_schedule_lns(self.patients, self.therapists, self.timeslots,
+                                       time_budget=2.0, iteration_time_limit=0.5, seed=1, report=report)
+        self.assertIsNotNone(schedule)
+        self.assertEqual(len(schedule), 6)
+        booked = [(t.id, ts["id"]) for _, t, ts in schedule]
+        self.assertEqual(len(booked), len(set(booked)))
+        self.assertGreaterEqual(report["objective"], report["initial_objective"])
+        self.assertEqual(report["history"][0]["neighbourhood"], "initial")
+        self.assertGreater(report["iterations"], 0)
+
+    def test_lns_infeasible(self):
+        self.patients[0].weekly_specialty_needs["Speech Therapist"] = 7
+        report = {}
+        schedule = create_schedule_lns(self.patients, self.therapists, self.timeslots, time_budget=1.0, report=report)
+        self.assertIsNone(schedule)
+        self.assertEqual(report["iterations"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
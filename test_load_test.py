@@ -0,0 +1,33 @@
+import random
+import unittest
+from app_fixtures import isolate_app
+from load_test import _availability_text, percentile, run_load_test
+
+class TestLoadTest(unittest.TestCase):
+    def setUp(self):
+        isolate_app(self)
+
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_availability_leaves_global_random_alone(self):
+        state = random.getstate()
+        texts = [_availability_text(random.Random(3)) for _ in range(2)]
+        self.assertEqual(random.getstate(), state)
+        self.assertEqual(texts[0], texts[1])
+
+    def test_mixed_workload_report(self):
+        report = run_load_test(total_requests=20, concurrency=3,
+                               mix={"add_patient": 3, "add_therapist": 1, "delete_patient": 1}, seed=7)
+        self.assertEqual(report["all"]["count"], 20)
+        self.assertEqual(report["all"]["errors"], 0)
+        for stats in report.values():
+            self.assertLessEqual(stats["p50"], stats["p95"])
+            self.assertLessEqual(stats["p95"], stats["p99"])
+            self.assertGreater(stats["throughput"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
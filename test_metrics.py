@@ -0,0 +1,42 @@
+import unittest
+import app
+from app_fixtures import isolate_app
+from metrics import Registry
+
+class TestMetrics(unittest.TestCase):
+    def test_render_counter_gauge_histogram(self):
+        registry = Registry()
+        solves = registry.counter("solves_total", "Solves.", ("status",))
+        size = registry.gauge("roster_size", "Roster size.", ("kind",))
+        latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        solves.inc(status="OPTIMAL")
+        solves.inc(status="OPTIMAL")
+        size.set(3, kind="patients")
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5.0)
+        text = registry.render()
+        self.assertIn('solves_total{status="OPTIMAL"} 2', text)
+        self.assertIn('roster_size{kind="patients"} 3', text)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="1.0"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count 3', text)
+        self.assertIn('# TYPE latency_seconds histogram', text)
+
+    def test_app_metrics_endpoint(self):
+        isolate_app(self)
+        client = app.app.test_client()
+        client.post('/', data={'action': 'add_patient', 'patient_name': 'A', 'speech_hours': '1', 'psycho_hours': '0',
+                               'occ_hours': '0', 'patient_availability': 'Monday: 09:00'})
+        client.post('/', data={'action': 'add_therapist', 'therapist_name': 'Dr. X', 'specialty': 'Speech Therapist',
+                               'therapist_availability': 'Monday: 09:00'})
+        client.post('/', data={'action': 'run_scheduler'})
+        text = client.get('/metrics').get_data(as_text=True)
+        self.assertIn('scheduler_solves_total{status="OPTIMAL",engine="cp-sat"}', text)
+        self.assertIn('scheduler_request_duration_seconds_count{action="run_scheduler"} ', text)
+        self.assertIn('scheduler_roster_size{kind="patients"} 1', text)
+        self.assertNotIn('scheduler_model_variables 0', text)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import threading
+import unittest
+from roster_store import RosterStore
+
+class TestRosterStore(unittest.TestCase):
+    def test_ids_are_not_reused_after_delete(self):
+        store = RosterStore()
+        store.add_patient("A", {"Psychologist": 1}, {})
+        second = store.add_patient("B", {"Psychologist": 1}, {})
+        store.delete_patient("P1")
+        third = store.add_patient("C", {"Psychologist": 1}, {})
+        self.assertEqual(second.id, "P2")
+        self.assertEqual(third.id, "P3")
+        self.assertEqual([p.id for p in store.snapshot().patients], ["P2", "P3"])
+        self.assertIsNone(store.delete_therapist("T1"))
+
+    def test_snapshots_are_not_affected_by_later_writes(self):
+        store = RosterStore()
+        store.add_therapist("Dr. Smith", "Speech Therapist", {})
+        before = store.snapshot()
+        store.add_therapist("Dr. Jones", "Psychologist", {})
+        store.delete_therapist("T1")
+        self.assertEqual([t.id for t in before.therapists], ["T1"])
+        self.assertEqual([t.id for t in store.snapshot().therapists], ["T2"])
+        self.assertGreater(store.snapshot().version, before.version)
+
+    def test_concurrent_adds_get_unique_ids(self):
+        store = RosterStore()
+        def add_many():
+            for i in range(200):
+                store.add_patient(f"Patient {i}", {"Psychologist": 1}, {})
+        threads = [threading.Thread(target=add_many) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        ids = [p.id for p in store.snapshot().patients]
+        self.assertEqual(len(ids), 800)
+        self.assertEqual(len(set(ids)), 800)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+from schedule_cli import EXIT_INFEASIBLE, EXIT_INPUT_ERROR, EXIT_OK, EXIT_TIMEOUT, load_patients, main
+
+class TestScheduleCli(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patients_path = os.path.join(self.tmp.name, "patients.json")
+        self.therapists_path = os.path.join(self.tmp.name, "therapists.csv")
+        with open(self.patients_path, "w") as f:
+            json.dump([{"id": "P1", "name": "John Doe", "weekly_specialty_needs": {"Speech Therapist": 2},
+                        "availability": {"Monday": ["09:00", "10:00"]}}], f)
+        with open(self.therapists_path, "w") as f:
+            f.write("id,name,specialty,availability\n")
+            f.write('T1,Dr. Smith,Speech Therapist,"Monday: 09:00, 10:00; Tuesday: 09:00"\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_solves_and_writes_outputs(self):
+        json_path = os.path.join(self.tmp.name, "schedule.json")
+        csv_dir = os.path.join(self.tmp.name, "csv")
+        code = main(["--patients", self.patients_path, "--therapists", self.therapists_path,
+                     "--workers", "1", "--time-limit", "10", "--json", json_path, "--csv-dir", csv_dir])
+        self.assertEqual(code, EXIT_OK)
+        with open(json_path) as f:
+            records = json.load(f)
+        self.assertEqual(len(records), 2)
+        self.assertEqual({r["therapist_id"] for r in records}, {"T1"})
+        self.assertTrue(os.path.exists(os.path.join(csv_dir, "John_Doe_schedule.csv")))
+
+    def test_decomposed_engine(self):
+        json_path = os.path.join(self.tmp.name, "schedule.json")
+        code = main(["--patients", self.patients_path, "--therapists", self.therapists_path,
+                     "--engine", "decomposed", "--json", json_path])
+        self.assertEqual(code, EXIT_OK)
+        with open(json_path) as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+    def test_csv_patients_and_infeasible_exit_code(self):
+        patients_csv = os.path.join(self.tmp.name, "patients.csv")
+        with open(patients_csv, "w") as f:
+            f.write("id,name,Speech Therapist,Psychologist,Occupational Therapist,availability\n")
+            f.write("P1,Jane Roe,3,0,0,Monday: 09:00\n")
+        self.assertEqual(load_patients(patients_csv)[0].weekly_specialty_needs["Speech Therapist"], 3)
+        code = main(["--patients", patients_csv, "--therapists", self.therapists_path, "--time-limit", "10"])
+        self.assertEqual(code, EXIT_INFEASIBLE)
+
+    def test_missing_input(self):
+        code = main(["--patients", os.path.join(self.tmp.name, "missing.json"), "--therapists", self.therapists_path])
+        self.assertEqual(code, EXIT_INPUT_ERROR)
+
+    def test_timeout_exit_code(self):
+        hours = [f"{h:02d}:00" for h in range(7, 18)]
+        week = {day: hours for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]}
+        specialties = ["Speech Therapist", "Psychologist", "Occupational Therapist"]
+        patients_path = os.path.join(self.tmp.name, "many_patients.json")
+        therapists_path = os.path.join(self.tmp.name, "many_therapists.json")
+        with open(patients_path, "w") as f:
+            json.dump([{"id": f"P{i}", "name": f"Patient {i}", "weekly_specialty_needs": {s: 3 for s in specialties},
+                        "availability": week} for i in range(40)], f)
+        with open(therapists_path, "w") as f:
+            json.dump([{"id": f"T{i}", "name": f"Therapist {i}", "specialty": specialties[i % 3],
+                        "availability": week} for i in range(9)], f)
+        code = main(["--patients", patients_path, "--therapists", therapists_path, "--workers", "1",
+                     "--time-limit", "0.01"])
+        self.assertEqual(code, EXIT_TIMEOUT)
+
+    def test_rejects_ignored_flags(self):
+        base = ["--patients", self.patients_path, "--therapists", self.therapists_path]
+        for extra in (["--polish-time", "5"], ["--engine", "decomposed", "--fast"],
+                      ["--engine", "mip", "--gap-limit", "0.1"], ["--engine", "portfolio", "--workers", "2"]):
+            with self.assertRaises(SystemExit):
+                main(base + extra)
+
+    def test_history_log(self):
+        history_path = os.path.join(self.tmp.name, "history.jsonl")
+        for _ in range(4):
+            code = main(["--patients", self.patients_path, "--therapists", self.therapists_path,
+                         "--workers", "1", "--history", history_path])
+            self.assertEqual(code, EXIT_OK)
+        with open(history_path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r["outcome"]["status"] for r in records], ["OPTIMAL"] * 4)
+        # The time limit is only picked once three similar solves have proved optimality.
+        self.assertEqual([r["tuned"] for r in records], [False, False, False, True])
+        self.assertIn("time_limit", records[3]["config"])
+        with self.assertRaises(SystemExit):
+            main(["--patients", self.patients_path, "--therapists", self.therapists_path, "--engine", "mip",
+                  "--history", history_path])
+
+if __name__ == "__main__":
+    unittest.main()
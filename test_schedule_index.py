@@ -0,0 +1,32 @@
+import unittest
+from schedule_generator import HourSlot, Patient, Therapist
+from schedule_index import ScheduleIndex
+
+class TestScheduleIndex(unittest.TestCase):
+    def setUp(self):
+        availability = {"Monday": [HourSlot._9to10, HourSlot._10to11]}
+        self.timeslots = [
+            {"id": "1", "day_of_week": "Monday", "start_time": 9.0, "end_time": 10.0},
+            {"id": "2", "day_of_week": "Monday", "start_time": 10.0, "end_time": 11.0},
+        ]
+        self.p1 = Patient(id="P1", name="John Doe", weekly_specialty_needs={"Speech Therapist": 1}, availability=availability)
+        self.p2 = Patient(id="P2", name="Jane Roe", weekly_specialty_needs={"Speech Therapist": 1}, availability=availability)
+        self.t1 = Therapist(id="T1", name="Dr. Smith", specialty="Speech Therapist", availability=availability)
+        self.t2 = Therapist(id="T2", name="Dr. Idle", specialty="Psychologist", availability=availability)
+        self.schedule = [(self.p1, self.t1, self.timeslots[0]), (self.p2, self.t1, self.timeslots[1])]
+        self.index = ScheduleIndex(self.schedule, self.timeslots)
+
+    def test_patient_and_therapist_grids(self):
+        self.assertEqual(self.index.patient_grid("P1")[0][:2], ["09:00 - 10:00", "Dr. Smith (Speech Therapist)"])
+        self.assertEqual(self.index.patient_grid("P1")[1][1], "Free")
+        self.assertEqual([row[1] for row in self.index.therapist_grid("T1")], ["John Doe", "Jane Roe"])
+
+    def test_utilization_and_daily_load(self):
+        rows = self.index.therapist_utilization([self.t1, self.t2])
+        self.assertEqual([(r["therapist_id"], r["booked_hours"], r["available_hours"]) for r in rows],
+                         [("T1", 2, 2), ("T2", 0, 2)])
+        self.assertEqual(rows[0]["utilization"], 1.0)
+        self.assertEqual(self.index.daily_load()["Monday"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import app
+from app_fixtures import isolate_app
+from schedule_pages import ScheduleCache, paginate
+
+class TestSchedulePages(unittest.TestCase):
+    def setUp(self):
+        isolate_app(self, solves=ScheduleCache(max_solves=2))
+        self.client = app.app.test_client()
+
+    def test_paginate_clamps_pages(self):
+        items = list(range(120))
+        self.assertEqual(paginate(items, 1), (items[:50], 1, 3))
+        self.assertEqual(paginate(items, 9), (items[100:], 3, 3))
+        self.assertEqual(paginate([], 0), ([], 1, 1))
+
+    def test_cache_evicts_oldest_solve(self):
+        cache = ScheduleCache(max_solves=2)
+        ids = [cache.add([], app.timeslots, [], []).solve_id for _ in range(3)]
+        self.assertIsNone(cache.get(ids[0]))
+        self.assertIsNotNone(cache.get(ids[2]))
+        solved = cache.get(ids[2])
+        renders = []
+        for _ in range(2):
+            page = cache.page(solved, ('overview', 1, 1), lambda: renders.append(1) or "html")
+        self.assertEqual((page, len(renders)), ("html", 1))
+
+    def test_solve_pages(self):
+        for i in range(60):
+            self.client.post("/", data={"action": "add_patient", "patient_name": f"Patient {i}",
+                                        "patient_availability": "Monday: 09:00"})
+        self.client.post("/", data={"action": "add_patient", "patient_name": "Alice", "speech_hours": "1",
+                                    "patient_availability": "Monday: 09:00"})
+        self.client.post("/", data={"action": "add_therapist", "therapist_name": "Dr. Smith",
+                                    "specialty": "Speech Therapist", "therapist_availability": "Monday: 09:00"})
+
+        home = self.client.get("/?page=2").get_data(as_text=True)
+        self.assertIn("Patients (61)", home)
+        self.assertIn("Page 2 of 2", home)
+        self.assertNotIn("Patient 0 ", home)
+
+        response = self.client.post("/", data={"action": "run_scheduler"})
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.headers["Location"].endswith("/schedule/1"))
+        self.assertIn("/schedule/1/patient/P61", self.client.get("/schedule/1?page=2").get_data(as_text=True))
+        patient_page = self.client.get("/schedule/1/patient/P61").get_data(as_text=True)
+        self.assertIn("Schedule for Alice", patient_page)
+        self.assertIn("Dr. Smith (ST)", patient_page)
+        self.assertIn("Alice", self.client.get("/schedule/1/therapist/T1").get_data(as_text=True))
+        self.assertEqual(self.client.get("/schedule/1/patient/P999").status_code, 404)
+        self.assertEqual(self.client.get("/schedule/7").status_code, 404)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from schedule_generator import HourSlot, Patient, Therapist
+from schedule_validator import validate_schedule
+
+class TestScheduleValidator(unittest.TestCase):
+    def setUp(self):
+        availability = {"Monday": [HourSlot._9to10, HourSlot._10to11]}
+        self.ts1 = {"id": "1", "day_of_week": "Monday", "start_time": 9.0, "end_time": 10.0}
+        self.ts2 = {"id": "2", "day_of_week": "Monday", "start_time": 10.0, "end_time": 11.0}
+        self.ts3 = {"id": "3", "day_of_week": "Monday", "start_time": 11.0, "end_time": 12.0}
+        self.patient = Patient(id="P1", name="John Doe", weekly_specialty_needs={"Speech Therapist": 2},
+                               availability=availability)
+        self.other = Patient(id="P2", name="Jane Roe", weekly_specialty_needs={"Speech Therapist": 1},
+                             availability=availability)
+        self.therapist = Therapist(id="T1", name="Dr. Smith", specialty="Speech Therapist", availability=availability)
+        self.psychologist = Therapist(id="T2", name="Dr. Jones", specialty="Psychologist", availability=availability)
+
+    def test_valid_schedule(self):
+        schedule = [(self.patient, self.therapist, self.ts1), (self.patient, self.therapist, self.ts2)]
+        self.assertEqual(validate_schedule(schedule, [self.patient], [self.therapist]), [])
+
+    def test_unmet_needs_includes_unscheduled_patients(self):
+        schedule = [(self.patient, self.therapist, self.ts1), (self.patient, self.therapist, self.ts2)]
+        errors = validate_schedule(schedule, [self.patient, self.other])
+        self.assertEqual(errors, ["Error: Jane Roe has 0 Speech Therapist consultations, needs 1"])
+
+    def test_double_booking(self):
+        schedule = [(self.patient, self.therapist, self.ts1), (self.other, self.therapist, self.ts1),
+                    (self.patient, self.therapist, self.ts2)]
+        errors = validate_schedule(schedule)
+        self.assertIn("Error: Dr. Smith is double-booked on Monday at " + HourSlot._9to10.value, errors)
+
+    def test_start_outside_opening_hours(self):
+        late = {"id": "99", "day_of_week": "Monday", "start_time": 20.0, "end_time": 21.0}
+        schedule = [(self.patient, self.therapist, late), (self.other, self.therapist, late)]
+        errors = validate_schedule(schedule)
+        self.assertTrue(any("John Doe's consultation with Dr. Smith on Monday at 20.0 starts outside opening hours" in e
+                            for e in errors))
+        self.assertTrue(any("Dr. Smith is double-booked on Monday at 20.0" in e for e in errors))
+
+    def test_availability_and_specialty(self):
+        schedule = [(self.patient, self.therapist, self.ts3), (self.patient, self.psychologist, self.ts1)]
+        errors = validate_schedule(schedule, [self.patient], [self.therapist])
+        self.assertTrue(any("John Doe is not available" in e for e in errors))
+        self.assertTrue(any("Dr. Smith is not available" in e for e in errors))
+        self.assertTrue(any("needs no Psychologist" in e for e in errors))
+        self.assertTrue(any("Dr. Jones is not in the therapist roster" in e for e in errors))
+
+if __name__ == "__main__":
+    unittest.main()
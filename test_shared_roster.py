@@ -0,0 +1,42 @@
+import pickle
+import unittest
+from schedule_generator import HourSlot, Patient, Therapist, TimeslotGrid
+from shared_roster import SharedRoster, reachable_slots_parallel
+
+class TestSharedRoster(unittest.TestCase):
+    def setUp(self):
+        self.timeslots = TimeslotGrid.weekly()
+        self.patients = [
+            Patient(id="P1", name="John Doe", weekly_specialty_needs={"Speech Therapist": 2, "Psychologist": 0},
+                    availability={"Monday": [HourSlot._9to10, HourSlot._10to11]}),
+            Patient(id="P2", name="Jane Roe", weekly_specialty_needs={"Psychologist": 1},
+                    availability={"Tuesday": [HourSlot._9to10]}),
+        ]
+        self.therapists = [
+            Therapist(id="T1", name="Dr. Smith", specialty="Speech Therapist",
+                      availability={"Monday": [HourSlot._10to11, HourSlot._11to12]}),
+            Therapist(id="T2", name="Dr. Jones", specialty="Psychologist", availability={"Tuesday": [HourSlot._9to10]}),
+        ]
+
+    def test_pack_and_attach(self):
+        roster = SharedRoster.create(self.patients, self.therapists, self.timeslots)
+        try:
+            layout = pickle.loads(pickle.dumps(roster.layout))
+            attached = SharedRoster.attach(layout)
+            monday_10 = self.timeslots.index_of[self.timeslots.lookup("Monday", HourSlot._10to11)["id"]]
+            self.assertEqual(attached.compatible_slots(0, 0), [monday_10])
+            self.assertEqual(attached.compatible_slots(0, 1), [])  # P1 needs no Psychologist
+            self.assertEqual(attached.need(0, layout.specialties.index("Speech Therapist")), 2)
+            self.assertTrue(attached.therapist_available(1, self.timeslots.index_of[
+                self.timeslots.lookup("Tuesday", HourSlot._9to10)["id"]]))
+            attached.close()
+        finally:
+            roster.close()
+            roster.unlink()
+
+    def test_reachable_slots_in_worker_processes(self):
+        counts = reachable_slots_parallel(self.patients, self.therapists, self.timeslots, processes=2)
+        self.assertEqual(counts, {("P1", "Speech Therapist"): 1, ("P2", "Psychologist"): 1})
+
+if __name__ == "__main__":
+    unittest.main()
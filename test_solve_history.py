@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+import unittest
+from differential_harness import generate_instance
+from schedule_generator import create_schedule
+from schedule_validator import validate_schedule
+from solve_history import SolveHistory, instance_features, tune
+
+class TestSolveHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "history.jsonl")
+        self.patients, self.therapists, self.timeslots = generate_instance(0, 4, 4, 8.0, 12.0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_features(self):
+        features = instance_features(self.patients, self.therapists, self.timeslots)
+        self.assertEqual(features["num_patients"], 4)
+        self.assertEqual(features["num_therapists"], 4)
+        self.assertGreater(features["num_variables"], 0)
+        self.assertTrue(0.0 < features["patient_density"] <= 1.0)
+        self.assertTrue(0.0 < features["therapist_density"] <= 1.0)
+
+    def test_solves_are_appended(self):
+        for _ in range(2):
+            report = {}
+            schedule = create_schedule(self.patients, self.therapists, self.timeslots, num_workers=1,
+                                       history=self.path, report=report)
+            self.assertEqual(validate_schedule(schedule, self.patients, self.therapists), [])
+            self.assertEqual(report["status"], "OPTIMAL")
+        records = SolveHistory(self.path).records()
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["outcome"]["status"], "OPTIMAL")
+        self.assertEqual(records[0]["config"]["num_workers"], 1)
+        self.assertEqual(records[0]["features"]["num_patients"], 4)
+
+    def record(self, history, features, status, wall_time, config=None):
+        report = {"status": status, "engine": "cp-sat" if status in ("OPTIMAL", "FEASIBLE") else None,
+                  "wall_time": wall_time}
+        history.record(features, config or {"num_workers": 1}, report)
+
+    def test_tune_replays_every_config(self):
+        history = SolveHistory(self.path)
+        configs = [{"num_workers": 1, "solver_parameters": {}},
+                   {"num_workers": 1, "solver_parameters": {"linearization_level": 2}}]
+        rows = tune(history, [(4, 4)], [0], time_limit=10.0, configs=configs)
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(all(r["source"] == "tune" for r in history.records()))
+
+    def test_recommendation_fills_unset_options_only(self):
+        history = SolveHistory(self.path)
+        features = instance_features(self.patients, self.therapists, self.timeslots)
+        self.assertIsNone(history.recommend(features))
+        lp = {"num_workers": 2, "solver_parameters": {"linearization_level": 2}}
+        for wall_time in (1.0, 2.0):
+            self.record(history, features, "OPTIMAL", wall_time, lp)
+        self.record(history, features, "FEASIBLE", 10.0)
+
+        # Two proven neighbours are too few to cap the time.
+        recommendation = history.recommend(features)
+        self.assertEqual(recommendation["num_workers"], 2)
+        self.assertEqual(recommendation["solver_parameters"], {"linearization_level": 2})
+        self.assertIsNone(recommendation["time_limit"])
+
+        self.record(history, features, "OPTIMAL", 1.5, lp)
+        self.assertEqual(history.recommend(features)["time_limit"], 2.0 * 2.0 + 1.0)
+        options, tuned = history.tuned_options(features, {"time_limit": 3.0})
+        self.assertTrue(tuned)
+        self.assertEqual(options["time_limit"], 3.0)
+        self.assertEqual(options["num_workers"], 2)
+
+        far = dict(features, num_patients=400, num_variables=features["num_variables"] * 100)
+        self.assertIsNone(history.recommend(far))
+
+    def test_infeasible_solves_do_not_set_a_time_limit(self):
+        history = SolveHistory(self.path)
+        features = instance_features(self.patients, self.therapists, self.timeslots)
+        for _ in range(3):
+            self.record(history, features, "INFEASIBLE", None)
+            self.record(history, features, "INFEASIBLE", 0.04)
+        self.assertIsNone(history.recommend(features))
+        for _ in range(3):
+            self.record(history, features, "OPTIMAL", 0.5)
+        self.record(history, features, "INFEASIBLE", 0.01)
+        self.assertEqual(history.recommend(features)["time_limit"], 0.5 * 2.0 + 1.0)
+
+    def test_default_recommendation_is_not_tuning(self):
+        history = SolveHistory(self.path)
+        features = instance_features(self.patients, self.therapists, self.timeslots)
+        self.record(history, features, "OPTIMAL", 0.5, {"num_workers": None})
+        options, tuned = history.tuned_options(features, {"num_workers": 1})
+        self.assertFalse(tuned)
+        self.assertEqual(options, {"num_workers": 1})
+
+    def test_skips_unreadable_lines(self):
+        with open(self.path, "w") as f:
+            f.write(json.dumps({"features": {}, "config": {}, "outcome": {"status": "OPTIMAL"}}) + "\n")
+            f.write('{"features": {"num_pat')
+        self.assertEqual(len(SolveHistory(self.path).records()), 1)
+
+if __name__ == "__main__":
+    unittest.main()
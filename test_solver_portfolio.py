@@ -0,0 +1,67 @@
+import unittest
+from differential_harness import generate_instance
+from mip_scheduler import create_schedule_mip
+from schedule_generator import create_schedule, schedule_objective
+from schedule_validator import validate_schedule
+import solver_portfolio
+from solver_portfolio import STRATEGIES, solve_portfolio
+
+class TestMipScheduler(unittest.TestCase):
+    def test_mip_matches_cp_sat_objective(self):
+        for seed in (0, 2):
+            patients, therapists, timeslots = generate_instance(seed, 4, 4, 8.0, 12.0)
+            cp_report, mip_report = {}, {}
+            create_schedule(patients, therapists, timeslots, num_workers=1, report=cp_report)
+            schedule = create_schedule_mip(patients, therapists, timeslots, report=mip_report)
+            self.assertEqual(validate_schedule(schedule, patients, therapists), [])
+            self.assertEqual(mip_report["status"], "OPTIMAL")
+            self.assertEqual(schedule_objective(schedule, timeslots), cp_report["objective"])
+
+    def test_unknown_backend(self):
+        patients, therapists, timeslots = generate_instance(0, 4, 4, 8.0, 12.0)
+        with self.assertRaises(ValueError):
+            create_schedule_mip(patients, therapists, timeslots, backend="NO_SUCH_SOLVER")
+
+class TestSolverPortfolio(unittest.TestCase):
+    def test_portfolio_returns_an_optimal_schedule(self):
+        patients, therapists, timeslots = generate_instance(0, 4, 4, 8.0, 12.0)
+        reference, report = {}, {}
+        create_schedule(patients, therapists, timeslots, num_workers=1, report=reference)
+        schedule = create_schedule(patients, therapists, timeslots, time_limit=20, portfolio=["cp-sat", "mip-scip"],
+                                   report=report)
+        self.assertEqual(validate_schedule(schedule, patients, therapists), [])
+        self.assertIn(report["strategy"], ("cp-sat", "mip-scip"))
+        self.assertEqual(set(report["portfolio"]), {"cp-sat", "mip-scip"})
+        self.assertEqual(report["portfolio"][report["strategy"]]["status"], "OPTIMAL")
+        self.assertEqual(schedule_objective(schedule, timeslots), reference["objective"])
+
+    def test_unknown_strategy(self):
+        patients, therapists, timeslots = generate_instance(0, 4, 4, 8.0, 12.0)
+        self.assertNotIn("simulated-annealing", STRATEGIES)
+        with self.assertRaises(ValueError):
+            solve_portfolio(patients, therapists, timeslots, strategies=["simulated-annealing"])
+
+    def test_options_the_portfolio_would_ignore(self):
+        patients, therapists, timeslots = generate_instance(0, 4, 4, 8.0, 12.0)
+        for option in ({"num_workers": 2}, {"gap_limit": 0.1}, {"solver_parameters": {"linearization_level": 2}},
+                       {"feasibility_only": True}, {"greedy_fallback": True}):
+            with self.assertRaises(ValueError):
+                create_schedule(patients, therapists, timeslots, portfolio=True, **option)
+
+    def test_crashed_strategies_are_reported(self):
+        patients, therapists, timeslots = generate_instance(0, 4, 4, 8.0, 12.0)
+        # Spawned children re-import the module and do not see this entry, so they fail on start-up.
+        solver_portfolio.STRATEGIES["parent-only"] = ("cp-sat", {})
+        try:
+            report = {}
+            schedule = solve_portfolio(patients, therapists, timeslots, strategies=["parent-only"], time_limit=10,
+                                       report=report)
+        finally:
+            del solver_portfolio.STRATEGIES["parent-only"]
+        self.assertIsNone(schedule)
+        self.assertEqual(report["status"], "ERROR")
+        self.assertEqual(report["portfolio"]["parent-only"]["status"], "ERROR")
+        self.assertIn("exited with code", report["errors"][0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import json
+import socketserver
+import threading
+import unittest
+import app
+from app_fixtures import isolate_app
+from schedule_generator import HourSlot, Patient, Therapist, TimeslotGrid
+from solver_service import SolverWorker, WorkerError, WorkerPool, WorkerTimeoutError, WorkerUnavailableError
+
+class TestSolverService(unittest.TestCase):
+    def setUp(self):
+        availability = {"Monday": [HourSlot._9to10, HourSlot._10to11]}
+        self.patients = [Patient(id="P1", name="John Doe", weekly_specialty_needs={"Speech Therapist": 2},
+                                 availability=availability)]
+        self.therapists = [Therapist(id="T1", name="Dr. Smith", specialty="Speech Therapist", availability=availability)]
+        self.timeslots = TimeslotGrid.weekly()
+        self.workers = []
+
+    def tearDown(self):
+        for worker in self.workers:
+            worker.shutdown()
+            worker.server_close()
+
+    def start_worker(self, max_pending=2):
+        worker = SolverWorker(("127.0.0.1", 0), max_pending=max_pending)
+        threading.Thread(target=worker.serve_forever, daemon=True).start()
+        self.workers.append(worker)
+        return worker.server_address
+
+    def test_solve_skips_busy_and_down_workers(self):
+        busy = self.start_worker(max_pending=0)
+        free = self.start_worker()
+        down = ("127.0.0.1", 1)
+        pool = WorkerPool([down, busy, free])
+        report = {}
+        schedule = pool.create_schedule(self.patients, self.therapists, self.timeslots, report=report, num_workers=1)
+        self.assertEqual(len(schedule), 2)
+        self.assertIs(schedule[0][0], self.patients[0])
+        self.assertEqual(report["worker"], f"{free[0]}:{free[1]}")
+        self.assertEqual(report["status"], "OPTIMAL")
+        health = pool.health()
+        self.assertEqual(health[f"{down[0]}:{down[1]}"]["status"], "down")
+        self.assertEqual(health[f"{free[0]}:{free[1]}"]["solves"], 1)
+
+    def test_infeasible_and_all_busy(self):
+        pool = WorkerPool([self.start_worker()])
+        self.patients[0].weekly_specialty_needs["Speech Therapist"] = 3
+        self.assertIsNone(pool.create_schedule(self.patients, self.therapists, self.timeslots))
+        with self.assertRaises(WorkerUnavailableError):
+            WorkerPool([self.start_worker(max_pending=0)]).create_schedule(self.patients, self.therapists, self.timeslots)
+
+    def test_solve_exception_is_reported(self):
+        worker = self.start_worker()
+        pool = WorkerPool([worker])
+        with self.assertRaises(WorkerError):
+            pool.create_schedule(self.patients, self.therapists, self.timeslots, num_workers=1,
+                                 solver_parameters={"no_such_parameter": 1})
+        self.assertEqual(pool.health()[f"{worker[0]}:{worker[1]}"]["status"], "ok")
+
+    def test_timeout_is_not_retried(self):
+        slow, spare = self.start_worker(), self.start_worker()
+        pool = WorkerPool([slow, spare], solve_timeout=0.001)
+        with self.assertRaises(WorkerTimeoutError):
+            pool.create_schedule(self.patients, self.therapists, self.timeslots, num_workers=1)
+        self.assertEqual(WorkerPool([spare]).health()[f"{spare[0]}:{spare[1]}"]["solves"], 0)
+
+    def test_app_reports_worker_errors(self):
+        class FailingHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                self.rfile.readline()
+                self.wfile.write(json.dumps({"status": "error", "error": "solver crashed"}).encode() + b"\n")
+        failing = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FailingHandler)
+        threading.Thread(target=failing.serve_forever, daemon=True).start()
+        self.workers.append(failing)
+        isolate_app(self, worker_pool=WorkerPool([failing.server_address]))
+        client = app.app.test_client()
+        client.post('/', data={'action': 'add_patient', 'patient_name': 'A', 'speech_hours': '1', 'psycho_hours': '0',
+                               'occ_hours': '0', 'patient_availability': 'Monday: 09:00'})
+        client.post('/', data={'action': 'add_therapist', 'therapist_name': 'Dr. X', 'specialty': 'Speech Therapist',
+                               'therapist_availability': 'Monday: 09:00'})
+        response = client.post('/', data={'action': 'run_scheduler'})
+        self.assertEqual(response.status_code, 502)
+        self.assertIn("solver crashed", response.get_data(as_text=True))
+
+if __name__ == "__main__":
+    unittest.main()
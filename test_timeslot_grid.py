@@ -0,0 +1,25 @@
+import unittest
+from schedule_generator import HourSlot, TimeslotGrid, as_timeslot_grid
+
+class TestTimeslotGrid(unittest.TestCase):
+    def test_weekly_grid_lookup_and_indices(self):
+        grid = TimeslotGrid.weekly()
+        self.assertEqual(len(grid), 55)
+        ts = grid.lookup("Tuesday", HourSlot._9to10)
+        self.assertEqual((ts["day_of_week"], ts["start_time"]), ("Tuesday", 9.0))
+        self.assertEqual(grid[grid.index_of[ts["id"]]], ts)
+        self.assertIsNone(grid.lookup("Saturday", HourSlot._9to10))
+
+    def test_adjacent_pairs_follow_start_time_within_each_day(self):
+        timeslots = [
+            {"id": "b", "day_of_week": "Monday", "start_time": 10.0, "end_time": 11.0},
+            {"id": "a", "day_of_week": "Monday", "start_time": 9.0, "end_time": 10.0},
+            {"id": "c", "day_of_week": "Tuesday", "start_time": 9.0, "end_time": 10.0},
+        ]
+        grid = as_timeslot_grid(timeslots)
+        self.assertEqual([(t1["id"], t2["id"]) for t1, t2 in grid.adjacent_pairs["Monday"]], [("a", "b")])
+        self.assertEqual(grid.adjacent_pairs["Tuesday"], [])
+        self.assertIs(as_timeslot_grid(grid), grid)
+
+if __name__ == "__main__":
+    unittest.main()